@@ -13,6 +13,7 @@ from api.routes.chat import router as chat_router
 from api.routes.audit.router import router as audit_router
 from api.routes import dashboard, search, analytics, clients
 from api.database import init_db
+from api.services.klaviyo import aclose_http_client
 
 # Load environment variables
 load_dotenv()
@@ -49,6 +50,13 @@ async def startup_event():
             print("      - Connection string format is incorrect")
             print("      - Database host/port is wrong")
 
+# Close pooled HTTP connections on shutdown
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close the shared Klaviyo HTTP connection pool on application shutdown."""
+    await aclose_http_client()
+    print("✓ Klaviyo HTTP connection pool closed")
+
 # CORS middleware - Configure for production
 cors_origins = [
     "http://localhost:3000",
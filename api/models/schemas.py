@@ -29,6 +29,7 @@ class AuditRequest(BaseModel):
     openai_model: Optional[str] = Field(None, description="OpenAI model name (e.g., 'gpt-4o')")
     gemini_api_key: Optional[str] = Field(None, description="Google Gemini API key")
     gemini_model: Optional[str] = Field(None, description="Gemini model name (e.g., 'gemini-2.0-flash-exp')")
+    bypass_llm_cache: Optional[bool] = Field(False, description="Ask the LLM again instead of reusing cached responses for unchanged prompts")
 
 
 class AuditResponse(BaseModel):
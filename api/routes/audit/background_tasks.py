@@ -4,27 +4,64 @@ Handles async audit report generation in the background.
 """
 import asyncio
 import os
+import time
 from datetime import datetime
 from pathlib import Path
+from typing import Dict
 from sqlalchemy.orm import Session
 
 from api.database import SessionLocal
 from api.models.report import Report, ReportStatus
-from api.services.klaviyo import KlaviyoService
+from api.services.klaviyo import KlaviyoService, release_job
 from api.services.analysis import AgenticAnalysisFramework
 from api.services.report import EnhancedReportService
 from api.services.benchmark import BenchmarkService
+from api.services.checkpoints import get_job_checkpoints
 from .shared_state import get_report_cache, get_running_tasks
 
 
+async def _gather_stages(*stages):
+    """Run stages concurrently; if one fails, cancel the others and re-raise."""
+    tasks = [asyncio.ensure_future(stage) for stage in stages]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
 async def process_audit_background(
     report_id: int,
     request_data: dict,
     llm_config: dict
 ):
-    """Background task to process audit generation."""
+    """
+    Background task to process audit generation.
+    
+    Stage graph (once the raw Klaviyo data exists, independent stages overlap):
+    
+        klaviyo_data -> benchmarks -> analysis ---> report
+                                   -> audit_data -/
+    
+    Every pipeline stage checkpoints its output (see api.services.checkpoints),
+    so a failed job resumed through /resume/{report_id} picks up from the last
+    completed stage. request_data may omit api_key when resuming a job whose
+    Klaviyo stages have all completed. Wall-clock seconds per stage are kept
+    in the job's progress cache as "stage_timings".
+    """
     db = SessionLocal()
     _report_cache = get_report_cache()
+    checkpoints = get_job_checkpoints(report_id)
+    stage_timings: Dict[str, float] = {}
+    
+    async def timed(name: str, produce):
+        started = time.monotonic()
+        try:
+            return await produce()
+        finally:
+            stage_timings[name] = round(time.monotonic() - started, 2)
     
     try:
         # Get report
@@ -60,8 +97,22 @@ async def process_audit_background(
             })
             print(f"✓ Progress updated to 1% for report {report_id}")
             
+            await checkpoints.save_request(request_data)
+            completed_stages = checkpoints.completed_stages()
+            if completed_stages:
+                print(f"♻️ Resuming report {report_id} with {len(completed_stages)} checkpointed stages")
+            
             # Initialize services
-            klaviyo_service = KlaviyoService(api_key=request_data["api_key"])
+            # Tag Klaviyo requests with this job so concurrent audits for the
+            # same account can report their share of the shared rate limit
+            klaviyo_service = None
+            if request_data.get("api_key"):
+                klaviyo_service = KlaviyoService(
+                    api_key=request_data["api_key"],
+                    job_id=f"audit-{report_id}"
+                )
+            elif not checkpoints.has("audit_data"):
+                raise Exception("Klaviyo API key required to resume this audit")
             benchmark_service = BenchmarkService()
             
             # Get LLM API key
@@ -124,8 +175,18 @@ async def process_audit_background(
             
             progress_task = asyncio.create_task(simulate_extraction_progress())
             
+            async def save_section(name, result):
+                await checkpoints.save(f"extraction.{name}", result)
+            
+            async def extract():
+                return await klaviyo_service.extract_all_data(
+                    date_range=date_range_dict,
+                    completed_sections=await checkpoints.load_prefix("extraction."),
+                    on_section_complete=save_section
+                )
+            
             try:
-                klaviyo_data = await klaviyo_service.extract_all_data(date_range=date_range_dict)
+                klaviyo_data = await timed("klaviyo_data", lambda: checkpoints.run("klaviyo_data", extract))
             finally:
                 extraction_done.set()
                 progress_task.cancel()
@@ -139,15 +200,16 @@ async def process_audit_background(
             # Step 2: Load benchmarks (20-25%)
             print("📊 Loading benchmarks...")
             _report_cache[report_id].update({"progress": 22.0, "step": "Loading benchmarks..."})
+            started = time.monotonic()
             benchmarks = benchmark_service.get_all_benchmarks()
+            stage_timings["benchmarks"] = round(time.monotonic() - started, 2)
             _report_cache[report_id].update({"progress": 25.0, "step": "Benchmarks loaded"})
             
-            # Step 3: Run comprehensive agentic analysis (30-60%)
-            print("🤖 Running comprehensive analysis...")
+            # Step 3: Run agentic analysis (30-60%) while formatting audit data;
+            # neither needs the other's output
+            print("🤖 Running comprehensive analysis and formatting audit data...")
             _report_cache[report_id].update({"progress": 30.0, "step": "Running AI analysis..."})
             
-            analysis_done = asyncio.Event()
-            
             def update_analysis_progress(progress: float, step: str):
                 """Update progress based on actual analysis stage."""
                 _report_cache[report_id].update({
@@ -156,40 +218,52 @@ async def process_audit_background(
                 })
                 print(f"✓ Progress updated to {progress:.1f}%: {step}")
             
-            try:
-                print(f"🤖 Starting AI analysis for report {report_id}...")
-                analysis_results = await asyncio.wait_for(
-                    analysis_framework.run_comprehensive_analysis(
-                        klaviyo_data=klaviyo_data,
-                        benchmarks=benchmarks,
-                        client_name=request_data["client_name"],
-                        progress_callback=update_analysis_progress
-                    ),
-                    timeout=1800.0  # 30 minutes max
+            async def analyze():
+                try:
+                    print(f"🤖 Starting AI analysis for report {report_id}...")
+                    analysis_results = await checkpoints.run(
+                        "analysis",
+                        lambda: asyncio.wait_for(
+                            analysis_framework.run_comprehensive_analysis(
+                                klaviyo_data=klaviyo_data,
+                                benchmarks=benchmarks,
+                                client_name=request_data["client_name"],
+                                progress_callback=update_analysis_progress,
+                                checkpoints=checkpoints
+                            ),
+                            timeout=1800.0  # 30 minutes max
+                        )
+                    )
+                    print(f"✓ AI analysis completed for report {report_id}")
+                    return analysis_results
+                except asyncio.TimeoutError:
+                    print(f"❌ AI analysis timed out after 30 minutes for report {report_id}")
+                    _report_cache[report_id].update({
+                        "progress": 30.0,
+                        "step": "AI analysis timed out - please try again"
+                    })
+                    raise Exception("AI analysis timed out after 30 minutes. Please try again.")
+            
+            async def format_audit_data():
+                # Reuse the payload from Step 1 so Klaviyo is only queried once per audit
+                audit_data = await checkpoints.run(
+                    "audit_data",
+                    lambda: klaviyo_service.format_audit_data(
+                        date_range=date_range_dict,
+                        verbose=False,
+                        raw_data=klaviyo_data
+                    )
                 )
-                print(f"✓ AI analysis completed for report {report_id}")
-            except asyncio.TimeoutError:
-                print(f"❌ AI analysis timed out after 30 minutes for report {report_id}")
-                _report_cache[report_id].update({
-                    "progress": 30.0,
-                    "step": "AI analysis timed out - please try again"
-                })
-                raise Exception("AI analysis timed out after 30 minutes. Please try again.")
-            finally:
-                analysis_done.set()
+                print(f"✓ Audit data formatted for report {report_id}")
+                return audit_data
             
-            _report_cache[report_id].update({"progress": 60.0, "step": "AI analysis complete"})
-            
-            # Step 4: Convert analysis results to audit data format (60-80%)
-            print("🔄 Converting analysis results to audit data format...")
-            _report_cache[report_id].update({"progress": 65.0, "step": "Formatting audit data..."})
-            audit_data = await klaviyo_service.format_audit_data(
-                date_range=date_range_dict,
-                verbose=False
+            analysis_results, audit_data = await _gather_stages(
+                timed("analysis", analyze),
+                timed("audit_data", format_audit_data)
             )
-            _report_cache[report_id].update({"progress": 80.0, "step": "Data formatting complete"})
+            _report_cache[report_id].update({"progress": 80.0, "step": "Analysis and data formatting complete"})
             
-            # Step 5: Generate audit report (80-100%)
+            # Step 4: Generate audit report (80-100%)
             print("📝 Generating audit report...")
             _report_cache[report_id].update({"progress": 85.0, "step": "Generating report..."})
             
@@ -215,14 +289,15 @@ async def process_audit_background(
             progress_task = asyncio.create_task(simulate_report_progress())
             
             try:
-                generated_report = await report_service.generate_audit(
+                generated_report = await timed("report", lambda: report_service.generate_audit(
                     audit_data=audit_data,
                     client_name=request_data["client_name"],
                     auditor_name=request_data.get("auditor_name"),
                     client_code=request_data.get("client_code"),
                     industry=request_data.get("industry"),
-                    llm_config=llm_config
-                )
+                    llm_config=llm_config,
+                    checkpoints=checkpoints
+                ))
             finally:
                 report_done.set()
                 progress_task.cancel()
@@ -280,10 +355,12 @@ async def process_audit_background(
                     "word_url": f"/api/audit/download-file?path={word_filename}" if word_filename else None,
                     "pages": generated_report.get("pages"),
                     "sections": generated_report.get("sections", [])
-                }
+                },
+                "stage_timings": stage_timings
             }
             
             db.commit()
+            checkpoints.clear()
             print(f"✅ Audit report {report_id} completed successfully")
             
         except asyncio.CancelledError:
@@ -299,9 +376,26 @@ async def process_audit_background(
             print(f"Traceback: {traceback.format_exc()}")
             
             report.status = ReportStatus.FAILED
-            _report_cache[report_id] = {"error": error_msg}
+            _report_cache[report_id] = {
+                "error": error_msg,
+                # Completed stages are kept, so POST /resume/{report_id} continues from here
+                "resumable_stages": checkpoints.completed_stages(),
+                "stage_timings": stage_timings
+            }
             db.commit()
             
     finally:
+        if stage_timings:
+            print(f"⏱️ Stage timings for report {report_id}: " + ", ".join(
+                f"{name} {seconds:.1f}s" for name, seconds in stage_timings.items()
+            ))
+        # Stop tracking this job's Klaviyo quota usage, keeping the final totals
+        quota_usage = release_job(f"audit-{report_id}")
+        if quota_usage and report_id in _report_cache:
+            _report_cache[report_id]["klaviyo_quota"] = quota_usage
+            print(
+                f"📈 Klaviyo quota for report {report_id}: {quota_usage['requests']} requests, "
+                f"{quota_usage['rate_limited']} rate limited"
+            )
         db.close()
 
@@ -3,6 +3,7 @@ Request handlers for audit generation endpoints.
 """
 import hashlib
 import os
+from typing import Optional
 from datetime import datetime, timedelta, timezone
 from fastapi import HTTPException, BackgroundTasks
 from sqlalchemy import text
@@ -12,6 +13,7 @@ from api.models.schemas import AuditRequest, AuditResponse
 from api.models.report import Report, ReportStatus
 from api.services.klaviyo import KlaviyoService
 from api.services.report import EnhancedReportService
+from api.services.checkpoints import get_job_checkpoints
 from api.database import SessionLocal, IS_POSTGRES
 from api.utils.security import validate_prompt_data
 from .shared_state import get_report_cache, get_running_tasks
@@ -82,7 +84,8 @@ async def handle_generate_audit(request: AuditRequest, background_tasks: Backgro
             "openai_api_key": request.openai_api_key or os.getenv("OPENAI_API_KEY"),
             "openai_model": request.openai_model or os.getenv("OPENAI_MODEL", "gpt-4o"),
             "gemini_api_key": request.gemini_api_key or os.getenv("GOOGLE_API_KEY"),
-            "gemini_model": request.gemini_model or os.getenv("GEMINI_MODEL", "gemini-2.0-flash-exp")
+            "gemini_model": request.gemini_model or os.getenv("GEMINI_MODEL", "gemini-2.0-flash-exp"),
+            "bypass_cache": bool(request.bypass_llm_cache)
         }
         
         # Prepare request data for background task
@@ -332,6 +335,8 @@ async def handle_generate_audit_pro(request: AuditRequest):
             llm_config["gemini_api_key"] = request.gemini_api_key
         if request.gemini_model:
             llm_config["gemini_model"] = request.gemini_model
+        if request.bypass_llm_cache:
+            llm_config["bypass_cache"] = True
         
         report = await report_service.generate_audit(
             audit_data=audit_data,
@@ -418,3 +423,72 @@ async def handle_generate_audit_pro(request: AuditRequest):
         print(f"Traceback: {traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=f"Audit generation failed: {str(e)}")
 
+
+
+async def handle_resume_audit(report_id: int, background_tasks: BackgroundTasks, api_key: Optional[str] = None):
+    """
+    Resume a failed or interrupted audit from its last completed stage.
+    
+    Stage outputs checkpointed by the original run are reused, so only the
+    remaining Klaviyo extraction, analysis and report stages are redone. The
+    Klaviyo API key is never stored and must be supplied again unless every
+    stage that calls Klaviyo has already completed.
+    """
+    _report_cache = get_report_cache()
+    _running_tasks = get_running_tasks()
+    
+    checkpoints = get_job_checkpoints(report_id)
+    request_data = checkpoints.load_request()
+    if not request_data:
+        raise HTTPException(status_code=404, detail=f"No checkpoints found for report {report_id}")
+    
+    db = SessionLocal()
+    try:
+        report = db.query(Report).filter(Report.id == report_id).first()
+        if not report:
+            raise HTTPException(status_code=404, detail=f"Report {report_id} not found")
+        if report.status == ReportStatus.COMPLETED:
+            raise HTTPException(status_code=400, detail=f"Report {report_id} is already complete")
+        cached = _report_cache.get(report_id, {})
+        if report.status == ReportStatus.PROCESSING and "error" not in cached and report_id in _running_tasks:
+            raise HTTPException(status_code=409, detail=f"Report {report_id} is still processing")
+        
+        if api_key:
+            api_key_hash = hashlib.sha256(api_key.encode()).hexdigest()
+            if report.klaviyo_api_key_hash and api_key_hash != report.klaviyo_api_key_hash:
+                raise HTTPException(status_code=400, detail="API key does not match the account this report was started for")
+            request_data = {**request_data, "api_key": api_key}
+        elif not checkpoints.has("audit_data"):
+            raise HTTPException(status_code=400, detail="Klaviyo 'api_key' is required to resume this audit")
+        
+        llm_config = report.llm_config or {}
+        report.status = ReportStatus.PROCESSING
+        db.commit()
+    finally:
+        db.close()
+    
+    completed_stages = checkpoints.completed_stages()
+    print(f"♻️ Resuming audit {report_id} ({len(completed_stages)} stages checkpointed)...")
+    
+    _report_cache[report_id] = {
+        "progress": 0.0,
+        "step": "Resuming...",
+        "start_time": datetime.now().isoformat()
+    }
+    
+    task = background_tasks.add_task(
+        process_audit_background,
+        report_id=report_id,
+        request_data=request_data,
+        llm_config=llm_config
+    )
+    _running_tasks[report_id] = task
+    
+    return AuditResponse(
+        success=True,
+        report_id=report_id,
+        status="processing",
+        report_url=None,
+        html_content=None,
+        report_data={"report_id": report_id, "status": "processing", "resumed_stages": completed_stages}
+    )
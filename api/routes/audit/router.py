@@ -2,11 +2,11 @@
 Main router for audit API endpoints.
 Imports and registers all audit-related endpoints.
 """
-from fastapi import APIRouter, BackgroundTasks, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Body, HTTPException
 from typing import Optional
 
 from api.models.schemas import AuditRequest, AuditResponse, ReportStatusResponse
-from .request_handlers import handle_generate_audit, handle_generate_audit_pro
+from .request_handlers import handle_generate_audit, handle_generate_audit_pro, handle_resume_audit
 from .status_endpoints import get_report_status, cancel_audit, download_file
 from .test_endpoints import test_klaviyo_connection, test_llm_connection
 
@@ -68,6 +68,22 @@ async def test_audit_route():
     return {"status": "ok", "message": "Audit router is working", "path": "/api/audit/test"}
 
 
+@router.post("/resume/{report_id}", response_model=AuditResponse)
+async def resume_audit_endpoint(
+    report_id: int,
+    background_tasks: BackgroundTasks,
+    request: Optional[dict] = Body(default=None)
+):
+    """
+    Resume a failed or interrupted audit from its last completed stage.
+    
+    Request Body (JSON, optional):
+        api_key: Klaviyo API key (required unless all Klaviyo stages already completed)
+    """
+    api_key = (request or {}).get("api_key")
+    return await handle_resume_audit(report_id, background_tasks, api_key)
+
+
 @router.post("/cancel/{report_id}")
 async def cancel_audit_endpoint(report_id: int):
     """
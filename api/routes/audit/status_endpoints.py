@@ -10,6 +10,7 @@ from fastapi.responses import FileResponse, Response
 from api.models.schemas import ReportStatusResponse
 from api.models.report import Report, ReportStatus
 from api.database import SessionLocal
+from api.services.klaviyo import get_job_quota_usage
 from .shared_state import get_report_cache, get_running_tasks
 
 
@@ -238,7 +239,8 @@ async def get_report_status(report_id: int):
                     "step": cached_step, 
                     "progress": cached_progress,
                     "estimated_remaining_minutes": estimated_remaining,
-                    "start_time": start_time
+                    "start_time": start_time,
+                    "klaviyo_quota": get_job_quota_usage(f"audit-{report_id}")
                 },
                 created_at=created_at_str
             )
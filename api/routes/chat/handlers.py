@@ -11,7 +11,7 @@ from sqlalchemy.orm import Session
 
 from ...database import get_db
 from ...utils.security import sanitize_prompt_input
-from ...services.llm import LLMService
+from ...services.llm import LLMService, get_llm_service
 from ...models.report import Report
 from ...models.chat import ChatMessage as ChatMessageModel
 from .models import ChatMessage, ChatResponse, ChatAction
@@ -166,15 +166,7 @@ def initialize_llm_service(report: Report) -> LLMService:
         logger.warning(f"Updating outdated Claude model {claude_model} to current version")
         claude_model = "claude-sonnet-4-20250514"  # Use current default
     
-    return LLMService(
-        default_provider=llm_config.get("provider", "claude"),
-        anthropic_api_key=llm_config.get("anthropic_api_key"),
-        openai_api_key=llm_config.get("openai_api_key"),
-        gemini_api_key=llm_config.get("gemini_api_key"),
-        claude_model=claude_model,
-        openai_model=llm_config.get("openai_model"),
-        gemini_model=llm_config.get("gemini_model")
-    )
+    return get_llm_service({**llm_config, "claude_model": claude_model})
 
 
 async def handle_chat_message(
@@ -388,14 +380,16 @@ async def handle_chat_message(
             llm_response = await llm_service.generate_insights(
                 section="chat",
                 data={"prompt": prompt},
-                context={}
+                context={},
+                use_cache=False
             )
     else:
         # Fallback to template system
         llm_response = await llm_service.generate_insights(
             section="chat",
             data={"prompt": prompt},
-            context={}
+            context={},
+            use_cache=False
         )
     
     print(f"📥 Received LLM response: {type(llm_response)}, length: {len(str(llm_response)) if llm_response else 0}")
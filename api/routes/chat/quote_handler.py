@@ -11,7 +11,7 @@ from sqlalchemy.orm import Session
 from ...database import get_db
 from ...models.report import Report
 from ...models.chat import ChatMessage as ChatMessageModel
-from ...services.llm import LLMService
+from ...services.llm import get_llm_service
 
 logger = logging.getLogger(__name__)
 
@@ -73,15 +73,7 @@ async def handle_generate_quote(
     if claude_model and "claude-3-" in claude_model:
         claude_model = "claude-sonnet-4-20250514"
     
-    llm_service = LLMService(
-        default_provider=llm_config.get("provider", "claude"),
-        anthropic_api_key=llm_config.get("anthropic_api_key"),
-        openai_api_key=llm_config.get("openai_api_key"),
-        gemini_api_key=llm_config.get("gemini_api_key"),
-        claude_model=claude_model,
-        openai_model=llm_config.get("openai_model"),
-        gemini_model=llm_config.get("gemini_model")
-    )
+    llm_service = get_llm_service({**llm_config, "claude_model": claude_model})
     
     # Extract key metrics and opportunities from report HTML (like old implementation)
     from bs4 import BeautifulSoup
@@ -10,12 +10,48 @@ This implements a multi-agent system that:
 
 Based on comprehensive audits (Urth & Dreamland Baby examples)
 """
+import asyncio
 import os
+import random
 from typing import Dict, Any, List, Optional, Callable
-from anthropic import Anthropic
+from anthropic import AsyncAnthropic, APIConnectionError, APIStatusError
 import json
 from datetime import datetime
 
+# Claude responses worth retrying: rate limited (429), overloaded (529) and transient server errors
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504, 529}
+
+_claude_slots: Optional[asyncio.Semaphore] = None
+_claude_slots_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _get_claude_slots() -> asyncio.Semaphore:
+    """
+    Process-wide bound on concurrent analysis calls to Claude (shared by all audits).
+
+    The semaphore is bound to the event loop it is used on. If analysis runs
+    on a different loop (e.g. successive asyncio.run() calls in scripts or
+    worker threads), a fresh semaphore is created for the current loop.
+    """
+    global _claude_slots, _claude_slots_loop
+    loop = asyncio.get_running_loop()
+    if _claude_slots is None or _claude_slots_loop is not loop:
+        _claude_slots = asyncio.Semaphore(max(1, int(os.getenv("ANALYSIS_CLAUDE_CONCURRENCY", "4"))))
+        _claude_slots_loop = loop
+    return _claude_slots
+
+
+def _retry_delay(error: Exception, attempt: int) -> float:
+    """Seconds to wait before retrying: the server's retry-after if given, else exponential backoff with jitter."""
+    response = getattr(error, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    try:
+        if retry_after is not None:
+            return min(60.0, max(0.0, float(retry_after)))
+    except ValueError:
+        pass
+    return min(60.0, 2.0 ** attempt) * random.uniform(0.5, 1.0)
+
 
 class AgenticAnalysisFramework:
     """
@@ -30,14 +66,18 @@ class AgenticAnalysisFramework:
         self.api_key = anthropic_api_key or os.getenv("ANTHROPIC_API_KEY")
         if not self.api_key:
             raise ValueError("ANTHROPIC_API_KEY required")
-        self.client = Anthropic(api_key=self.api_key)
+        self.timeout = float(os.getenv("ANALYSIS_CLAUDE_TIMEOUT", "180"))
+        self.max_retries = max(0, int(os.getenv("ANALYSIS_CLAUDE_MAX_RETRIES", "4")))
+        # Created per analysis run and closed when it ends (see run_comprehensive_analysis)
+        self.client: Optional[AsyncAnthropic] = None
         
     async def run_comprehensive_analysis(
         self,
         klaviyo_data: Dict[str, Any],
         benchmarks: Dict[str, Any],
         client_name: str,
-        progress_callback: Optional[Callable[[float, str], None]] = None
+        progress_callback: Optional[Callable[[float, str], None]] = None,
+        checkpoints: Optional[Any] = None
     ) -> Dict[str, Any]:
         """
         Run complete multi-agent analysis pipeline.
@@ -47,6 +87,8 @@ class AgenticAnalysisFramework:
             benchmarks: Industry benchmark data
             client_name: Client name for personalization
             progress_callback: Optional callback function(progress: float, step: str) to report progress
+            checkpoints: Optional JobCheckpoints; each agent's output is saved as
+                "analysis.<agent>" and restored instead of rerun when resuming
         
         Returns comprehensive analysis with:
         - Executive summary with KAV analysis
@@ -57,13 +99,41 @@ class AgenticAnalysisFramework:
         - Trend identification
         - Strategic recommendations
         """
+        # Retries are handled in _call_claude (with backoff and outside the concurrency bound)
+        client = self.client = AsyncAnthropic(api_key=self.api_key, timeout=self.timeout, max_retries=0)
+        try:
+            return await self._run_agents(
+                klaviyo_data, benchmarks, client_name, progress_callback, checkpoints
+            )
+        finally:
+            # Release the client's connection pool, also on timeout or cancellation
+            self.client = None
+            await client.close()
+    
+    async def _run_agents(
+        self,
+        klaviyo_data: Dict[str, Any],
+        benchmarks: Dict[str, Any],
+        client_name: str,
+        progress_callback: Optional[Callable[[float, str], None]],
+        checkpoints: Optional[Any]
+    ) -> Dict[str, Any]:
+        """Run the five analysis agents in order (see run_comprehensive_analysis)."""
         print("🤖 Starting Agentic Analysis Framework...")
         
+        async def run_agent(name: str, produce: Callable[[], Any]) -> Dict[str, Any]:
+            if checkpoints is None:
+                return await produce()
+            return await checkpoints.run(f"analysis.{name}", produce)
+        
         # Stage 1: Data Processing Agent (30-38%)
         print("  📊 Agent 1: Processing and structuring data...")
         if progress_callback:
             progress_callback(30.0, "Processing and structuring data...")
-        processed_data = await self._data_processing_agent(klaviyo_data)
+        processed_data = await run_agent(
+            "data_processing",
+            lambda: self._data_processing_agent(klaviyo_data)
+        )
         if progress_callback:
             progress_callback(38.0, "Data processing complete")
         
@@ -71,9 +141,9 @@ class AgenticAnalysisFramework:
         print("  📈 Agent 2: Running benchmark comparisons...")
         if progress_callback:
             progress_callback(38.0, "Running benchmark comparisons...")
-        benchmark_analysis = await self._benchmark_comparison_agent(
-            processed_data,
-            benchmarks
+        benchmark_analysis = await run_agent(
+            "benchmark_comparison",
+            lambda: self._benchmark_comparison_agent(processed_data, benchmarks)
         )
         if progress_callback:
             progress_callback(46.0, "Benchmark comparisons complete")
@@ -82,9 +152,9 @@ class AgenticAnalysisFramework:
         print("  🔍 Agent 3: Identifying patterns and trends...")
         if progress_callback:
             progress_callback(46.0, "Identifying patterns and trends...")
-        pattern_analysis = await self._pattern_recognition_agent(
-            processed_data,
-            benchmark_analysis
+        pattern_analysis = await run_agent(
+            "pattern_recognition",
+            lambda: self._pattern_recognition_agent(processed_data, benchmark_analysis)
         )
         if progress_callback:
             progress_callback(52.0, "Pattern recognition complete")
@@ -93,10 +163,9 @@ class AgenticAnalysisFramework:
         print("  💡 Agent 4: Generating strategic insights...")
         if progress_callback:
             progress_callback(52.0, "Generating strategic insights...")
-        strategic_analysis = await self._strategic_analysis_agent(
-            processed_data,
-            benchmark_analysis,
-            pattern_analysis
+        strategic_analysis = await run_agent(
+            "strategic_analysis",
+            lambda: self._strategic_analysis_agent(processed_data, benchmark_analysis, pattern_analysis)
         )
         if progress_callback:
             progress_callback(56.0, "Strategic analysis complete")
@@ -105,12 +174,15 @@ class AgenticAnalysisFramework:
         print("  📝 Agent 5: Synthesizing final report...")
         if progress_callback:
             progress_callback(56.0, "Synthesizing final report...")
-        final_report = await self._report_synthesis_agent(
-            client_name,
-            processed_data,
-            benchmark_analysis,
-            pattern_analysis,
-            strategic_analysis
+        final_report = await run_agent(
+            "report_synthesis",
+            lambda: self._report_synthesis_agent(
+                client_name,
+                processed_data,
+                benchmark_analysis,
+                pattern_analysis,
+                strategic_analysis
+            )
         )
         if progress_callback:
             progress_callback(60.0, "AI analysis complete")
@@ -568,21 +640,31 @@ Return ONLY valid JSON:
     # Helper methods
     
     async def _call_claude(self, prompt: str, max_tokens: int = 4000) -> str:
-        """Call Claude API with consistent settings."""
-        import asyncio
-        loop = asyncio.get_event_loop()
-        
-        response = await loop.run_in_executor(
-            None,
-            lambda: self.client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=max_tokens,
-                temperature=0.3,  # Lower for more consistent analysis
-                messages=[{"role": "user", "content": prompt}]
-            )
-        )
+        """
+        Call Claude API with consistent settings.
         
-        return response.content[0].text
+        At most ANALYSIS_CLAUDE_CONCURRENCY calls run at once across all audits.
+        Rate-limited, overloaded and timed-out calls are retried with backoff
+        up to ANALYSIS_CLAUDE_MAX_RETRIES times.
+        """
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with _get_claude_slots():
+                    response = await self.client.messages.create(
+                        model="claude-sonnet-4-20250514",
+                        max_tokens=max_tokens,
+                        temperature=0.3,  # Lower for more consistent analysis
+                        messages=[{"role": "user", "content": prompt}]
+                    )
+                return response.content[0].text
+            except (APIStatusError, APIConnectionError) as e:
+                status = getattr(e, "status_code", None)
+                if (status is not None and status not in RETRYABLE_STATUS_CODES) or attempt == self.max_retries:
+                    raise
+                delay = _retry_delay(e, attempt)
+                reason = f"status {status}" if status is not None else type(e).__name__
+                print(f"  ⚠️ Claude call failed ({reason}), retrying in {delay:.1f}s ({attempt + 1}/{self.max_retries})")
+                await asyncio.sleep(delay)
     
     def _parse_json_response(self, response: str) -> Dict[str, Any]:
         """Extract and parse JSON from Claude's response."""
@@ -0,0 +1,243 @@
+"""
+Checkpoints for resumable audit jobs.
+
+Each pipeline stage of an audit (extraction sections, analysis agents,
+section preparers, rendering, PDF) saves its output under
+data/checkpoints/<job id>/ as it completes. If the job fails part way
+(429 storm, LLM timeout, dyno restart), resuming it reloads every completed
+stage instead of redoing the Klaviyo calls and LLM work behind it.
+
+The job's request parameters are kept in manifest.json, without the
+Klaviyo API key, which must be supplied again when a resumed job still
+needs to call Klaviyo. Checkpoints are deleted when the job completes.
+
+Stage outputs are converted with to_plain() before they are saved, and
+run() returns the converted value, so a stage produces the same form
+whether it ran now or was restored from disk. Values with no JSON form
+are not checkpointed (instead of being written as their str()); the
+stage still completes with its output.
+"""
+import asyncio
+import dataclasses
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_ROOT = Path(__file__).parent.parent.parent / "data" / "checkpoints"
+
+# Request fields never written to disk
+_SECRET_FIELDS = {"api_key"}
+
+
+def _plain_key(key: Any) -> str:
+    """Dict key as json.dump would write it."""
+    if isinstance(key, str):
+        return key
+    if key is None or isinstance(key, (bool, int, float)):
+        return json.dumps(key)
+    raise TypeError(f"Checkpoint keys must be str, int, float, bool or None, not {type(key).__name__}")
+
+
+def to_plain(value: Any) -> Any:
+    """
+    Convert a stage output into the value it reads back as from JSON.
+
+    Dataclasses and dicts become dicts (non-string keys converted as
+    json.dump does), tuples and sets become lists, enums their value,
+    datetimes ISO strings, Decimals and numpy scalars Python numbers and
+    numpy arrays lists.
+
+    Raises:
+        TypeError: If a value has no JSON form
+    """
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    if isinstance(value, dict):
+        return {_plain_key(key): to_plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [to_plain(item) for item in value]
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {field.name: to_plain(getattr(value, field.name)) for field in dataclasses.fields(value)}
+    if isinstance(value, Enum):
+        return to_plain(value.value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, np.generic):
+        return to_plain(value.item())
+    if isinstance(value, np.ndarray):
+        return to_plain(value.tolist())
+    raise TypeError(f"Cannot checkpoint value of type {type(value).__name__}")
+
+
+class JobCheckpoints:
+    """Stage outputs saved for one audit job."""
+
+    def __init__(self, job_id: str, root: Optional[Path] = None):
+        """
+        Initialize checkpoints for a job.
+
+        Args:
+            job_id: Job identifier (e.g., "report-42")
+            root: Checkpoint root directory (defaults to data/checkpoints)
+        """
+        self.job_id = job_id
+        self.directory = Path(root or os.getenv("AUDIT_CHECKPOINT_DIR", str(CHECKPOINT_ROOT))) / job_id
+        self._lock = threading.Lock()
+        self._manifest = self._read_manifest()
+
+    def _read_manifest(self) -> Dict[str, Any]:
+        try:
+            with open(self.directory / "manifest.json", "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"request": None, "stages": {}}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable checkpoint manifest for {self.job_id}: {e}")
+            return {"request": None, "stages": {}}
+
+    def _write_json(self, path: Path, value: Any):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(value, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+    def _stage_path(self, stage: str) -> Path:
+        return self.directory / f"{stage}.json"
+
+    def _save_sync(self, stage: str, value: Any, convert: bool = True):
+        self._write_json(self._stage_path(stage), to_plain(value) if convert else value)
+        with self._lock:
+            self._manifest["stages"][stage] = time.time()
+            self._write_json(self.directory / "manifest.json", self._manifest)
+
+    def _load_sync(self, stage: str) -> Any:
+        with open(self._stage_path(stage), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def has(self, stage: str) -> bool:
+        """Whether a stage has a saved checkpoint."""
+        return stage in self._manifest["stages"]
+
+    def completed_stages(self) -> List[str]:
+        """Names of stages with saved checkpoints, in completion order."""
+        stages = self._manifest["stages"]
+        return sorted(stages, key=stages.get)
+
+    async def save(self, stage: str, value: Any):
+        """
+        Save a stage's output. Failures are logged, never raised.
+
+        Args:
+            stage: Stage name (e.g., "analysis.benchmark_comparison")
+            value: Output convertible by to_plain()
+        """
+        await self._save(stage, value, convert=True)
+
+    async def _save(self, stage: str, value: Any, convert: bool):
+        try:
+            await asyncio.to_thread(self._save_sync, stage, value, convert)
+        except Exception as e:
+            logger.warning(f"Could not checkpoint stage '{stage}' for {self.job_id}: {e}")
+
+    async def load(self, stage: str) -> Any:
+        """
+        Load a stage's saved output.
+
+        Returns:
+            Saved output, or None if the stage has no readable checkpoint
+        """
+        if not self.has(stage):
+            return None
+        try:
+            return await asyncio.to_thread(self._load_sync, stage)
+        except Exception as e:
+            logger.warning(f"Could not load checkpoint '{stage}' for {self.job_id}: {e}")
+            with self._lock:
+                self._manifest["stages"].pop(stage, None)
+            return None
+
+    async def load_prefix(self, prefix: str) -> Dict[str, Any]:
+        """
+        Load every saved stage whose name starts with a prefix.
+
+        Args:
+            prefix: Stage name prefix (e.g., "extraction.")
+
+        Returns:
+            Dict mapping stage name (without prefix) to saved output
+        """
+        results = {}
+        for stage in self.completed_stages():
+            if stage.startswith(prefix):
+                value = await self.load(stage)
+                if value is not None:
+                    results[stage[len(prefix):]] = value
+        return results
+
+    async def run(self, stage: str, produce: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return a stage's saved output, or produce and save it.
+
+        Args:
+            stage: Stage name
+            produce: Coroutine function computing the stage output
+
+        Returns:
+            Stage output in its to_plain() form, as a restored stage would be.
+            An output to_plain() cannot convert is returned as produced and
+            not checkpointed (logged, never raised).
+        """
+        if self.has(stage):
+            value = await self.load(stage)
+            if value is not None:
+                logger.info(f"Restored stage '{stage}' for {self.job_id} from checkpoint")
+                return value
+        value = await produce()
+        try:
+            plain = to_plain(value)
+        except TypeError as e:
+            logger.warning(f"Could not checkpoint stage '{stage}' for {self.job_id}: {e}")
+            return value
+        await self._save(stage, plain, convert=False)
+        return plain
+
+    async def save_request(self, request_data: Dict[str, Any]):
+        """Remember the job's request parameters (secrets are dropped)."""
+        try:
+            request = to_plain({
+                key: value for key, value in request_data.items() if key not in _SECRET_FIELDS
+            })
+            with self._lock:
+                self._manifest["request"] = request
+            await asyncio.to_thread(self._write_json, self.directory / "manifest.json", self._manifest)
+        except Exception as e:
+            logger.warning(f"Could not save checkpoint manifest for {self.job_id}: {e}")
+
+    def load_request(self) -> Optional[Dict[str, Any]]:
+        """Request parameters saved by save_request(), or None."""
+        return self._manifest.get("request")
+
+    def clear(self):
+        """Delete all checkpoints for the job."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+        self._manifest = {"request": None, "stages": {}}
+
+
+def get_job_checkpoints(report_id: int) -> JobCheckpoints:
+    """Checkpoints for an audit report job."""
+    return JobCheckpoints(f"report-{report_id}")
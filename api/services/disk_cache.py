@@ -0,0 +1,188 @@
+"""
+Size-bounded LRU store of JSON entries on disk, shared by the response caches.
+
+Each entry is one JSON file under <directory>/<first two hex chars>/<key>.json,
+written atomically (temp file + os.replace). Entries may carry an
+"expires_at" epoch timestamp; expired entries are dropped when read.
+
+File mtimes double as the LRU clock, so the index rebuilt from disk after a
+restart keeps the previous access order. When the total size exceeds
+max_bytes, least recently used entries are evicted.
+
+Subclasses (klaviyo.response_cache.ResponseCache,
+llm.response_cache.LLMResponseCache) decide keys, TTLs and entry contents.
+"""
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class DiskLRUCache:
+    """Size-bounded LRU cache of JSON entries stored one file per key."""
+
+    # Name used in log messages
+    label = "Disk cache"
+
+    def __init__(self, directory: Path, max_bytes: int):
+        """
+        Initialize disk cache.
+
+        Args:
+            directory: Directory holding cache entries
+            max_bytes: Total size bound; LRU entries are evicted beyond it
+        """
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+
+        # {key: size in bytes}, least recently used first (built lazily from disk)
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self._loaded = False
+        # File I/O runs in worker threads; the index is shared between them
+        self._lock = threading.RLock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def _load_index(self):
+        """Index existing entries by last access time (oldest first)."""
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.directory.exists():
+            return
+        entries = []
+        for path in self.directory.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, path.stem, stat.st_size))
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._total_bytes += size
+
+    def _forget(self, key: str):
+        size = self._index.pop(key, None)
+        if size is not None:
+            self._total_bytes -= size
+
+    def _remove(self, key: str):
+        self._forget(key)
+        try:
+            self._path(key).unlink()
+        except OSError:
+            pass
+
+    def _read(self, key: str) -> Optional[Dict[str, Any]]:
+        """Read an unexpired entry and mark it recently used (blocking)."""
+        with self._lock:
+            self._load_index()
+            path = self._path(key)
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    entry = json.load(f)
+            except FileNotFoundError:
+                self._forget(key)
+                return None
+            except (OSError, ValueError) as e:
+                logger.debug(f"Discarding unreadable {self.label.lower()} entry {key}: {e}")
+                self._remove(key)
+                return None
+
+            expires_at = entry.get("expires_at")
+            if expires_at is not None and expires_at <= time.time():
+                self._remove(key)
+                return None
+
+            # Mark as recently used (mtime doubles as the LRU clock across restarts)
+            try:
+                os.utime(path, None)
+            except OSError:
+                pass
+            if key in self._index:
+                self._index.move_to_end(key)
+            return entry
+
+    def _write(self, key: str, entry: Dict[str, Any]):
+        """Write an entry atomically and evict LRU entries over the bound (blocking)."""
+        with self._lock:
+            self._load_index()
+            payload = json.dumps(entry, separators=(",", ":"))
+            size = len(payload.encode("utf-8"))
+            if size > self.max_bytes:
+                return
+
+            path = self._path(key)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+
+            self._forget(key)
+            self._index[key] = size
+            self._total_bytes += size
+
+            while self._total_bytes > self.max_bytes and self._index:
+                self._remove(next(iter(self._index)))
+
+    async def get_entry(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up an entry, counting the hit or miss.
+
+        Returns:
+            Stored entry, or None on a miss, expired entry or read error
+        """
+        try:
+            entry = await asyncio.to_thread(self._read, key)
+        except Exception as e:
+            logger.warning(f"{self.label} read failed: {e}")
+            entry = None
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    async def set_entry(self, key: str, entry: Dict[str, Any]):
+        """
+        Store an entry. Failures are logged, never raised.
+
+        Args:
+            key: Entry key (hex digest)
+            entry: JSON-serializable entry; "expires_at" (epoch seconds or
+                None) controls expiry
+        """
+        try:
+            await asyncio.to_thread(self._write, key, entry)
+        except Exception as e:
+            logger.warning(f"{self.label} write failed: {e}")
+
+    def clear(self):
+        """Delete every cache entry."""
+        with self._lock:
+            self._load_index()
+            for key in list(self._index):
+                self._remove(key)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counts and current size."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._index),
+            "bytes": self._total_bytes,
+            "max_bytes": self.max_bytes
+        }
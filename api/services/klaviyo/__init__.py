@@ -9,10 +9,13 @@ New code can import specific services directly:
     from api.services.klaviyo.client import KlaviyoClient
 """
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
 from .client import KlaviyoClient
 from .rate_limiter import RateLimiter
+from .http_pool import get_http_client, aclose_http_client
+from .registry import get_account_quota, get_job_quota_usage, release_job
+from .response_cache import ResponseCache, get_response_cache
 from .metrics.service import MetricsService
 from .metrics.aggregates import MetricAggregatesService
 from .campaigns.service import CampaignsService
@@ -47,16 +50,24 @@ class KlaviyoService:
     
     BASE_URL = "https://a.klaviyo.com/api"
     
-    def __init__(self, api_key: str, rate_limit_tier: str = "medium"):
+    def __init__(
+        self,
+        api_key: str,
+        rate_limit_tier: str = "medium",
+        job_id: Optional[str] = None
+    ):
         """
         Initialize Klaviyo service.
         
         Args:
             api_key: Klaviyo API key
             rate_limit_tier: Rate limit tier - "small", "medium", "large", "xl"
+            job_id: Optional job ID for per-job quota usage reporting. The rate
+                    limiter itself is shared by all services for this API key.
         """
         self.api_key = api_key
-        self._client = KlaviyoClient(api_key, rate_limit_tier)
+        self.job_id = job_id
+        self._client = KlaviyoClient(api_key, rate_limit_tier, job_id=job_id)
         
         # Initialize all services
         from .account.service import AccountService
@@ -123,6 +134,12 @@ class KlaviyoService:
         """Test API connection (backward compatible)."""
         return await self._client.test_connection()
     
+    def quota_usage(self) -> Optional[Dict[str, Any]]:
+        """Share of the account's Klaviyo quota used by this service's job."""
+        if not self.job_id:
+            return None
+        return self._client.quota.job_report(self.job_id)
+    
     async def get_metrics(self) -> List[Dict[str, Any]]:
         """Get all metrics (backward compatible)."""
         return await self.metrics.get_metrics()
@@ -264,7 +281,9 @@ class KlaviyoService:
         date_range: Optional[Dict[str, str]] = None,
         include_enhanced: bool = True,
         verbose: bool = True,
-        fast_mode: bool = False
+        fast_mode: bool = False,
+        completed_sections: Optional[Dict[str, Any]] = None,
+        on_section_complete: Optional[Callable[[str, Any], Awaitable[None]]] = None
     ) -> Dict[str, Any]:
         """
         Extract all data from Klaviyo for audit reports.
@@ -276,6 +295,8 @@ class KlaviyoService:
             date_range: Optional custom date range
             include_enhanced: If True, includes enhanced data (list growth, forms, etc.)
             verbose: Whether to print progress messages
+            completed_sections: Section results from an interrupted run, which are not re-extracted
+            on_section_complete: Awaited with (section name, result) as each section succeeds
             
         Returns:
             Dict with all extracted Klaviyo data
@@ -283,7 +304,9 @@ class KlaviyoService:
         return await self._orchestrator.extract_all_data(
             date_range=date_range,
             include_enhanced=include_enhanced,
-            verbose=verbose
+            verbose=verbose,
+            completed_sections=completed_sections,
+            on_section_complete=on_section_complete
         )
     
     async def format_audit_data(
@@ -291,7 +314,8 @@ class KlaviyoService:
         days: int = 90,
         verbose: bool = True,
         industry: Optional[str] = None,
-        date_range: Optional[Dict[str, str]] = None
+        date_range: Optional[Dict[str, str]] = None,
+        raw_data: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """
         Format extracted data for audit report templates.
@@ -304,6 +328,8 @@ class KlaviyoService:
             verbose: Whether to print progress messages
             industry: Industry identifier for benchmark selection
             date_range: Optional custom date range (overrides days parameter)
+            raw_data: Optional result of extract_all_data() to format without
+                      re-extracting from Klaviyo
             
         Returns:
             Dict structured for audit template consumption
@@ -312,7 +338,8 @@ class KlaviyoService:
             days=days, 
             verbose=verbose, 
             industry=industry,
-            date_range=date_range
+            date_range=date_range,
+            raw_data=raw_data
         )
     
     # Backward compatibility alias
@@ -327,5 +354,18 @@ class KlaviyoService:
 
 
 # Export for backward compatibility
-__all__ = ["KlaviyoService", "KlaviyoClient", "RateLimiter", "MetricsService", "MetricAggregatesService"]
+__all__ = [
+    "KlaviyoService",
+    "KlaviyoClient",
+    "RateLimiter",
+    "MetricsService",
+    "MetricAggregatesService",
+    "get_http_client",
+    "aclose_http_client",
+    "get_account_quota",
+    "get_job_quota_usage",
+    "release_job",
+    "ResponseCache",
+    "get_response_cache",
+]
 
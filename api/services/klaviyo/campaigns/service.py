@@ -1,14 +1,19 @@
 """Campaigns service for fetching Klaviyo campaigns."""
 from typing import Dict, List, Optional, Any
 import logging
-from datetime import datetime
+import time
+from datetime import datetime, timezone
 
 from ..client import KlaviyoClient
-from ..filters import build_campaign_filter
-from ..utils.date_helpers import parse_iso_date
+from ..filters import build_campaign_filter, build_sparse_fieldset
+from ..snapshots import SNAPSHOT_SETTLE_MARGIN
+from ..utils.date_helpers import ensure_z_suffix, parse_iso_date
 
 logger = logging.getLogger(__name__)
 
+# Campaign attributes the audit reads (sent as fields[campaign])
+CAMPAIGN_FIELDS = ["name", "status", "archived", "created_at", "updated_at", "scheduled_at", "send_time"]
+
 
 class CampaignsService:
     """Service for interacting with Klaviyo campaigns."""
@@ -22,6 +27,114 @@ class CampaignsService:
         """
         self.client = client
     
+    @staticmethod
+    def _range_filter(start_date: Optional[str], end_date: Optional[str]):
+        """
+        Build a predicate keeping campaigns created in the date range.
+        
+        Args:
+            start_date: Start datetime in ISO format (optional)
+            end_date: End datetime in ISO format (optional)
+            
+        Returns:
+            Callable taking a campaign object and returning bool
+        """
+        start_dt = end_dt = None
+        if start_date and end_date:
+            try:
+                start_dt = parse_iso_date(start_date)
+                end_dt = parse_iso_date(end_date)
+            except (ValueError, TypeError) as e:
+                logger.warning(f"Error parsing date range: {e}")
+        
+        def in_range(c: Dict[str, Any]) -> bool:
+            if start_dt is None or end_dt is None:
+                return True
+            created_at = c.get("attributes", {}).get("created_at")
+            if not created_at:
+                return False
+            try:
+                return start_dt <= parse_iso_date(created_at) <= end_dt
+            except (ValueError, TypeError) as e:
+                logger.debug(f"Error parsing date for campaign {c.get('id')}: {e}")
+                return False
+        
+        return in_range
+    
+    async def _collect_in_range(
+        self,
+        params: Dict[str, Any],
+        start_date: Optional[str],
+        end_date: Optional[str]
+    ) -> List[Dict[str, Any]]:
+        """
+        Stream every campaigns page and keep campaigns created in the date range.
+        
+        Filtering happens page by page, so out-of-range campaigns are never
+        accumulated in memory.
+        
+        Args:
+            params: Query parameters (filter; the sparse fieldset is added here)
+            start_date: Start datetime in ISO format (optional)
+            end_date: End datetime in ISO format (optional)
+            
+        Returns:
+            List of campaign objects
+        """
+        params = {**params, **build_sparse_fieldset("campaign", CAMPAIGN_FIELDS)}
+        in_range = self._range_filter(start_date, end_date)
+        
+        campaigns = []
+        async for c in self.client.paginate("/campaigns/", params=params):
+            if in_range(c):
+                campaigns.append(c)
+        return campaigns
+    
+    async def _sync_campaigns(self, channel: str) -> List[Dict[str, Any]]:
+        """
+        Get every campaign for a channel, updating the account snapshot incrementally.
+        
+        With a snapshot, only campaigns updated since the last sync (less the
+        settle margin) are fetched and merged in by ID. Without one, all
+        campaigns are fetched and stored.
+        
+        Args:
+            channel: Channel type (email, sms, push)
+            
+        Returns:
+            List of all campaign objects for the channel
+        """
+        store = self.client.snapshots
+        fields = build_sparse_fieldset("campaign", CAMPAIGN_FIELDS)
+        synced_at = time.time()
+        
+        snapshot = await store.load_campaigns(channel)
+        if snapshot:
+            since = datetime.fromtimestamp(
+                snapshot["synced_at"] - SNAPSHOT_SETTLE_MARGIN.total_seconds(), tz=timezone.utc
+            )
+            params = {
+                "filter": build_campaign_filter(channel, updated_since=ensure_z_suffix(since.isoformat())),
+                **fields
+            }
+            try:
+                campaigns_by_id = {c["id"]: c for c in snapshot.get("campaigns", [])}
+                changed = 0
+                async for c in self.client.paginate("/campaigns/", params=params):
+                    campaigns_by_id[c["id"]] = c
+                    changed += 1
+                campaigns = list(campaigns_by_id.values())
+                logger.info(f"Synced {changed} updated {channel} campaigns into snapshot of {len(campaigns)}")
+                await store.save_campaigns(channel, campaigns, synced_at)
+                return campaigns
+            except Exception as e:
+                logger.warning(f"Incremental {channel} campaign sync failed, fetching all: {e}")
+        
+        params = {"filter": build_campaign_filter(channel), **fields}
+        campaigns = [c async for c in self.client.paginate("/campaigns/", params=params)]
+        await store.save_campaigns(channel, campaigns, synced_at)
+        return campaigns
+    
     async def get_campaigns(
         self,
         start_date: Optional[str] = None,
@@ -53,35 +166,14 @@ class CampaignsService:
             params["filter"] = filter_string
         
         try:
-            response = await self.client.request(
-                "GET",
-                "/campaigns/",
-                params=params if params else None
-            )
-            campaigns = response.get("data", [])
+            if self.client.snapshots is not None:
+                # Incremental extraction: merge recent updates into the account snapshot
+                campaigns = await self._sync_campaigns(channel)
+                in_range = self._range_filter(start_date, end_date)
+                return [c for c in campaigns if in_range(c)]
             
-            # Filter by date in Python if date range provided
-            if start_date and end_date:
-                try:
-                    start_dt = parse_iso_date(start_date)
-                    end_dt = parse_iso_date(end_date)
-                    filtered_campaigns = []
-                    for c in campaigns:
-                        created_at = c.get("attributes", {}).get("created_at")
-                        if created_at:
-                            try:
-                                created_dt = parse_iso_date(created_at)
-                                if start_dt <= created_dt <= end_dt:
-                                    filtered_campaigns.append(c)
-                            except (ValueError, TypeError) as e:
-                                logger.debug(f"Error parsing date for campaign {c.get('id')}: {e}")
-                                continue
-                    return filtered_campaigns
-                except (ValueError, TypeError) as e:
-                    logger.warning(f"Error parsing date range: {e}")
-                    return campaigns
-            
-            return campaigns
+            # Stream all pages, keeping only campaigns in the date range
+            return await self._collect_in_range(params, start_date, end_date)
             
         except Exception as e:
             # Check if this is a 400 error for push channel (not supported)
@@ -102,21 +194,7 @@ class CampaignsService:
                 try:
                     logger.info("Trying without date filters...")
                     simple_params = {"filter": f"equals(messages.channel,'{channel}')"}
-                    response = await self.client.request("GET", "/campaigns/", params=simple_params)
-                    campaigns = response.get("data", [])
-                    
-                    # Filter by date in Python if needed
-                    if start_date and end_date:
-                        try:
-                            start_dt = parse_iso_date(start_date)
-                            end_dt = parse_iso_date(end_date)
-                            campaigns = [
-                                c for c in campaigns 
-                                if 'created_at' in c.get("attributes", {})
-                                and start_dt <= parse_iso_date(c["attributes"]["created_at"]) <= end_dt
-                            ]
-                        except (ValueError, TypeError) as e:
-                            logger.warning(f"Error parsing date range in fallback: {e}")
+                    campaigns = await self._collect_in_range(simple_params, start_date, end_date)
                     
                     return campaigns
                 except Exception as e2:
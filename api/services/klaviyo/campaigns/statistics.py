@@ -3,11 +3,29 @@ from typing import Dict, List, Optional, Any
 import logging
 
 from ..client import KlaviyoClient
-from ..filters import build_reporting_filter
+from ..filters import build_reporting_filter, build_series_timeframes
 from ..metrics.service import MetricsService
+from ..reporting_planner import ReportRejected, get_reporting_planner
 
 logger = logging.getLogger(__name__)
 
+# Statistics requested on every campaign report so later requests for any
+# subset are served from the batch planner without another Reporting API call
+AUDIT_CAMPAIGN_STATISTICS = [
+    "opens",
+    "open_rate",
+    "clicks",
+    "click_rate",
+    "bounce_rate",
+    "recipients",
+    "delivery_rate",
+    "unsubscribe_rate",
+    "spam_complaint_rate",
+    "conversions",
+    "conversion_rate",
+    "conversion_value"
+]
+
 
 class CampaignStatisticsService:
     """Service for fetching campaign statistics using Reporting API."""
@@ -23,13 +41,57 @@ class CampaignStatisticsService:
         self.metrics = MetricsService(client)
         # Cache conversion_metric_id to avoid multiple lookups
         self._cached_conversion_metric_id = None
+        # Merges statistics requests from all services on this client into
+        # the fewest Reporting API calls and remembers results per campaign
+        self.planner = get_reporting_planner(
+            client,
+            id_type="campaign_id",
+            endpoint="/campaign-values-reports/",
+            fetch=self._fetch_report,
+            audit_statistics=AUDIT_CAMPAIGN_STATISTICS
+        )
+    
+    async def resolve_conversion_metric_id(self) -> Optional[str]:
+        """
+        Resolve (and cache) the Placed Order metric ID used for campaign conversions.
+        
+        Prefers the Shopify integration to match the Klaviyo dashboard.
+        
+        Returns:
+            Conversion metric ID, or None if no Placed Order metric exists
+        """
+        # Use cached value if available
+        if self._cached_conversion_metric_id:
+            logger.debug(f"Using cached conversion_metric_id: {self._cached_conversion_metric_id}")
+            return self._cached_conversion_metric_id
+        
+        # Only log on first resolution attempt
+        logger.info(
+            "Resolving conversion_metric_id for campaign statistics. "
+            "This will be cached for subsequent requests..."
+        )
+        # Prefer Shopify integration to match dashboard
+        placed_order = await self.metrics.get_metric_by_name("Placed Order", prefer_integration="shopify")
+        if not placed_order:
+            placed_order = await self.metrics.get_metric_by_name("Placed Order")
+        
+        if not placed_order:
+            return None
+        
+        conversion_metric_id = placed_order.get("id")
+        # Cache it for future use
+        self._cached_conversion_metric_id = conversion_metric_id
+        integration = placed_order.get("attributes", {}).get("integration", {})
+        logger.info(f"✓ Resolved conversion_metric_id: {conversion_metric_id} ({integration.get('name', 'Unknown')}) - cached for future use")
+        return conversion_metric_id
     
     async def get_statistics(
         self,
         campaign_ids: List[str],
         statistics: Optional[List[str]] = None,
         timeframe: str = "last_30_days",
-        conversion_metric_id: Optional[str] = None
+        conversion_metric_id: Optional[str] = None,
+        use_cache: bool = True
     ) -> Dict[str, Any]:
         """
         Get campaign statistics using Reporting API.
@@ -45,6 +107,8 @@ class CampaignStatisticsService:
             statistics: List of statistics to fetch (opens, clicks, etc.)
             timeframe: Time period (last_30_days, last_365_days, etc.)
             conversion_metric_id: Metric ID for conversion tracking (REQUIRED)
+            use_cache: Whether to reuse results already fetched by the batch
+                       planner (default True)
             
         Returns:
             Dict with campaign statistics
@@ -68,33 +132,37 @@ class CampaignStatisticsService:
         
         # conversion_metric_id is REQUIRED
         if not conversion_metric_id:
-            # Use cached value if available
-            if self._cached_conversion_metric_id:
-                logger.debug(f"Using cached conversion_metric_id: {self._cached_conversion_metric_id}")
-                conversion_metric_id = self._cached_conversion_metric_id
-            else:
-                # Only log warning on first resolution attempt
-                logger.info(
-                    "Resolving conversion_metric_id for campaign statistics. "
-                    "This will be cached for subsequent requests..."
+            conversion_metric_id = await self.resolve_conversion_metric_id()
+            if not conversion_metric_id:
+                logger.error(
+                    "Could not find Placed Order metric and no conversion_metric_id provided"
                 )
-                # Prefer Shopify integration to match dashboard
-                placed_order = await self.metrics.get_metric_by_name("Placed Order", prefer_integration="shopify")
-                if not placed_order:
-                    placed_order = await self.metrics.get_metric_by_name("Placed Order")
-                
-                if placed_order:
-                    conversion_metric_id = placed_order.get("id")
-                    # Cache it for future use
-                    self._cached_conversion_metric_id = conversion_metric_id
-                    integration = placed_order.get("attributes", {}).get("integration", {})
-                    logger.info(f"✓ Resolved conversion_metric_id: {conversion_metric_id} ({integration.get('name', 'Unknown')}) - cached for future use")
-                else:
-                    logger.error(
-                        "Could not find Placed Order metric and no conversion_metric_id provided"
-                    )
-                    return {}
+                return {}
+        
+        # Merge with other pending requests and reuse earlier results (batch planner)
+        return await self.planner.get(
+            ids=campaign_ids,
+            statistics=statistics,
+            timeframe=timeframe,
+            conversion_metric_id=conversion_metric_id,
+            use_cache=use_cache
+        )
+    
+    async def _fetch_report(
+        self,
+        campaign_ids: List[str],
+        statistics: List[str],
+        timeframe: str,
+        conversion_metric_id: str
+    ) -> Dict[str, Any]:
+        """
+        Make one campaign-values-report request (called by the batch planner).
+        
+        Returns {} on error, except for 400 rejections.
         
+        Raises:
+            ReportRejected: If the API rejects the request as invalid (400)
+        """
         # Build filter using reporting API syntax
         filter_string = build_reporting_filter(campaign_ids, "campaign_id")
         
@@ -113,8 +181,72 @@ class CampaignStatisticsService:
         try:
             return await self.client.request("POST", "/campaign-values-reports/", data=payload)
         except Exception as e:
+            if getattr(getattr(e, "response", None), "status_code", None) == 400:
+                # Invalid request (e.g. unsupported statistic) - the planner decides whether to retry
+                raise ReportRejected(str(e)) from e
             logger.error(f"Error fetching campaign statistics: {e}", exc_info=True)
             if hasattr(e, 'response') and hasattr(e.response, 'text'):
                 logger.debug(f"Response: {e.response.text}")
             return {}
-
+    
+    async def get_series(
+        self,
+        campaign_ids: List[str],
+        start_date: str,
+        end_date: str,
+        statistics: Optional[List[str]] = None,
+        interval: str = "daily",
+        conversion_metric_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get campaign statistics over time for an explicit date range.
+        
+        Unlike get_statistics (relative timeframes such as last_90_days), this
+        uses the campaign-series-reports endpoint bounded by start_date/end_date.
+        Ranges longer than the API allows for the interval are split, and IDs
+        are sent 100 per request.
+        Reference: https://developers.klaviyo.com/en/reference/query_campaign_series
+        
+        Args:
+            campaign_ids: List of campaign IDs
+            start_date: Start datetime in ISO format
+            end_date: End datetime in ISO format
+            statistics: Statistics to fetch (default ["conversion_value"])
+            interval: "daily", "weekly" or "monthly"
+            conversion_metric_id: Metric ID for conversion tracking
+            
+        Returns:
+            List of campaign-series-report responses (empty if any request fails)
+        """
+        if not campaign_ids:
+            return []
+        if not conversion_metric_id:
+            conversion_metric_id = await self.resolve_conversion_metric_id()
+            if not conversion_metric_id:
+                return []
+        
+        responses = []
+        try:
+            for timeframe in build_series_timeframes(start_date, end_date, interval):
+                for i in range(0, len(campaign_ids), 100):
+                    if responses:
+                        await self.client.pace("/campaign-series-reports/")
+                    payload = {
+                        "data": {
+                            "type": "campaign-series-report",
+                            "attributes": {
+                                "statistics": statistics or ["conversion_value"],
+                                "timeframe": timeframe,
+                                "interval": interval,
+                                "filter": build_reporting_filter(campaign_ids[i:i + 100], "campaign_id"),
+                                "conversion_metric_id": conversion_metric_id
+                            }
+                        }
+                    }
+                    responses.append(await self.client.request("POST", "/campaign-series-reports/", data=payload))
+        except Exception as e:
+            logger.error(f"Error fetching campaign series statistics: {e}", exc_info=True)
+            if hasattr(e, 'response') and hasattr(e.response, 'text'):
+                logger.debug(f"Response: {e.response.text}")
+            return []
+        return responses
@@ -2,23 +2,42 @@
 Base HTTP client for Klaviyo API.
 
 Handles:
-- HTTP requests with rate limiting
+- HTTP requests with rate limiting over a shared, pooled connection
+- Cursor pagination (streamed page by page, next page prefetched)
+- Optional on-disk response cache for read requests
+- Single-flight coalescing of identical concurrent reads
 - Retry logic with exponential backoff
 - Error handling
 - Authentication headers
 """
 import httpx
 import asyncio
+import copy
 import re
 import logging
-from typing import Dict, Optional, Any
+from typing import AsyncIterator, Dict, List, Optional, Any
+from urllib.parse import urlparse, parse_qs
 from httpx import HTTPStatusError
 
-from .rate_limiter import RateLimiter
+from .http_pool import get_http_client
+from .registry import get_account_quota
+from .response_cache import QUERY_GROUPS, ResponseCache, get_response_cache
+from .pacing import endpoint_group
+from .snapshots import AccountSnapshotStore, get_snapshot_store
 
 logger = logging.getLogger(__name__)
 
 
+class _InFlightRequest:
+    """A network request shared by identical concurrent callers."""
+    
+    __slots__ = ("task", "waiters")
+    
+    def __init__(self, task: asyncio.Future):
+        self.task = task
+        self.waiters = 0
+
+
 class KlaviyoClient:
     """
     Base HTTP client with rate limiting and retry logic.
@@ -29,15 +48,30 @@ class KlaviyoClient:
     
     BASE_URL = "https://a.klaviyo.com/api"
     
-    def __init__(self, api_key: str, rate_limit_tier: str = "medium"):
+    def __init__(
+        self,
+        api_key: str,
+        rate_limit_tier: str = "medium",
+        http_client: Optional[httpx.AsyncClient] = None,
+        job_id: Optional[str] = None,
+        response_cache: Optional[ResponseCache] = None
+    ):
         """
         Initialize Klaviyo client.
         
         Args:
             api_key: Klaviyo API key
             rate_limit_tier: Rate limit tier - "small", "medium", "large", "xl"
+            http_client: Optional httpx.AsyncClient to use instead of the
+                         process-wide pool (owned and closed by the caller)
+            job_id: Optional job ID used to report this client's share of
+                    the account's quota
+            response_cache: Optional on-disk response cache (defaults to the
+                            process-wide cache when KLAVIYO_RESPONSE_CACHE is on)
         """
         self.api_key = api_key
+        self.job_id = job_id
+        self._http_client = http_client
         self.headers = {
             "Authorization": f"Klaviyo-API-Key {api_key}",
             "revision": "2025-10-15",
@@ -45,18 +79,29 @@ class KlaviyoClient:
             "Content-Type": "application/json"
         }
         
-        # Initialize rate limiter based on tier (Updated 2025)
-        # Using optimized rates: 80% of limit for safety margin
-        # Klaviyo limits: S=3/60, M=10/150, L=75/700, XL=350/3500
-        rate_limits = {
-            "small": (2.4, 48),     # 80% of S tier: 2.4/sec, 48/min (limit: 3/sec, 60/min)
-            "medium": (8.0, 120),   # 80% of M tier: 8/sec, 120/min (limit: 10/sec, 150/min)
-            "large": (60.0, 560),   # 80% of L tier: 60/sec, 560/min (limit: 75/sec, 700/min)
-            "xl": (280.0, 2800)     # 80% of XL tier: 280/sec, 2800/min (limit: 350/sec, 3500/min)
-        }
+        # Rate limiter is shared by every client for this API key (see registry.py)
+        self.quota = get_account_quota(api_key, rate_limit_tier, job_id=job_id)
+        self.rate_limiter = self.quota.rate_limiter
         
-        rps, rpm = rate_limits.get(rate_limit_tier.lower(), rate_limits["small"])
-        self.rate_limiter = RateLimiter(requests_per_second=rps, requests_per_minute=rpm)
+        # Read responses may be served from disk (see response_cache.py)
+        self.response_cache = response_cache if response_cache is not None else get_response_cache()
+        
+        # Per-account snapshots for incremental extraction (None when disabled)
+        self.snapshots: Optional[AccountSnapshotStore] = get_snapshot_store(self.quota.key_hash)
+        
+        # Reporting API batch planners shared by all services on this client
+        # (see reporting_planner.py), keyed by report id type
+        self.reporting_planners: Dict[str, Any] = {}
+        
+        # Requests answered by joining an identical in-flight request
+        self.coalesced_requests = 0
+    
+    @property
+    def http(self) -> httpx.AsyncClient:
+        """HTTP client used for requests (injected client or the shared pool)."""
+        if self._http_client is not None:
+            return self._http_client
+        return get_http_client()
     
     async def request(
         self,
@@ -65,11 +110,17 @@ class KlaviyoClient:
         params: Optional[Dict] = None,
         data: Optional[Dict] = None,
         retry_on_429: bool = True,
-        max_retries: int = 3
+        max_retries: int = 3,
+        use_cache: bool = True
     ) -> Dict[str, Any]:
         """
         Make HTTP request to Klaviyo API with rate limiting.
         
+        Cacheable reads are answered from the response cache (if enabled)
+        without touching the rate limiter or the network. Identical reads
+        already in flight for the same account are joined instead of sent
+        again (single-flight).
+        
         Args:
             method: HTTP method (GET, POST, etc.)
             endpoint: API endpoint (e.g., "/metrics/")
@@ -77,6 +128,7 @@ class KlaviyoClient:
             data: Request body (will be JSON encoded)
             retry_on_429: Whether to retry on rate limit errors
             max_retries: Maximum number of retries for 429 errors
+            use_cache: Whether the response cache may be read and written
             
         Returns:
             JSON response as dict
@@ -84,95 +136,142 @@ class KlaviyoClient:
         Raises:
             HTTPStatusError: If request fails after all retries
         """
+        cache_key = None
+        cache_ttl = None
+        if use_cache and self.response_cache is not None:
+            cacheable, cache_ttl = self.response_cache.ttl_for(method, endpoint, data)
+            if cacheable:
+                cache_key = ResponseCache.make_key(self.quota.key_hash, method, endpoint, params, data)
+                cached = await self.response_cache.get(cache_key)
+                if cached is not None:
+                    logger.debug(f"Serving {method} {endpoint} from response cache")
+                    return cached
+        
+        if not self._coalescable(method, endpoint):
+            return await self._send(
+                method, endpoint, params, data, retry_on_429, max_retries, cache_key, cache_ttl
+            )
+        
+        # Join an identical request that is already in flight for this account
+        flight_key = ResponseCache.make_key(self.quota.key_hash, method, endpoint, params, data)
+        in_flight = self.quota.in_flight
+        flight = in_flight.get(flight_key)
+        if flight is not None and flight.task.get_loop() is asyncio.get_running_loop():
+            flight.waiters += 1
+            self.coalesced_requests += 1
+            logger.debug(f"Joining in-flight {method} {endpoint}")
+            # Each waiter gets its own copy so callers can't mutate each other's results
+            return copy.deepcopy(await asyncio.shield(flight.task))
+        
+        # Run the request as a task so a cancelled caller doesn't cancel it for the others
+        flight = _InFlightRequest(asyncio.ensure_future(self._send(
+            method, endpoint, params, data, retry_on_429, max_retries, cache_key, cache_ttl
+        )))
+        in_flight[flight_key] = flight
+        flight.task.add_done_callback(lambda task: self._end_flight(flight_key, flight))
+        result = await asyncio.shield(flight.task)
+        # The map entry is removed before any caller resumes, so waiters is final here
+        return copy.deepcopy(result) if flight.waiters else result
+    
+    @staticmethod
+    def _coalescable(method: str, endpoint: str) -> bool:
+        """Whether a request is a read that identical concurrent requests may share."""
+        method = method.upper()
+        return method == "GET" or (method == "POST" and endpoint_group(endpoint) in QUERY_GROUPS)
+    
+    def _end_flight(self, flight_key: str, flight: _InFlightRequest):
+        """Remove a finished request from the in-flight map."""
+        if self.quota.in_flight.get(flight_key) is flight:
+            del self.quota.in_flight[flight_key]
+        if not flight.task.cancelled():
+            # Mark the exception retrieved; waiters re-raise it themselves
+            flight.task.exception()
+    
+    async def _send(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict],
+        data: Optional[Dict],
+        retry_on_429: bool,
+        max_retries: int,
+        cache_key: Optional[str],
+        cache_ttl: Optional[float]
+    ) -> Dict[str, Any]:
+        """Send a request over the network with rate limiting and retries (see request())."""
         url = f"{self.BASE_URL}{endpoint}"
         
-        # Wait for rate limiter
+        # Wait out a Retry-After block on this endpoint, then for the account limiter
+        await self.quota.pacer.wait_if_blocked(endpoint)
         await self.rate_limiter.acquire()
         
         for attempt in range(max_retries + 1):
             try:
-                async with httpx.AsyncClient(timeout=30.0) as client:
-                    response = await client.request(
-                        method=method,
-                        url=url,
-                        headers=self.headers,
-                        params=params,
-                        json=data
-                    )
-                    
-                    # Parse and use Klaviyo rate limit headers (if available)
-                    # Check RateLimit-Remaining BEFORE processing response
-                    rate_limit_remaining = None
-                    rate_limit_reset = None
-                    try:
-                        rate_limit_remaining = response.headers.get("RateLimit-Remaining")
-                        rate_limit_reset = response.headers.get("RateLimit-Reset")
-                        if rate_limit_remaining:
-                            remaining_int = int(rate_limit_remaining)
-                            # If we're very low on quota (< 5 remaining), wait before next request
-                            if remaining_int < 5 and rate_limit_reset:
-                                reset_seconds = int(rate_limit_reset)
-                                if reset_seconds > 0 and reset_seconds < 60:
-                                    logger.warning(
-                                        f"Rate limit quota very low ({remaining_int} remaining, "
-                                        f"resets in {reset_seconds}s). Waiting {reset_seconds}s before continuing..."
-                                    )
-                                    await asyncio.sleep(reset_seconds)
-                    except (ValueError, TypeError):
-                        pass
-                    
-                    # Update rate limiter based on headers
-                    self._update_rate_limits_from_headers(response)
+                response = await self.http.request(
+                    method=method,
+                    url=url,
+                    headers=self.headers,
+                    params=params,
+                    json=data
+                )
+                
+                # Update rate limiter based on Klaviyo RateLimit-* headers
+                self.quota.record_request(self.job_id, rate_limited=response.status_code == 429)
+                self._update_rate_limits_from_headers(response, endpoint)
+                
+                # Check for rate limiting
+                if response.status_code == 429 and retry_on_429 and attempt < max_retries:
+                    # Use Retry-After header (Klaviyo provides this on 429 errors)
+                    retry_after = self._extract_retry_after_from_header(response)
+                    if not retry_after:
+                        # Fallback: try to extract from JSON body
+                        retry_after = self._extract_retry_after(response)
+                    if not retry_after:
+                        # Exponential backoff as last resort
+                        base_delay = min(2 ** attempt, 10)
+                        import random
+                        jitter = random.uniform(0.1, 0.3)
+                        retry_after = base_delay + jitter
                     
-                    # Check for rate limiting
-                    if response.status_code == 429 and retry_on_429 and attempt < max_retries:
-                        # Use Retry-After header (Klaviyo provides this on 429 errors)
-                        retry_after = self._extract_retry_after_from_header(response)
-                        if not retry_after:
-                            # Fallback: try to extract from JSON body
-                            retry_after = self._extract_retry_after(response)
-                        if not retry_after:
-                            # Exponential backoff as last resort
-                            base_delay = min(2 ** attempt, 10)
-                            import random
-                            jitter = random.uniform(0.1, 0.3)
-                            retry_after = base_delay + jitter
-                        
-                        # Cap retry time at 5 minutes max (anything longer is likely an error)
-                        # Klaviyo rate limits reset every minute, so max should be ~60 seconds
-                        capped_retry = min(retry_after, 300)  # Cap at 5 minutes
-                        if capped_retry != retry_after:
-                            logger.warning(
-                                f"Retry-After value {retry_after}s capped to {capped_retry}s "
-                                f"(rate limit windows reset every minute)"
-                            )
-                        
-                        # If retry time is still unreasonable (> 2 minutes), fail fast instead of waiting
-                        if capped_retry > 120:  # More than 2 minutes
-                            logger.error(
-                                f"Rate limit retry time too long ({capped_retry}s). "
-                                f"Failing request instead of waiting. Please try again later."
-                            )
-                            raise HTTPStatusError(
-                                f"Rate limit exceeded. Retry-After: {capped_retry}s. "
-                                f"Please wait and try again later.",
-                                request=None,
-                                response=response
-                            )
-                        
+                    # Cap retry time at 5 minutes max (anything longer is likely an error)
+                    # Klaviyo rate limits reset every minute, so max should be ~60 seconds
+                    capped_retry = min(retry_after, 300)  # Cap at 5 minutes
+                    if capped_retry != retry_after:
                         logger.warning(
-                            f"Rate limited (429). Waiting {capped_retry:.1f} seconds before retry "
-                            f"{attempt + 1}/{max_retries}..."
+                            f"Retry-After value {retry_after}s capped to {capped_retry}s "
+                            f"(rate limit windows reset every minute)"
                         )
-                        await asyncio.sleep(capped_retry)
-                        
-                        # Wait for rate limiter again before retry
-                        await self.rate_limiter.acquire()
-                        continue
                     
-                    response.raise_for_status()
-                    return response.json()
+                    # If retry time is still unreasonable (> 2 minutes), fail fast instead of waiting
+                    if capped_retry > 120:  # More than 2 minutes
+                        logger.error(
+                            f"Rate limit retry time too long ({capped_retry}s). "
+                            f"Failing request instead of waiting. Please try again later."
+                        )
+                        raise HTTPStatusError(
+                            f"Rate limit exceeded. Retry-After: {capped_retry}s. "
+                            f"Please wait and try again later.",
+                            request=None,
+                            response=response
+                        )
                     
+                    logger.warning(
+                        f"Rate limited (429). Waiting {capped_retry:.1f} seconds before retry "
+                        f"{attempt + 1}/{max_retries}..."
+                    )
+                    # Block this endpoint (concurrent requests to it back off too, other
+                    # endpoints keep going), then wait for a permit before retrying
+                    self.quota.pacer.record(endpoint, retry_after=capped_retry)
+                    await self.quota.pacer.wait_if_blocked(endpoint)
+                    await self.rate_limiter.acquire()
+                    continue
+                
+                response.raise_for_status()
+                result = response.json()
+                if cache_key is not None:
+                    await self.response_cache.set(cache_key, endpoint, result, cache_ttl)
+                return result
+                
             except HTTPStatusError as e:
                 # Don't retry 400 errors (bad request) - they won't succeed on retry
                 if e.response.status_code == 400:
@@ -189,7 +288,8 @@ class KlaviyoClient:
                         f"Rate limited (429). Waiting {retry_after:.1f} seconds before retry "
                         f"{attempt + 1}/{max_retries}..."
                     )
-                    await asyncio.sleep(retry_after)
+                    self.quota.pacer.record(endpoint, retry_after=retry_after)
+                    await self.quota.pacer.wait_if_blocked(endpoint)
                     await self.rate_limiter.acquire()
                     continue
                 # For other errors (5xx), retry if we have attempts left
@@ -231,7 +331,127 @@ class KlaviyoClient:
             logger.debug(f"Could not parse Retry-After header: {e}")
         return None
     
-    def _update_rate_limits_from_headers(self, response):
+    @staticmethod
+    def _next_cursor(response: Dict[str, Any]) -> Optional[str]:
+        """
+        Extract the next page cursor from a JSON:API response.
+        
+        Klaviyo returns the next page as a full URL in links.next, e.g.
+        https://a.klaviyo.com/api/lists/?page%5Bcursor%5D=bmV4dDo6aWQ6Ok43dW1iVw
+        """
+        next_url = (response.get("links") or {}).get("next")
+        if not next_url:
+            return None
+        cursor_list = parse_qs(urlparse(next_url).query).get("page[cursor]", [])
+        return cursor_list[0] if cursor_list else None
+    
+    async def paginate_pages(
+        self,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        max_pages: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream every page of a collection endpoint.
+        
+        Pages are yielded lazily as full JSON:API responses (so "included"
+        resources are available). While the caller processes a page, the
+        next page is already being fetched.
+        
+        Args:
+            endpoint: Collection endpoint (e.g., "/campaigns/")
+            params: Query parameters for every page (filter, fields, include...)
+            max_pages: Optional maximum number of pages to fetch
+            
+        Yields:
+            Response dict for each page
+            
+        Raises:
+            HTTPStatusError: If a page request fails
+        """
+        base_params = dict(params or {})
+        next_task: Optional[asyncio.Future] = asyncio.ensure_future(
+            self.request("GET", endpoint, params=base_params or None)
+        )
+        pages = 0
+        
+        try:
+            while next_task is not None:
+                response = await next_task
+                next_task = None
+                pages += 1
+                
+                # Prefetch the next page before handing this one to the caller
+                cursor = self._next_cursor(response)
+                if cursor and (max_pages is None or pages < max_pages):
+                    next_task = asyncio.ensure_future(
+                        self.request("GET", endpoint, params={**base_params, "page[cursor]": cursor})
+                    )
+                
+                yield response
+        finally:
+            # Caller stopped early (or an error occurred) - drop the prefetch
+            if next_task is not None:
+                if not next_task.done():
+                    next_task.cancel()
+                elif not next_task.cancelled():
+                    next_task.exception()  # Mark a failed prefetch as retrieved
+    
+    async def paginate(
+        self,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        max_pages: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream every resource of a collection endpoint, one at a time.
+        
+        Args:
+            endpoint: Collection endpoint (e.g., "/flows/")
+            params: Query parameters for every page
+            max_pages: Optional maximum number of pages to fetch
+            
+        Yields:
+            Resource objects from each page's "data"
+        """
+        async for page in self.paginate_pages(endpoint, params, max_pages):
+            for resource in page.get("data", []):
+                yield resource
+    
+    async def get_all(
+        self,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        max_pages: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Collect every resource of a collection endpoint into a list.
+        
+        Args:
+            endpoint: Collection endpoint
+            params: Query parameters for every page
+            max_pages: Optional maximum number of pages to fetch
+            
+        Returns:
+            List of resource objects
+        """
+        return [resource async for resource in self.paginate(endpoint, params, max_pages)]
+    
+    async def pace(self, endpoint: str) -> float:
+        """
+        Wait between batches only when the endpoint's rate limit window needs it.
+        
+        Use this instead of fixed sleeps between batches of requests.
+        
+        Args:
+            endpoint: Endpoint the next batch will call (e.g., "/flow-values-reports/")
+            
+        Returns:
+            Seconds waited
+        """
+        return await self.quota.pacer.pace(endpoint)
+    
+    def _update_rate_limits_from_headers(self, response, endpoint: Optional[str] = None):
         """
         Update rate limiter based on Klaviyo RateLimit headers.
         
@@ -240,52 +460,37 @@ class KlaviyoClient:
         - RateLimit-Remaining: The approximate number of requests remaining within a window
         - RateLimit-Reset: Number of seconds remaining before current window resets
         
-        We use these to dynamically adjust our rate limiting to match Klaviyo's actual limits.
+        The windows are per endpoint, so they only feed the per-endpoint pacer;
+        requests to other endpoints keep the account limiter's full rate.
         """
         try:
             # Get rate limit headers
-            limit = response.headers.get("RateLimit-Limit")
-            remaining = response.headers.get("RateLimit-Remaining")
-            reset = response.headers.get("RateLimit-Reset")
+            limit = self._parse_rate_limit_header(response.headers.get("RateLimit-Limit"))
+            remaining = self._parse_rate_limit_header(response.headers.get("RateLimit-Remaining"))
+            reset = self._parse_rate_limit_header(response.headers.get("RateLimit-Reset"))
             
-            if limit and remaining and reset:
-                limit_int = int(limit)
-                remaining_int = int(remaining)
-                reset_int = int(reset)
-                
-                # If we're running low on remaining requests, slow down significantly
-                # Calculate requests per minute from limit
-                # Klaviyo uses 1-minute windows for steady rate limits
-                if remaining_int < 10:  # Less than 10 remaining - CRITICAL
-                    # Very aggressive slowdown - use only what's remaining
-                    self.rate_limiter.requests_per_minute = max(1, remaining_int)
-                    logger.warning(
-                        f"⚠️ Rate limit CRITICAL ({remaining_int}/{limit_int} remaining). "
-                        f"Reduced to {self.rate_limiter.requests_per_minute} req/min. "
-                        f"Window resets in {reset_int}s"
-                    )
-                elif remaining_int < limit_int * 0.2:  # Less than 20% remaining
-                    # Slow down significantly - use 30% of limit
-                    self.rate_limiter.requests_per_minute = max(
-                        int(limit_int * 0.3),  # Use 30% of limit when low
-                        remaining_int  # But never less than remaining
-                    )
-                    logger.warning(
-                        f"⚠️ Rate limit low ({remaining_int}/{limit_int} remaining). "
-                        f"Reduced to {self.rate_limiter.requests_per_minute} req/min. "
-                        f"Window resets in {reset_int}s"
-                    )
-                elif remaining_int > limit_int * 0.5:  # More than 50% remaining
-                    # We have plenty of quota, can use normal rate
-                    # Reset to configured rate (80% of limit)
-                    original_rpm = int(limit_int * 0.8)
-                    if self.rate_limiter.requests_per_minute < original_rpm:
-                        self.rate_limiter.requests_per_minute = original_rpm
-                        logger.debug(f"Rate limit healthy ({remaining_int}/{limit_int}). Reset to {original_rpm} req/min")
-        except (ValueError, TypeError, AttributeError) as e:
+            if remaining is not None and endpoint:
+                self.quota.pacer.record(endpoint, remaining=remaining, reset=reset)
+            
+            if limit is not None and remaining is not None and reset is not None:
+                self.quota.record_headers(limit, remaining, reset)
+        except (ValueError, TypeError, AttributeError):
             # Headers not available or invalid - that's okay, use defaults
             pass
     
+    @staticmethod
+    def _parse_rate_limit_header(value: Optional[str]) -> Optional[int]:
+        """
+        Parse the leading integer of a RateLimit-* header.
+        
+        Handles both plain values ("150") and structured values with window
+        parameters ("150, 10;w=1, 150;w=60").
+        """
+        if not value:
+            return None
+        match = re.match(r'\s*(\d+)', value)
+        return int(match.group(1)) if match else None
+    
     def _extract_retry_after(self, response) -> Optional[int]:
         """
         Extract retry-after delay from 429 response JSON body (fallback).
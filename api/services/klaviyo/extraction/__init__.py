@@ -10,6 +10,7 @@ from .flow_extractor import FlowExtractor
 from .list_extractor import ListExtractor
 from .form_extractor import FormExtractor
 from .kav_extractor import KAVExtractor
+from .section_graph import ExtractionSection, SectionGraph
 
 __all__ = [
     "RevenueExtractor",
@@ -18,5 +19,7 @@ __all__ = [
     "ListExtractor",
     "FormExtractor",
     "KAVExtractor",
+    "ExtractionSection",
+    "SectionGraph",
 ]
 
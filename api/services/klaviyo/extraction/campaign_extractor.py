@@ -1,7 +1,6 @@
 """
 Campaign data extraction module.
 """
-import asyncio
 import logging
 from typing import Dict, Any, List
 
@@ -75,66 +74,26 @@ class CampaignExtractor:
         # Get statistics for all campaigns
         campaign_statistics = {}
         if all_campaigns:
-            # Batch campaigns to reduce API load
             all_campaign_ids = [c["id"] for c in all_campaigns[:50]]
-            batch_size = 15  # Process 15 campaigns at a time to reduce rate limiting
             
             if verbose:
-                print(f"  Fetching statistics for {len(all_campaign_ids)} campaigns in batches of {batch_size}...")
+                print(f"  Fetching statistics for {len(all_campaign_ids)} campaigns...")
             
-            # Resolve conversion_metric_id once before processing batches
-            # This prevents repeated lookups and warnings
-            conversion_metric_id = None
-            if hasattr(self.campaign_stats, '_cached_conversion_metric_id') and self.campaign_stats._cached_conversion_metric_id:
-                conversion_metric_id = self.campaign_stats._cached_conversion_metric_id
-            else:
-                # Trigger resolution on first batch (will cache it)
-                # We'll get it from the cache after first call
-                pass
+            # Use the conversion_metric_id resolved up front (if any) to avoid repeated lookups
+            conversion_metric_id = getattr(self.campaign_stats, '_cached_conversion_metric_id', None)
             
-            # Process campaigns in batches with delays
-            for i in range(0, len(all_campaign_ids), batch_size):
-                batch_ids = all_campaign_ids[i:i + batch_size]
-                batch_num = (i // batch_size) + 1
-                total_batches = (len(all_campaign_ids) + batch_size - 1) // batch_size
-                
-                if verbose and total_batches > 1:
-                    print(f"    Processing batch {batch_num}/{total_batches} ({len(batch_ids)} campaigns)...")
-                
-                try:
-                    # Use cached conversion_metric_id if available (after first batch)
-                    if conversion_metric_id is None and hasattr(self.campaign_stats, '_cached_conversion_metric_id'):
-                        conversion_metric_id = self.campaign_stats._cached_conversion_metric_id
-                    
-                    batch_stats = await self.campaign_stats.get_statistics(
-                        campaign_ids=batch_ids,
-                        timeframe="last_365_days",
-                        conversion_metric_id=conversion_metric_id  # Pass it explicitly to avoid repeated lookups
-                    )
-                    
-                    # After first batch, get the cached value for subsequent batches
-                    if conversion_metric_id is None and hasattr(self.campaign_stats, '_cached_conversion_metric_id'):
-                        conversion_metric_id = self.campaign_stats._cached_conversion_metric_id
-                    
-                    # Merge batch results
-                    if batch_stats:
-                        if not campaign_statistics:
-                            campaign_statistics = batch_stats
-                        else:
-                            # Merge results if multiple batches
-                            batch_results = batch_stats.get("data", {}).get("attributes", {}).get("results", [])
-                            if batch_results and "data" in campaign_statistics:
-                                existing_results = campaign_statistics["data"]["attributes"].get("results", [])
-                                existing_results.extend(batch_results)
-                    
-                    # Add delay between batches to avoid rate limiting
-                    if i + batch_size < len(all_campaign_ids):
-                        await asyncio.sleep(1.5)  # 1.5 second delay between batches
-                        
-                except Exception as e:
-                    if verbose:
-                        print(f"    ⚠️ Batch {batch_num} failed: {e}")
-                    continue
+            # One request for all campaigns - the batch planner merges it with other
+            # sections' campaign statistics requests and splits by the 100-ID API limit
+            try:
+                campaign_statistics = await self.campaign_stats.get_statistics(
+                    campaign_ids=all_campaign_ids,
+                    timeframe="last_365_days",
+                    conversion_metric_id=conversion_metric_id
+                )
+            except Exception as e:
+                if verbose:
+                    print(f"    ⚠️ Campaign statistics request failed: {e}")
+                campaign_statistics = {}
             
             if campaign_statistics and verbose:
                 total_results = 0
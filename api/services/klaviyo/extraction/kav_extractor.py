@@ -59,7 +59,8 @@ class KAVExtractor:
                 days=days_for_analysis, 
                 interval="month",  # Changed to monthly to match sample audit
                 account_timezone=account_timezone,
-                date_range=date_range
+                date_range=date_range,
+                include_previous_period=True  # Period-over-period comparison without a second extraction
             )
             
             if verbose:
@@ -0,0 +1,139 @@
+"""
+Dependency-graph executor for extraction sections.
+
+Each section declares the sections it depends on. Sections run concurrently
+as soon as their dependencies finish, so total extraction time is bounded by
+the slowest dependency chain rather than the sum of all sections. All
+Klaviyo calls still go through the shared client rate limiter.
+
+Every section has its own timeout and error isolation: a failing or slow
+section yields its default value and never blocks unrelated sections.
+
+Callers can resume a partial run: sections passed in ``completed`` are not
+run again, and ``on_complete`` is awaited after each section that succeeds
+so its result can be persisted.
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ExtractionSection:
+    """A single extraction step in the section graph."""
+    name: str
+    run: Callable[[Dict[str, Any]], Awaitable[Any]]  # Receives results of completed dependencies
+    depends_on: List[str] = field(default_factory=list)
+    timeout: float = 300.0  # Seconds before the section is abandoned
+    default: Any = None  # Result used when the section fails or times out
+
+
+class SectionGraph:
+    """Runs ExtractionSections concurrently in dependency order."""
+
+    def __init__(
+        self,
+        sections: List[ExtractionSection],
+        completed: Optional[Dict[str, Any]] = None,
+        on_complete: Optional[Callable[[str, Any], Awaitable[None]]] = None
+    ):
+        """
+        Initialize section graph.
+
+        Args:
+            sections: Sections to run (names must be unique)
+            completed: Results of sections finished by an earlier run; these are not rerun
+            on_complete: Awaited with (name, result) after each section succeeds
+
+        Raises:
+            ValueError: If a dependency is unknown or the graph has a cycle
+        """
+        self.sections = {section.name: section for section in sections}
+        self.completed = dict(completed or {})
+        self.on_complete = on_complete
+        self.timings: Dict[str, float] = {}
+        self._validate()
+
+    def _validate(self):
+        """Ensure all dependencies exist and the graph is acyclic."""
+        for section in self.sections.values():
+            for dep in section.depends_on:
+                if dep not in self.sections:
+                    raise ValueError(f"Section '{section.name}' depends on unknown section '{dep}'")
+
+        visiting, visited = set(), set()
+
+        def visit(name: str):
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f"Cycle detected in extraction sections at '{name}'")
+            visiting.add(name)
+            for dep in self.sections[name].depends_on:
+                visit(dep)
+            visiting.discard(name)
+            visited.add(name)
+
+        for name in self.sections:
+            visit(name)
+
+    async def _run_section(
+        self,
+        section: ExtractionSection,
+        tasks: Dict[str, "asyncio.Task"]
+    ) -> Any:
+        """Wait for dependencies, then run one section with timeout and error isolation."""
+        if section.name in self.completed:
+            logger.info(f"Extraction section '{section.name}' restored from an earlier run")
+            return self.completed[section.name]
+
+        dep_results = {}
+        for dep in section.depends_on:
+            dep_results[dep] = await tasks[dep]
+
+        start = time.monotonic()
+        succeeded = False
+        try:
+            result = await asyncio.wait_for(section.run(dep_results), timeout=section.timeout)
+            succeeded = True
+        except asyncio.TimeoutError:
+            logger.error(f"Extraction section '{section.name}' timed out after {section.timeout:.0f}s")
+            result = section.default
+        except Exception as e:
+            logger.error(f"Extraction section '{section.name}' failed: {e}", exc_info=True)
+            result = section.default
+        finally:
+            self.timings[section.name] = time.monotonic() - start
+
+        logger.info(f"Extraction section '{section.name}' finished in {self.timings[section.name]:.1f}s")
+
+        if succeeded and self.on_complete is not None:
+            try:
+                await self.on_complete(section.name, result)
+            except Exception as e:
+                logger.warning(f"Could not record completion of section '{section.name}': {e}")
+        return result
+
+    async def run(self) -> Dict[str, Any]:
+        """
+        Run all sections.
+
+        Returns:
+            Dict mapping section name to its result (or default on failure)
+        """
+        tasks: Dict[str, asyncio.Task] = {}
+        for name, section in self.sections.items():
+            tasks[name] = asyncio.ensure_future(self._run_section(section, tasks))
+
+        try:
+            await asyncio.gather(*tasks.values())
+        except asyncio.CancelledError:
+            for task in tasks.values():
+                task.cancel()
+            raise
+
+        return {name: task.result() for name, task in tasks.items()}
@@ -1,5 +1,15 @@
 """Filter building utilities for Klaviyo API filters."""
-from typing import List, Optional
+from datetime import timedelta
+from typing import Dict, List, Optional
+
+from .utils.date_helpers import ensure_z_suffix, parse_iso_date
+
+# Longest timeframe (days) the Reporting API accepts per series interval
+SERIES_MAX_DAYS = {
+    "daily": 60,
+    "weekly": 364,
+    "monthly": 364,
+}
 
 
 def build_metric_filter(
@@ -33,7 +43,8 @@ def build_metric_filter(
 def build_campaign_filter(
     channel: str = "email",
     start_date: Optional[str] = None,
-    end_date: Optional[str] = None
+    end_date: Optional[str] = None,
+    updated_since: Optional[str] = None
 ) -> Optional[str]:
     """
     Build filter string for campaigns endpoint.
@@ -45,6 +56,8 @@ def build_campaign_filter(
         channel: Channel type (email, sms, push)
         start_date: Start datetime (not used in filter, for reference only)
         end_date: End datetime (not used in filter, for reference only)
+        updated_since: Only campaigns updated after this ISO datetime
+                       (incremental sync)
         
     Returns:
         Filter string or None
@@ -58,6 +71,9 @@ def build_campaign_filter(
     #     filters.append(f"greater-or-equal(created_at,'{start_date}')")
     #     filters.append(f"less-or-equal(created_at,'{end_date}')")
     
+    if updated_since:
+        filters.append(f"greater-than(updated_at,{updated_since})")
+    
     # Combine with and() operator if multiple conditions
     if len(filters) > 1:
         return f"and({','.join(filters)})"
@@ -90,3 +106,50 @@ def build_reporting_filter(ids: List[str], id_type: str) -> str:
         ids_formatted = '","'.join(ids_subset)
         return f'contains-any({id_type},["{ids_formatted}"])'
 
+
+
+def build_sparse_fieldset(resource_type: str, fields: List[str]) -> Dict[str, str]:
+    """
+    Build a JSON:API sparse fieldset parameter.
+    
+    Klaviyo returns every attribute of a resource unless fields[TYPE] is
+    given, so services request only the attributes they read.
+    
+    Args:
+        resource_type: JSON:API resource type ("flow", "flow-action", etc.)
+        fields: Attribute names to return
+        
+    Returns:
+        Query parameter dict, e.g. {"fields[flow]": "name,status"}
+    """
+    return {f"fields[{resource_type}]": ",".join(fields)}
+
+
+def build_series_timeframes(start_date: str, end_date: str, interval: str) -> List[Dict[str, str]]:
+    """
+    Split a date range into Reporting API series timeframes.
+    
+    Series reports limit how long a timeframe may be for each interval, so
+    longer ranges are split into consecutive windows.
+    
+    Args:
+        start_date: Start datetime in ISO format
+        end_date: End datetime in ISO format
+        interval: Series interval ("daily", "weekly", "monthly")
+        
+    Returns:
+        List of {"start": ..., "end": ...} timeframes covering the range
+    """
+    start = parse_iso_date(start_date)
+    end = parse_iso_date(end_date)
+    span = timedelta(days=SERIES_MAX_DAYS.get(interval, SERIES_MAX_DAYS["daily"]))
+    
+    timeframes = []
+    while start < end:
+        window_end = min(start + span, end)
+        timeframes.append({
+            "start": ensure_z_suffix(start.isoformat()),
+            "end": ensure_z_suffix(window_end.isoformat())
+        })
+        start = window_end
+    return timeframes
@@ -0,0 +1,138 @@
+"""
+Bounded-concurrency crawler for flow details.
+
+Walks flows, then their actions, then each action's messages, keeping at
+most KLAVIYO_FLOW_CRAWL_CONCURRENCY (default 5) requests in flight. Every
+request still goes through the client's shared rate limiter, and the
+crawler paces itself when an endpoint's window runs low, so concurrency
+only removes idle time between calls, never the limiter's waits.
+"""
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Action types that never carry flow messages (no /flow-messages/ call needed)
+NON_MESSAGE_ACTION_TYPES = {"TIME_DELAY", "CONDITIONAL_SPLIT", "TRIGGER_BRANCH", "BOOLEAN_BRANCH"}
+
+
+def _crawl_concurrency() -> int:
+    """Maximum concurrent flow detail requests."""
+    return max(1, int(os.getenv("KLAVIYO_FLOW_CRAWL_CONCURRENCY", "5")))
+
+
+def is_live(flow: Dict[str, Any]) -> bool:
+    """Whether a flow is live and not archived."""
+    attrs = flow.get("attributes", {})
+    return attrs.get("status") == "live" and not attrs.get("archived", False)
+
+
+class FlowDetailCrawler:
+    """Fetches flow actions and messages for many flows concurrently."""
+
+    def __init__(self, flows_service, concurrency: Optional[int] = None):
+        """
+        Initialize the crawler.
+
+        Args:
+            flows_service: FlowsService instance
+            concurrency: Maximum requests in flight (defaults to env setting)
+        """
+        self.flows = flows_service
+        self.concurrency = concurrency or _crawl_concurrency()
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+
+    async def _call(self, endpoint: str, fetch, *args):
+        """Run one request inside the concurrency bound, pacing the endpoint first."""
+        async with self._semaphore:
+            await self.flows.client.pace(endpoint)
+            return await fetch(*args)
+
+    async def _crawl_flow(
+        self,
+        flow: Dict[str, Any],
+        actions: Optional[List[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """Actions and messages for one flow, with its crawl latency."""
+        started = time.monotonic()
+        if actions is None:
+            actions = await self._call("/flows/", self.flows.get_flow_actions, flow["id"])
+
+        message_actions = [
+            action for action in actions
+            if action.get("attributes", {}).get("action_type") not in NON_MESSAGE_ACTION_TYPES
+        ]
+        message_lists = await asyncio.gather(*[
+            self._call("/flow-actions/", self.flows.get_flow_action_messages, action["id"])
+            for action in message_actions
+        ])
+
+        return {
+            "flow": flow,
+            "actions": actions,
+            "messages": [message for messages in message_lists for message in messages],
+            "latency_seconds": round(time.monotonic() - started, 3)
+        }
+
+    async def crawl(
+        self,
+        flows: Iterable[Dict[str, Any]],
+        actions_by_flow: Optional[Dict[str, List[Dict[str, Any]]]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Crawl actions and messages for flows.
+
+        Args:
+            flows: Flow objects to crawl
+            actions_by_flow: Actions already fetched per flow ID (e.g., from
+                get_flows_with_actions); other flows get a flow-actions call
+
+        Returns:
+            List of {"flow", "actions", "messages", "latency_seconds"} dicts in
+            the order of flows. Flows whose crawl failed are left out.
+        """
+        flows = list(flows)
+        actions_by_flow = actions_by_flow or {}
+        results = await asyncio.gather(
+            *[self._crawl_flow(flow, actions_by_flow.get(flow["id"])) for flow in flows],
+            return_exceptions=True
+        )
+
+        details = []
+        for flow, result in zip(flows, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Error crawling details for flow {flow.get('id')}: {result}")
+                continue
+            details.append(result)
+        return details
+
+    async def get_flows_with_actions(
+        self,
+        flow_ids: Iterable[str]
+    ) -> Dict[str, Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]]:
+        """
+        Fetch several flows with their actions concurrently (include=flow-actions).
+
+        Args:
+            flow_ids: Flow IDs
+
+        Returns:
+            Dict mapping flow ID to (flow object or None, actions). Failed
+            flows map to (None, []).
+        """
+        flow_ids = list(flow_ids)
+        results = await asyncio.gather(
+            *[self._call("/flows/", self.flows.get_flow_with_actions, flow_id) for flow_id in flow_ids],
+            return_exceptions=True
+        )
+
+        flows = {}
+        for flow_id, result in zip(flow_ids, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Error fetching flow details for {flow_id}: {result}")
+                result = (None, [])
+            flows[flow_id] = result
+        return flows
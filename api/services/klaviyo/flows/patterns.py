@@ -4,6 +4,7 @@ import logging
 
 from .service import FlowsService
 from .statistics import FlowStatisticsService
+from .crawler import FlowDetailCrawler
 
 logger = logging.getLogger(__name__)
 
@@ -85,8 +86,6 @@ class FlowPatternMatcher:
         Returns:
             Dict mapping flow types to their performance data
         """
-        import asyncio
-        
         flows = await self.flows.get_flows()
         
         core_flows = {}
@@ -142,34 +141,13 @@ class FlowPatternMatcher:
         # OPTIMIZATION: Batch all flow statistics in ONE API call instead of individual calls
         flow_ids = [flow_info["flow_id"] for flow_info in identified_flows.values()]
         
-        # Get flow details and actions in parallel (these are lightweight)
-        flow_details_tasks = []
-        flow_actions_tasks = []
-        for flow_type, flow_info in identified_flows.items():
-            flow_id = flow_info["flow_id"]
-            flow_details_tasks.append((flow_type, self.flows.get_flow(flow_id)))
-            flow_actions_tasks.append((flow_type, self.flows.get_flow_actions(flow_id)))
-        
-        # Fetch flow details and actions in parallel
+        # Get each flow with its actions in one compound request (include=flow-actions),
+        # several flows at a time
+        flows_with_actions = await FlowDetailCrawler(self.flows).get_flows_with_actions(flow_ids)
         flow_details_results = {}
         flow_actions_results = {}
-        
-        for flow_type, task in flow_details_tasks:
-            try:
-                flow_details_results[flow_type] = await task
-            except Exception as e:
-                logger.warning(f"Error fetching flow details for {flow_type}: {e}")
-                flow_details_results[flow_type] = None
-        
-        # Small delay before fetching actions
-        await asyncio.sleep(0.5)
-        
-        for flow_type, task in flow_actions_tasks:
-            try:
-                flow_actions_results[flow_type] = await task
-            except Exception as e:
-                logger.warning(f"Error fetching flow actions for {flow_type}: {e}")
-                flow_actions_results[flow_type] = []
+        for flow_type, flow_info in identified_flows.items():
+            flow_details_results[flow_type], flow_actions_results[flow_type] = flows_with_actions[flow_info["flow_id"]]
         
         # CRITICAL FIX: Batch statistics call for ALL flows at once
         # This reduces 7-10 individual API calls to just 1 call
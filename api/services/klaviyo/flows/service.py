@@ -1,11 +1,38 @@
 """Flows service for fetching Klaviyo flows."""
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 import logging
 
 from ..client import KlaviyoClient
+from ..filters import build_sparse_fieldset
 
 logger = logging.getLogger(__name__)
 
+# Attributes the audit reads from each resource (sent as fields[...])
+FLOW_FIELDS = ["name", "status", "archived", "created", "updated", "trigger_type"]
+FLOW_ACTION_FIELDS = ["action_type", "status", "created", "updated"]
+FLOW_MESSAGE_FIELDS = ["name", "channel", "created", "updated"]
+
+
+def _related_actions(
+    flow: Dict[str, Any],
+    included: Dict[Tuple[str, str], Dict[str, Any]]
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Resolve a flow's included flow-actions from a compound document.
+    
+    Returns:
+        List of flow action objects, or None if the flow carries no
+        flow-actions relationship linkage
+    """
+    linkage = flow.get("relationships", {}).get("flow-actions", {}).get("data")
+    if linkage is None:
+        return None
+    return [
+        included[(ref.get("type"), ref.get("id"))]
+        for ref in linkage
+        if (ref.get("type"), ref.get("id")) in included
+    ]
+
 
 class FlowsService:
     """Service for interacting with Klaviyo flows."""
@@ -21,18 +48,56 @@ class FlowsService:
     
     async def get_flows(self) -> List[Dict[str, Any]]:
         """
-        Get all flows.
+        Get all flows (all pages).
         
         Returns:
             List of flow objects
         """
         try:
-            response = await self.client.request("GET", "/flows/")
-            return response.get("data", [])
+            return await self.client.get_all(
+                "/flows/",
+                params=build_sparse_fieldset("flow", FLOW_FIELDS)
+            )
         except Exception as e:
             logger.error(f"Error fetching flows: {e}", exc_info=True)
             return []
     
+    async def get_flows_with_actions(self) -> Tuple[List[Dict[str, Any]], Dict[str, List[Dict[str, Any]]]]:
+        """
+        Get all flows with their actions in one compound document per page.
+        
+        Uses include=flow-actions so actions arrive with the flows instead of
+        one /flows/{id}/flow-actions/ call per flow.
+        
+        Returns:
+            Tuple of (flows, {flow_id: actions}). Flows whose actions could not
+            be resolved from the compound document are missing from the dict,
+            so callers can fall back to get_flow_actions().
+        """
+        params = {
+            **build_sparse_fieldset("flow", FLOW_FIELDS),
+            **build_sparse_fieldset("flow-action", FLOW_ACTION_FIELDS),
+            "include": "flow-actions"
+        }
+        flows = []
+        actions_by_flow = {}
+        
+        try:
+            async for page in self.client.paginate_pages("/flows/", params=params):
+                included = {
+                    (resource.get("type"), resource.get("id")): resource
+                    for resource in page.get("included", [])
+                }
+                for flow in page.get("data", []):
+                    flows.append(flow)
+                    actions = _related_actions(flow, included)
+                    if actions is not None:
+                        actions_by_flow[flow["id"]] = actions
+            return flows, actions_by_flow
+        except Exception as e:
+            logger.warning(f"Compound flows request failed, fetching flows without actions: {e}")
+            return await self.get_flows(), {}
+    
     async def get_flow(self, flow_id: str) -> Optional[Dict[str, Any]]:
         """
         Get a specific flow by ID.
@@ -44,12 +109,53 @@ class FlowsService:
             Flow object if found, None otherwise
         """
         try:
-            response = await self.client.request("GET", f"/flows/{flow_id}/")
+            response = await self.client.request(
+                "GET",
+                f"/flows/{flow_id}/",
+                params=build_sparse_fieldset("flow", FLOW_FIELDS)
+            )
             return response.get("data")
         except Exception as e:
             logger.error(f"Error fetching flow {flow_id}: {e}", exc_info=True)
             return None
     
+    async def get_flow_with_actions(self, flow_id: str) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Get a flow and its actions in one request (include=flow-actions).
+        
+        Falls back to separate flow and flow-actions calls if the compound
+        request fails or carries no action linkage.
+        
+        Args:
+            flow_id: Flow ID
+            
+        Returns:
+            Tuple of (flow object or None, list of flow action objects)
+        """
+        params = {
+            **build_sparse_fieldset("flow", FLOW_FIELDS),
+            **build_sparse_fieldset("flow-action", FLOW_ACTION_FIELDS),
+            "include": "flow-actions"
+        }
+        try:
+            response = await self.client.request("GET", f"/flows/{flow_id}/", params=params)
+            flow = response.get("data")
+            included = {
+                (resource.get("type"), resource.get("id")): resource
+                for resource in response.get("included", [])
+            }
+            actions = _related_actions(flow, included) if flow else None
+            if flow and actions is not None:
+                return flow, actions
+            if flow:
+                return flow, await self.get_flow_actions(flow_id)
+        except Exception as e:
+            logger.warning(f"Compound request for flow {flow_id} failed, using separate calls: {e}")
+        
+        flow = await self.get_flow(flow_id)
+        actions = await self.get_flow_actions(flow_id) if flow else []
+        return flow, actions
+    
     async def get_flow_actions(self, flow_id: str) -> List[Dict[str, Any]]:
         """
         Get actions for a specific flow.
@@ -61,8 +167,10 @@ class FlowsService:
             List of flow action objects
         """
         try:
-            response = await self.client.request("GET", f"/flows/{flow_id}/flow-actions/")
-            return response.get("data", [])
+            return await self.client.get_all(
+                f"/flows/{flow_id}/flow-actions/",
+                params=build_sparse_fieldset("flow-action", FLOW_ACTION_FIELDS)
+            )
         except Exception as e:
             logger.error(f"Error fetching actions for flow {flow_id}: {e}", exc_info=True)
             return []
@@ -78,9 +186,10 @@ class FlowsService:
             List of flow message objects
         """
         try:
-            response = await self.client.request("GET", f"/flow-actions/{action_id}/flow-messages/")
-            return response.get("data", [])
+            return await self.client.get_all(
+                f"/flow-actions/{action_id}/flow-messages/",
+                params=build_sparse_fieldset("flow-message", FLOW_MESSAGE_FIELDS)
+            )
         except Exception as e:
             logger.error(f"Error fetching messages for flow action {action_id}: {e}", exc_info=True)
             return []
-
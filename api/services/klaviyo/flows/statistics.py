@@ -3,13 +3,31 @@ from typing import Dict, List, Optional, Any
 import logging
 
 from ..client import KlaviyoClient
-from ..filters import build_reporting_filter
+from ..filters import build_reporting_filter, build_series_timeframes
 from ..parsers import extract_statistics
 from ..metrics.service import MetricsService
+from ..reporting_planner import ReportRejected, get_reporting_planner
 from .service import FlowsService
 
 logger = logging.getLogger(__name__)
 
+# Statistics requested on every flow report so later requests for any subset
+# are served from the batch planner without another Reporting API call
+AUDIT_FLOW_STATISTICS = [
+    "opens",
+    "open_rate",
+    "clicks",
+    "click_rate",
+    "bounce_rate",
+    "recipients",
+    "delivery_rate",
+    "unsubscribe_rate",
+    "conversions",
+    "conversion_rate",
+    "conversion_value",
+    "conversion_uniques"
+]
+
 
 class FlowStatisticsService:
     """Service for fetching flow statistics using Reporting API."""
@@ -26,10 +44,15 @@ class FlowStatisticsService:
         self.flows = FlowsService(client)
         # Cache conversion_metric_id to avoid multiple lookups
         self._cached_conversion_metric_id = None
-        # Cache for flow statistics to avoid duplicate API calls
-        # Key: (tuple(sorted(flow_ids)), timeframe, tuple(sorted(statistics)))
-        # Value: cached response
-        self._stats_cache = {}
+        # Merges statistics requests from all services on this client into
+        # the fewest Reporting API calls and remembers results per flow
+        self.planner = get_reporting_planner(
+            client,
+            id_type="flow_id",
+            endpoint="/flow-values-reports/",
+            fetch=self._fetch_report,
+            audit_statistics=AUDIT_FLOW_STATISTICS
+        )
     
     async def _resolve_conversion_metric_id(self, conversion_metric_id: Optional[str] = None) -> Optional[str]:
         """Resolve conversion metric ID with multiple fallback options."""
@@ -130,7 +153,8 @@ class FlowStatisticsService:
             statistics: List of statistics to fetch
             timeframe: Time period
             conversion_metric_id: Metric ID for conversion tracking (REQUIRED)
-            use_cache: Whether to use cached results if available (default True)
+            use_cache: Whether to reuse results already fetched by the batch
+                       planner (default True)
             
         Returns:
             Dict with flow statistics
@@ -157,18 +181,30 @@ class FlowStatisticsService:
                 )
                 return {}
         
-        # Check cache first to avoid duplicate API calls
-        if use_cache:
-            cache_key = (
-                tuple(sorted(flow_ids)),
-                timeframe,
-                tuple(sorted(statistics)),
-                conversion_metric_id
-            )
-            if cache_key in self._stats_cache:
-                logger.debug(f"Using cached flow statistics for {len(flow_ids)} flows")
-                return self._stats_cache[cache_key]
+        # Merge with other pending requests and reuse earlier results (batch planner)
+        return await self.planner.get(
+            ids=flow_ids,
+            statistics=statistics,
+            timeframe=timeframe,
+            conversion_metric_id=conversion_metric_id,
+            use_cache=use_cache
+        )
+    
+    async def _fetch_report(
+        self,
+        flow_ids: List[str],
+        statistics: List[str],
+        timeframe: str,
+        conversion_metric_id: str
+    ) -> Dict[str, Any]:
+        """
+        Make one flow-values-report request (called by the batch planner).
         
+        Returns {} on error, except for 400 rejections.
+        
+        Raises:
+            ReportRejected: If the API rejects the request as invalid (400)
+        """
         # Build filter - same syntax as campaigns
         filter_string = build_reporting_filter(flow_ids, "flow_id")
         
@@ -185,31 +221,17 @@ class FlowStatisticsService:
         }
         
         try:
-            response = await self.client.request(
+            return await self.client.request(
                 "POST",
                 "/flow-values-reports/",
                 data=payload,
                 retry_on_429=True,
                 max_retries=3
             )
-            
-            # Cache the response
-            if use_cache and response:
-                cache_key = (
-                    tuple(sorted(flow_ids)),
-                    timeframe,
-                    tuple(sorted(statistics)),
-                    conversion_metric_id
-                )
-                self._stats_cache[cache_key] = response
-                # Limit cache size to prevent memory issues (keep last 50 entries)
-                if len(self._stats_cache) > 50:
-                    # Remove oldest entry (simple FIFO)
-                    oldest_key = next(iter(self._stats_cache))
-                    del self._stats_cache[oldest_key]
-            
-            return response
         except Exception as e:
+            if getattr(getattr(e, "response", None), "status_code", None) == 400:
+                # Invalid request (e.g. unsupported statistic) - the planner decides whether to retry
+                raise ReportRejected(str(e)) from e
             logger.error(f"Error fetching flow statistics: {e}", exc_info=True)
             if hasattr(e, 'response') and hasattr(e.response, 'text'):
                 try:
@@ -218,6 +240,68 @@ class FlowStatisticsService:
                     pass
             return {}
     
+    async def get_series(
+        self,
+        flow_ids: List[str],
+        start_date: str,
+        end_date: str,
+        statistics: Optional[List[str]] = None,
+        interval: str = "daily",
+        conversion_metric_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get flow statistics over time for an explicit date range.
+        
+        Unlike get_statistics (relative timeframes such as last_90_days), this
+        uses the flow-series-reports endpoint bounded by start_date/end_date.
+        Ranges longer than the API allows for the interval are split, and IDs
+        are sent 100 per request.
+        Reference: https://developers.klaviyo.com/en/reference/query_flow_series
+        
+        Args:
+            flow_ids: List of flow IDs
+            start_date: Start datetime in ISO format
+            end_date: End datetime in ISO format
+            statistics: Statistics to fetch (default ["conversion_value"])
+            interval: "daily", "weekly" or "monthly"
+            conversion_metric_id: Metric ID for conversion tracking
+            
+        Returns:
+            List of flow-series-report responses (empty if any request fails)
+        """
+        if not flow_ids:
+            return []
+        if not conversion_metric_id:
+            conversion_metric_id = await self._resolve_conversion_metric_id()
+            if not conversion_metric_id:
+                return []
+        
+        responses = []
+        try:
+            for timeframe in build_series_timeframes(start_date, end_date, interval):
+                for i in range(0, len(flow_ids), 100):
+                    if responses:
+                        await self.client.pace("/flow-series-reports/")
+                    payload = {
+                        "data": {
+                            "type": "flow-series-report",
+                            "attributes": {
+                                "statistics": statistics or ["conversion_value"],
+                                "timeframe": timeframe,
+                                "interval": interval,
+                                "filter": build_reporting_filter(flow_ids[i:i + 100], "flow_id"),
+                                "conversion_metric_id": conversion_metric_id
+                            }
+                        }
+                    }
+                    responses.append(await self.client.request("POST", "/flow-series-reports/", data=payload))
+        except Exception as e:
+            logger.error(f"Error fetching flow series statistics: {e}", exc_info=True)
+            if hasattr(e, 'response') and hasattr(e.response, 'text'):
+                logger.debug(f"Response: {e.response.text}")
+            return []
+        return responses
+    
     async def get_individual_stats(
         self,
         flow_id: str,
@@ -233,8 +317,8 @@ class FlowStatisticsService:
         Returns:
             Dict with detailed flow performance metrics
         """
-        # Get flow details
-        flow = await self.flows.get_flow(flow_id)
+        # Get flow details and actions (emails) in one request
+        flow, actions = await self.flows.get_flow_with_actions(flow_id)
         if not flow:
             return {"error": f"Flow {flow_id} not found"}
         
@@ -242,8 +326,6 @@ class FlowStatisticsService:
         flow_name = flow_attrs.get("name", "Unknown")
         flow_status = flow_attrs.get("status", "unknown")
         
-        # Get flow actions (emails)
-        actions = await self.flows.get_flow_actions(flow_id)
         email_count = len([
             a for a in actions 
             if a.get("attributes", {}).get("action_type") == "EMAIL"
@@ -2,7 +2,9 @@
 Campaign performance formatting module.
 """
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+
+from ..tables import CampaignTable
 
 logger = logging.getLogger(__name__)
 
@@ -14,7 +16,8 @@ class CampaignFormatter:
         self,
         campaign_statistics: Dict[str, Any],
         campaign_revenue: float,
-        campaigns: List[Dict[str, Any]]
+        campaigns: List[Dict[str, Any]],
+        table: Optional[CampaignTable] = None
     ) -> Dict[str, Any]:
         """
         Calculate campaign performance summary from statistics.
@@ -23,6 +26,8 @@ class CampaignFormatter:
             campaign_statistics: Raw campaign statistics from API
             campaign_revenue: Total campaign revenue from KAV data
             campaigns: List of campaign objects
+            table: Campaign table built from the same statistics (built here if
+                   not given)
             
         Returns:
             Formatted campaign performance data
@@ -64,44 +69,23 @@ class CampaignFormatter:
                 "recommendations": []
             }
         
-        # Calculate averages from all campaign results
-        total_opens = 0
-        total_clicks = 0
-        total_conversions = 0
-        total_recipients = 0
-        total_bounces = 0
-        total_unsubscribes = 0
-        total_spam_complaints = 0
-        campaign_count = 0
+        # Calculate averages from all campaign results (summed per campaign)
+        if table is None:
+            table = CampaignTable.from_extraction(campaigns, campaign_statistics)
         
-        for result in results:
-            stats = result.get("statistics", {})
-            recipients = stats.get("recipients", 0)
-            
-            if recipients > 0:  # Only count campaigns with recipients
-                conversions = stats.get("conversions", 0)
-                total_opens += stats.get("opens", 0)
-                total_clicks += stats.get("clicks", 0)
-                total_conversions += conversions
-                total_recipients += recipients
-                
-                # Extract deliverability metrics (rates are in decimal format 0.0-1.0)
-                # We need to convert to counts first, then calculate average rate
-                bounce_rate_decimal = stats.get("bounce_rate", 0)
-                unsubscribe_rate_decimal = stats.get("unsubscribe_rate", 0)
-                spam_complaint_rate_decimal = stats.get("spam_complaint_rate", 0)
-                
-                # Calculate counts from rates (approximate, since we don't have exact counts)
-                # For weighted average, we'll use recipients as weight
-                total_bounces += bounce_rate_decimal * recipients
-                total_unsubscribes += unsubscribe_rate_decimal * recipients
-                total_spam_complaints += spam_complaint_rate_decimal * recipients
-                
-                campaign_count += 1
-                
-                # Log if conversions are missing
-                if conversions == 0 and stats.get("clicks", 0) > 0:
-                    logger.debug(f"Campaign {result.get('campaign_id', 'unknown')}: {recipients} recipients, {stats.get('clicks', 0)} clicks, but 0 conversions")
+        # Only count campaigns with recipients
+        sent = table.column("recipients") > 0
+        total_opens = table.total("opens", sent)
+        total_clicks = table.total("clicks", sent)
+        total_conversions = table.total("conversions", sent)
+        total_recipients = int(table.total("recipients", sent))
+        
+        # Deliverability counts were derived from rates (decimal 0.0-1.0) x recipients,
+        # so the averages below are recipient-weighted
+        total_bounces = table.total("bounced", sent)
+        total_unsubscribes = table.total("unsubscribes", sent)
+        total_spam_complaints = table.total("spam_complaints", sent)
+        campaign_count = int(sent.sum())
         
         logger.info(f"Campaign summary: {campaign_count} campaigns, {total_recipients} recipients, {total_conversions} conversions, {total_opens} opens, {total_clicks} clicks")
         
@@ -26,7 +26,8 @@ class PeriodComparisonFormatter:
         current_period: Dict[str, Any],
         days: int,
         account_timezone: str,
-        verbose: bool = True
+        verbose: bool = True,
+        previous_period: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """
         Calculate period-over-period comparison.
@@ -37,49 +38,60 @@ class PeriodComparisonFormatter:
             days: Number of days in current period
             account_timezone: Account timezone
             verbose: Whether to log progress
+            previous_period: Previous period "period"/"totals" already extracted
+                with the current period (get_revenue_time_series with
+                include_previous_period). Fetched separately only if missing.
             
         Returns:
-            Dict with vs_previous_period, attributed_vs_previous, and previous_period_data
+            Dict with vs_previous_period, attributed_vs_previous, and previous_period_data.
+            When previous attributed revenue could not be fetched,
+            attributed_vs_previous is 0 and previous_period_data has
+            attributed_revenue None and attributed_available False.
         """
         vs_previous_period = 0
         attributed_vs_previous = 0
         previous_period_data = None
         
         try:
-            from ..utils.date_helpers import parse_iso_date, get_previous_period_range, get_klaviyo_compatible_range
+            from ..utils.date_helpers import get_previous_period_range, format_date_range
             
             # Parse current period dates
             current_start_str = current_period.get("start_date", "")
             current_end_str = current_period.get("end_date", "")
             
             # Try to parse dates (format: "September 28, 2025")
-            if current_start_str and current_end_str:
+            if previous_period or (current_start_str and current_end_str):
                 try:
-                    from dateutil import parser
-                    current_start_dt = parser.parse(current_start_str)
-                    current_end_dt = parser.parse(current_end_str)
-                    
-                    # Calculate previous period range
-                    previous_range = get_previous_period_range(current_start_dt, current_end_dt, days)
-                    
-                    # Fetch previous period revenue data
-                    if verbose:
-                        logger.info(f"Fetching previous period data: {previous_range['start'].isoformat()} to {previous_range['end'].isoformat()}")
-                    
-                    # Get previous period date range in Klaviyo format
-                    previous_days = (previous_range["end"] - previous_range["start"]).days + 1
-                    previous_date_range = get_klaviyo_compatible_range(previous_days, account_timezone)
-                    
-                    # Fetch previous period revenue (simplified - just get totals)
-                    previous_kav_data = await self.revenue.get_revenue_time_series(
-                        days=previous_days,
-                        interval="day",
-                        account_timezone=account_timezone
-                    )
+                    if previous_period:
+                        # Extracted together with the current period (no extra API calls)
+                        previous_kav_data = previous_period
+                    else:
+                        from dateutil import parser
+                        current_start_dt = parser.parse(current_start_str)
+                        current_end_dt = parser.parse(current_end_str)
+                        
+                        # Calculate previous period range
+                        previous_range = get_previous_period_range(current_start_dt, current_end_dt, days)
+                        
+                        # Fetch previous period revenue data
+                        if verbose:
+                            logger.info(f"Fetching previous period data: {previous_range['start'].isoformat()} to {previous_range['end'].isoformat()}")
+                        
+                        # Fetch previous period revenue for its own date range (simplified - just get totals)
+                        previous_kav_data = await self.revenue.get_revenue_time_series(
+                            interval="month",
+                            account_timezone=account_timezone,
+                            date_range=format_date_range(
+                                previous_range["start"],
+                                previous_range["end"].replace(hour=23, minute=59, second=59)
+                            )
+                        )
                     
                     previous_totals = previous_kav_data.get("totals", {})
                     previous_total_revenue = previous_totals.get("total_revenue", 0)
                     previous_attributed_revenue = previous_totals.get("attributed_revenue", 0)
+                    attributed_available = previous_totals.get("attributed_available", True) \
+                        and previous_attributed_revenue is not None
                     
                     # Calculate period-over-period changes
                     current_total = current_totals.get("total_revenue", 0)
@@ -88,18 +100,23 @@ class PeriodComparisonFormatter:
                     if previous_total_revenue > 0:
                         vs_previous_period = ((current_total - previous_total_revenue) / previous_total_revenue) * 100
                     
-                    if previous_attributed_revenue > 0:
+                    if attributed_available and previous_attributed_revenue > 0:
                         attributed_vs_previous = ((current_attributed - previous_attributed_revenue) / previous_attributed_revenue) * 100
                     
                     previous_period_data = {
                         "total_revenue": previous_total_revenue,
-                        "attributed_revenue": previous_attributed_revenue,
+                        "attributed_revenue": previous_attributed_revenue if attributed_available else None,
+                        "attributed_available": attributed_available,
                         "period": previous_kav_data.get("period", {})
                     }
                     
                     if verbose:
-                        logger.info(f"Previous period: ${previous_total_revenue:,.2f} total, ${previous_attributed_revenue:,.2f} attributed")
-                        logger.info(f"Period-over-period: {vs_previous_period:+.1f}% total, {attributed_vs_previous:+.1f}% attributed")
+                        if attributed_available:
+                            logger.info(f"Previous period: ${previous_total_revenue:,.2f} total, ${previous_attributed_revenue:,.2f} attributed")
+                            logger.info(f"Period-over-period: {vs_previous_period:+.1f}% total, {attributed_vs_previous:+.1f}% attributed")
+                        else:
+                            logger.info(f"Previous period: ${previous_total_revenue:,.2f} total, attributed revenue unavailable")
+                            logger.info(f"Period-over-period: {vs_previous_period:+.1f}% total")
                         
                 except Exception as e:
                     logger.warning(f"Could not calculate previous period comparison: {e}")
@@ -1,17 +1,44 @@
 """Forms service for fetching Klaviyo form performance data."""
-from typing import Dict, List, Any, Optional
-import logging
+from typing import Dict, List, Any, Optional, Tuple
 import asyncio
-from datetime import datetime, timedelta
+import logging
+
+import pandas as pd
 
 from ..client import KlaviyoClient
 from ..metrics.service import MetricsService
 from ..metrics.aggregates import MetricAggregatesService
+from ..filters import build_sparse_fieldset
 from ..parsers import parse_metric_value, parse_aggregate_data
 from ..utils.currency import format_large_number
 
 logger = logging.getLogger(__name__)
 
+# Form attributes the audit reads (sent as fields[form])
+FORM_FIELDS = ["name", "status", "created_at", "updated_at"]
+
+# Candidate metric names, in order of preference
+SUBMISSION_METRIC_NAMES = [
+    "Submitted Form",        # Standard Klaviyo
+    "Submit Form",           # Alternative
+    "Form Submission",       # Variation
+    "Form Submit",           # Variation
+    "Signup Form Submit",    # Common custom name
+    "Newsletter Signup",     # Common custom name
+    "Email Signup",          # Common custom name
+    "Form Completed"         # Alternative name
+]
+VIEW_METRIC_NAMES = [
+    "Viewed Form",           # Standard Klaviyo
+    "View Form",             # Alternative
+    "Form View",             # Variation
+    "Form Impression",       # Alternative name
+    "Form Display",          # Variation
+    "Signup Form View",      # Common custom name
+    "Newsletter Form View",  # Common custom name
+    "Form Shown"             # Alternative name
+]
+
 
 class FormsService:
     """Service for interacting with Klaviyo forms and performance data."""
@@ -29,14 +56,16 @@ class FormsService:
     
     async def get_forms(self) -> List[Dict[str, Any]]:
         """
-        Get all forms in the account.
+        Get all forms in the account (all pages).
         
         Returns:
             List of form objects
         """
         try:
-            response = await self.client.request("GET", "/forms/")
-            forms = response.get("data", [])
+            forms = await self.client.get_all(
+                "/forms/",
+                params=build_sparse_fieldset("form", FORM_FIELDS)
+            )
             
             # Enhanced logging for debugging
             logger.info(f"📋 Forms API Response: Found {len(forms)} forms")
@@ -85,8 +114,7 @@ class FormsService:
             end_str = date_range_dict["end"]
         
         # Get form submission metrics with enhanced discovery
-        submitted_metric = await self._discover_form_submission_metric()
-        viewed_metric = await self._discover_form_view_metric()
+        submitted_metric, viewed_metric = await self._discover_form_metrics()
         
         logger.info(f"📊 Form Metrics Discovery:")
         logger.info(f"   Submitted Form Metric: {'✓ Found' if submitted_metric else '✗ Not Found'}")
@@ -140,6 +168,13 @@ class FormsService:
                     "error": "No forms found in account"
                 }
         
+        # Views and submissions for every form: one grouped query per metric
+        form_ids = [form.get("id") for form in forms]
+        views_by_form, submissions_by_form = await asyncio.gather(
+            self._counts_by_form(viewed_metric, form_ids, start_str, end_str),
+            self._counts_by_form(submitted_metric, form_ids, start_str, end_str)
+        )
+        
         form_data = []
         
         for form in forms:
@@ -156,77 +191,10 @@ class FormsService:
                 "full_page": "Full Page"
             }.get(form_type, form_type.title())
             
-            # Get views (impressions) for this form
-            views = 0
-            if viewed_metric:
-                try:
-                    views_data = await self.aggregates.query(
-                        metric_id=viewed_metric.get("id"),
-                        start_date=start_str,
-                        end_date=end_str,
-                        measurements=["count"],
-                        interval="day",
-                        filter_conditions=[f'equals(form_id,"{form_id}")'],
-                        timezone="Australia/Sydney"
-                    )
-                    _, views_values = parse_aggregate_data(views_data)
-                    
-                    # Handle aggregated response format (same as revenue fix)
-                    if len(views_values) == 1 and isinstance(views_values[0], dict):
-                        # Aggregated response
-                        measurements = views_values[0].get("measurements", {})
-                        count_values = measurements.get("count", [])
-                        views = sum(float(val) for val in count_values if val is not None)
-                    else:
-                        # Individual daily values (original logic)
-                        for v in views_values:
-                            views += parse_metric_value(v)
-                            
-                    logger.info(f"Form {form_name} (ID: {form_id}): Views={views} (filter: equals(form_id,\"{form_id}\"))")
-                except Exception as e:
-                    # Skip failed metrics - don't retry 400 errors
-                    error_msg = str(e)
-                    if "400" in error_msg or "Bad Request" in error_msg:
-                        logger.warning(f"Skipping views metric for form {form_id} ({form_name}): {error_msg}")
-                    else:
-                        logger.error(f"Error getting views for form {form_id} ({form_name}): {e}", exc_info=True)
-                    logger.debug(f"View metric ID: {viewed_metric.get('id') if viewed_metric else 'N/A'}, Date range: {start_str} to {end_str}")
-            
-            # Get submissions for this form
-            submissions = 0
-            if submitted_metric:
-                try:
-                    submit_data = await self.aggregates.query(
-                        metric_id=submitted_metric.get("id"),
-                        start_date=start_str,
-                        end_date=end_str,
-                        measurements=["count"],
-                        interval="day",
-                        filter_conditions=[f'equals(form_id,"{form_id}")'],
-                        timezone="Australia/Sydney"
-                    )
-                    _, submit_values = parse_aggregate_data(submit_data)
-                    
-                    # Handle aggregated response format (same as revenue fix)
-                    if len(submit_values) == 1 and isinstance(submit_values[0], dict):
-                        # Aggregated response
-                        measurements = submit_values[0].get("measurements", {})
-                        count_values = measurements.get("count", [])
-                        submissions = sum(float(val) for val in count_values if val is not None)
-                    else:
-                        # Individual daily values (original logic)
-                        for v in submit_values:
-                            submissions += parse_metric_value(v)
-                            
-                    logger.info(f"Form {form_name} (ID: {form_id}): Submissions={submissions} (filter: equals(form_id,\"{form_id}\"))")
-                except Exception as e:
-                    # Skip failed metrics - don't retry 400 errors
-                    error_msg = str(e)
-                    if "400" in error_msg or "Bad Request" in error_msg:
-                        logger.warning(f"Skipping submissions metric for form {form_id} ({form_name}): {error_msg}")
-                    else:
-                        logger.error(f"Error getting submissions for form {form_id} ({form_name}): {e}", exc_info=True)
-                    logger.debug(f"Submit metric ID: {submitted_metric.get('id') if submitted_metric else 'N/A'}, Date range: {start_str} to {end_str}")
+            # Views (impressions) and submissions for this form
+            views = views_by_form.get(form_id, 0)
+            submissions = submissions_by_form.get(form_id, 0)
+            logger.info(f"Form {form_name} (ID: {form_id}): Views={views}, Submissions={submissions}")
             
             # Calculate submit rate
             submit_rate = (submissions / views * 100) if views > 0 else 0
@@ -245,15 +213,107 @@ class FormsService:
                 "submit_rate": round(submit_rate, 2),
                 "standing": standing
             })
-            
-            # Increased delay to avoid rate limiting
-            await asyncio.sleep(0.5)
         
         return {
             "period_days": days,
             "forms": sorted(form_data, key=lambda x: x["impressions"], reverse=True)
         }
     
+    async def _counts_by_form(
+        self,
+        metric: Optional[Dict[str, Any]],
+        form_ids: List[str],
+        start_str: str,
+        end_str: str
+    ) -> Dict[str, float]:
+        """
+        Event counts per form for one metric.
+        
+        Uses a single aggregate query grouped by form_id. If the grouped query
+        returns nothing, falls back to one form_id-filtered query per form
+        (fired concurrently).
+        
+        Args:
+            metric: Form metric (views or submissions), or None
+            form_ids: IDs of the forms to count
+            start_str: Start datetime in ISO format
+            end_str: End datetime in ISO format
+            
+        Returns:
+            Dict mapping form ID to event count (forms without events are missing)
+        """
+        if not metric:
+            return {}
+        query = {
+            "metric_id": metric.get("id"),
+            "start_date": start_str,
+            "end_date": end_str,
+            "measurements": ["count"],
+            "interval": "day",
+            "timezone": "Australia/Sydney"
+        }
+        
+        grouped = await self.aggregates.query(**query, by=["form_id"])
+        if grouped and grouped.get("data"):
+            counts = self._counts_by_dimension(grouped)
+            logger.info(f"Metric {metric.get('id')}: counts for {len(counts)} forms from one grouped query")
+            return counts
+        
+        logger.warning(f"Grouped form query failed for metric {metric.get('id')}, querying {len(form_ids)} forms individually")
+        responses = await self.aggregates.query_many({
+            form_id: {**query, "filter_conditions": [f'equals(form_id,"{form_id}")']}
+            for form_id in form_ids
+        })
+        return {form_id: self._sum_counts(response) for form_id, response in responses.items()}
+    
+    @staticmethod
+    def _counts_by_dimension(response: Dict[str, Any]) -> Dict[str, float]:
+        """
+        Total count per grouping value of a grouped metric aggregates response.
+        
+        Args:
+            response: Aggregates response with one row per dimension value
+            
+        Returns:
+            Dict mapping the first dimension value to the summed count
+        """
+        _, rows = parse_aggregate_data(response)
+        rows = [row for row in rows if isinstance(row, dict) and row.get("dimensions")]
+        if not rows:
+            return {}
+        
+        # One row per form, one column per day (rows can be ragged)
+        days = max(len(row.get("measurements", {}).get("count") or []) for row in rows)
+        counts = pd.DataFrame(
+            [(row.get("measurements", {}).get("count") or []) + [0] * days for row in rows],
+            index=[str(row["dimensions"][0]) for row in rows]
+        ).iloc[:, :days]
+        totals = counts.apply(pd.to_numeric, errors="coerce").fillna(0).sum(axis=1)
+        return totals.groupby(level=0).sum().to_dict()
+    
+    @staticmethod
+    def _sum_counts(response: Optional[Dict[str, Any]]) -> float:
+        """
+        Total event count of a metric aggregates response.
+        
+        Args:
+            response: Aggregates response (None or {} if the query failed)
+            
+        Returns:
+            Sum of the count measurement across all days
+        """
+        if not response:
+            return 0
+        _, values = parse_aggregate_data(response)
+        
+        # Handle aggregated response format (same as revenue fix)
+        if len(values) == 1 and isinstance(values[0], dict):
+            count_values = values[0].get("measurements", {}).get("count", [])
+            return sum(float(val) for val in count_values if val is not None)
+        
+        # Individual daily values
+        return sum(parse_metric_value(v) for v in values)
+    
     @staticmethod
     def _calculate_standing(form_type: str, submit_rate: float) -> str:
         """
@@ -285,71 +345,24 @@ class FormsService:
             else:
                 return "Poor"
     
-    async def _discover_form_submission_metric(self) -> Dict[str, Any]:
-        """
-        Discover form submission metrics with multiple fallback options.
-        
-        Returns:
-            Form submission metric if found, None otherwise
+    async def _discover_form_metrics(self) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
         """
-        submission_metric_names = [
-            "Submitted Form",        # Standard Klaviyo
-            "Submit Form",           # Alternative
-            "Form Submission",       # Variation
-            "Form Submit",           # Variation
-            "Signup Form Submit",    # Common custom name
-            "Newsletter Signup",     # Common custom name
-            "Email Signup",          # Common custom name
-            "Form Completed"         # Alternative name
-        ]
-        
-        logger.debug("🔍 Searching for form submission metrics...")
-        
-        for metric_name in submission_metric_names:
-            try:
-                metric = await self.metrics.get_metric_by_name(metric_name)
-                if metric:
-                    logger.info(f"✅ Found submission metric: {metric_name} (ID: {metric.get('id')})")
-                    return metric
-                else:
-                    logger.debug(f"   ❌ Not found: {metric_name}")
-            except Exception as e:
-                logger.debug(f"   ⚠️ Error checking {metric_name}: {e}")
+        Discover form submission and view metrics with multiple fallback names.
         
-        logger.warning("❌ No form submission metric found")
-        return None
-    
-    async def _discover_form_view_metric(self) -> Dict[str, Any]:
-        """
-        Discover form view metrics with multiple fallback options.
+        Both are resolved against one metric catalogue fetch.
         
         Returns:
-            Form view metric if found, None otherwise  
+            Tuple of (submission metric, view metric), None where not found
         """
-        view_metric_names = [
-            "Viewed Form",           # Standard Klaviyo
-            "View Form",             # Alternative
-            "Form View",             # Variation
-            "Form Impression",       # Alternative name
-            "Form Display",          # Variation
-            "Signup Form View",      # Common custom name
-            "Newsletter Form View",  # Common custom name
-            "Form Shown"             # Alternative name
-        ]
-        
-        logger.debug("🔍 Searching for form view metrics...")
+        logger.debug("🔍 Searching for form submission and view metrics...")
+        metrics = await self.metrics.resolve_metrics({
+            "submission": SUBMISSION_METRIC_NAMES,
+            "view": VIEW_METRIC_NAMES
+        })
         
-        for metric_name in view_metric_names:
-            try:
-                metric = await self.metrics.get_metric_by_name(metric_name)
-                if metric:
-                    logger.info(f"✅ Found view metric: {metric_name} (ID: {metric.get('id')})")
-                    return metric
-                else:
-                    logger.debug(f"   ❌ Not found: {metric_name}")
-            except Exception as e:
-                logger.debug(f"   ⚠️ Error checking {metric_name}: {e}")
-        
-        logger.warning("❌ No form view metric found")
-        return None
-
+        for kind, metric in metrics.items():
+            if metric:
+                logger.info(f"✅ Found {kind} metric: {metric.get('attributes', {}).get('name')} (ID: {metric.get('id')})")
+            else:
+                logger.warning(f"❌ No form {kind} metric found")
+        return metrics["submission"], metrics["view"]
@@ -0,0 +1,75 @@
+"""
+Shared HTTP connection pool for Klaviyo API requests.
+
+Every KlaviyoClient in the process reuses one long-lived httpx.AsyncClient,
+so TCP/TLS connections to a.klaviyo.com are kept alive between requests
+instead of being re-established on every call.
+
+Pool limits can be tuned with environment variables:
+- KLAVIYO_MAX_CONNECTIONS: Max open connections (default 20)
+- KLAVIYO_MAX_KEEPALIVE: Max idle keep-alive connections (default 10)
+- KLAVIYO_KEEPALIVE_EXPIRY: Seconds an idle connection is kept (default 30)
+- KLAVIYO_HTTP_TIMEOUT: Request timeout in seconds (default 30)
+
+The pool is closed on application shutdown via aclose_http_client().
+"""
+import asyncio
+import logging
+import os
+from typing import Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+_http_client: Optional[httpx.AsyncClient] = None
+_http_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _build_limits() -> httpx.Limits:
+    """Build connection pool limits from environment variables."""
+    return httpx.Limits(
+        max_connections=int(os.getenv("KLAVIYO_MAX_CONNECTIONS", "20")),
+        max_keepalive_connections=int(os.getenv("KLAVIYO_MAX_KEEPALIVE", "10")),
+        keepalive_expiry=float(os.getenv("KLAVIYO_KEEPALIVE_EXPIRY", "30"))
+    )
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the process-wide pooled HTTP client, creating it on first use.
+
+    The client is bound to the event loop it was created on. If it is used
+    from a different loop (e.g. successive asyncio.run() calls in scripts),
+    a fresh client is created for the current loop.
+
+    Returns:
+        Shared httpx.AsyncClient instance
+    """
+    global _http_client, _http_client_loop
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+
+    if _http_client is None or _http_client.is_closed or _http_client_loop is not loop:
+        _http_client = httpx.AsyncClient(
+            timeout=float(os.getenv("KLAVIYO_HTTP_TIMEOUT", "30")),
+            limits=_build_limits()
+        )
+        _http_client_loop = loop
+        logger.debug("Created pooled Klaviyo HTTP client")
+
+    return _http_client
+
+
+async def aclose_http_client():
+    """Close the process-wide pooled HTTP client (call on application shutdown)."""
+    global _http_client, _http_client_loop
+
+    if _http_client is not None and not _http_client.is_closed:
+        await _http_client.aclose()
+        logger.info("Closed pooled Klaviyo HTTP client")
+    _http_client = None
+    _http_client_loop = None
@@ -6,11 +6,15 @@ from datetime import datetime
 from ..client import KlaviyoClient
 from ..metrics.service import MetricsService
 from ..metrics.aggregates import MetricAggregatesService
+from ..filters import build_sparse_fieldset
 from ..parsers import parse_metric_value
 from ..utils.date_helpers import get_date_range_months
 
 logger = logging.getLogger(__name__)
 
+# List attributes the audit reads (sent as fields[list])
+LIST_FIELDS = ["name", "created", "updated", "opt_in_process"]
+
 
 class ListsService:
     """Service for interacting with Klaviyo lists and subscriber data."""
@@ -34,44 +38,15 @@ class ListsService:
             List of list objects
         """
         all_lists = []
-        page_cursor = None
         
         try:
-            page_cursor = None  # Start with no cursor (first page)
-            
-            while True:
-                params = {}
-                if page_cursor:
-                    params["page[cursor]"] = page_cursor
-                
-                response = await self.client.request("GET", "/lists/", params=params)
-                page_data = response.get("data", [])
+            async for page in self.client.paginate_pages(
+                "/lists/",
+                params=build_sparse_fieldset("list", LIST_FIELDS)
+            ):
+                page_data = page.get("data", [])
                 all_lists.extend(page_data)
-                
                 logger.debug(f"Fetched {len(page_data)} lists (total so far: {len(all_lists)})")
-                
-                # Check for next page - Klaviyo uses 'links.next' for pagination
-                links = response.get("links", {})
-                next_url = links.get("next")
-                
-                if next_url:
-                    # Extract cursor from the next URL
-                    # Format: https://a.klaviyo.com/api/lists/?page%5Bcursor%5D=bmV4dDo6aWQ6Ok43dW1iVw
-                    from urllib.parse import urlparse, parse_qs
-                    parsed = urlparse(next_url)
-                    query_params = parse_qs(parsed.query)
-                    
-                    # Get the cursor value (parse_qs returns lists)
-                    cursor_list = query_params.get("page[cursor]", [])
-                    if cursor_list:
-                        page_cursor = cursor_list[0]  # Get first value
-                        logger.debug(f"Next page cursor: {page_cursor[:30]}...")
-                    else:
-                        logger.debug("No cursor found in pagination link, stopping")
-                        break
-                else:
-                    logger.debug("No next page link, stopping pagination")
-                    break  # No next page, we're done
             
             logger.info(f"Fetched {len(all_lists)} total lists (with pagination)")
             return all_lists
@@ -95,7 +70,10 @@ class ListsService:
                 response = await self.client.request(
                     "GET",
                     f"/lists/{list_id}",
-                    params={"additional-fields[list]": "profile_count"}
+                    params={
+                        "additional-fields[list]": "profile_count",
+                        **build_sparse_fieldset("list", ["name", "profile_count"])
+                    }
                 )
                 count = response.get("data", {}).get("attributes", {}).get("profile_count")
                 if count is not None:
@@ -132,63 +110,41 @@ class ListsService:
         try:
             # Try to get engagement metrics from recent email activity
             # Look for metrics like "Received Email", "Opened Email", "Clicked Email"
-            received_email_metric = await self.metrics.get_metric_by_name("Received Email")
-            opened_email_metric = await self.metrics.get_metric_by_name("Opened Email") 
-            clicked_email_metric = await self.metrics.get_metric_by_name("Clicked Email")
+            metrics = await self.metrics.resolve_metrics({
+                "received": ["Received Email"],
+                "opened": ["Opened Email"]
+            })
             
             # Calculate engagement for the last 90 days (standard engagement window)
             from datetime import datetime, timedelta
-            from ..utils.date_helpers import get_date_range_months
             
             end_date = datetime.now()
             start_date = end_date - timedelta(days=90)
             start_str = start_date.strftime("%Y-%m-%dT00:00:00Z")
             end_str = end_date.strftime("%Y-%m-%dT23:59:59Z")
             
-            # Get metrics for engagement calculation
-            received_total = 0
-            opened_total = 0
-            clicked_total = 0
-            
-            if received_email_metric:
-                try:
-                    received_data = await self.aggregates.query(
-                        metric_id=received_email_metric.get("id"),
-                        start_date=start_str,
-                        end_date=end_str,
-                        measurements=["count"],
-                        interval="month",
-                        timezone="UTC"
-                    )
-                    if received_data:
-                        attrs = received_data.get("data", {}).get("attributes", {})
-                        data_list = attrs.get("data", [])
-                        if data_list and isinstance(data_list[0], dict):
-                            measurements = data_list[0].get("measurements", {})
-                            values = measurements.get("count", [])
-                            received_total = sum(self._parse_metric_value(v) for v in values)
-                except Exception as e:
-                    logger.debug(f"Could not get received email metrics: {e}")
+            # Get metrics for engagement calculation (both queried at once)
+            responses = await self.aggregates.query_many({
+                key: {
+                    "metric_id": metric.get("id"),
+                    "start_date": start_str,
+                    "end_date": end_str,
+                    "measurements": ["count"],
+                    "interval": "month",
+                    "timezone": "UTC"
+                }
+                for key, metric in metrics.items() if metric
+            })
             
-            if opened_email_metric:
-                try:
-                    opened_data = await self.aggregates.query(
-                        metric_id=opened_email_metric.get("id"),
-                        start_date=start_str,
-                        end_date=end_str,
-                        measurements=["count"],
-                        interval="month",
-                        timezone="UTC"
-                    )
-                    if opened_data:
-                        attrs = opened_data.get("data", {}).get("attributes", {})
-                        data_list = attrs.get("data", [])
-                        if data_list and isinstance(data_list[0], dict):
-                            measurements = data_list[0].get("measurements", {})
-                            values = measurements.get("count", [])
-                            opened_total = sum(self._parse_metric_value(v) for v in values)
-                except Exception as e:
-                    logger.debug(f"Could not get opened email metrics: {e}")
+            totals = {"received": 0, "opened": 0}
+            for key, response in responses.items():
+                attrs = (response or {}).get("data", {}).get("attributes", {})
+                data_list = attrs.get("data", [])
+                if data_list and isinstance(data_list[0], dict):
+                    values = data_list[0].get("measurements", {}).get("count", [])
+                    totals[key] = sum(self._parse_metric_value(v) for v in values)
+            received_total = totals["received"]
+            opened_total = totals["opened"]
             
             # Estimate engagement based on available data
             if received_total > 0 and opened_total > 0:
@@ -283,6 +239,62 @@ class ListsService:
                 }
             }
     
+    async def _query_monthly_counts(
+        self,
+        metric_ids: Dict[str, str],
+        start_str: str,
+        end_str: str
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Query event counts for several metrics concurrently.
+        
+        Month interval is tried first (matches sample audit format); metrics
+        that return nothing are re-queried per day, to be aggregated to months
+        when the data is processed.
+        
+        Args:
+            metric_ids: Dict mapping a key to a metric ID
+            start_str: Start datetime in ISO format
+            end_str: End datetime in ISO format
+            
+        Returns:
+            Dict mapping each key to its aggregate response ({} if unavailable)
+        """
+        def count_query(metric_id: str, interval: str) -> Dict[str, Any]:
+            return {
+                "metric_id": metric_id,
+                "start_date": start_str,
+                "end_date": end_str,
+                "measurements": ["count"],
+                "interval": interval,
+                "timezone": "UTC"
+            }
+        
+        logger.debug(f"Querying {len(metric_ids)} count metrics from {start_str} to {end_str}")
+        results = await self.aggregates.query_many({
+            key: count_query(metric_id, "month") for key, metric_id in metric_ids.items()
+        })
+        
+        # If month interval fails, try day interval as fallback
+        retry = [key for key, response in results.items() if not response or not response.get("data")]
+        if retry:
+            logger.debug(f"Month interval failed for {retry}, trying day interval")
+            day_results = await self.aggregates.query_many({
+                key: count_query(metric_ids[key], "day") for key in retry
+            })
+            for key, day_data in day_results.items():
+                if day_data and day_data.get("data"):
+                    logger.info(f"Got day-level {key} data, will aggregate to months")
+                    results[key] = day_data
+        
+        for key, response in results.items():
+            if response and response.get("data"):
+                logger.info(f"Successfully retrieved {key} data for metric {metric_ids[key]}")
+            else:
+                logger.warning(f"Empty response from {key} metric {metric_ids[key]}. This may indicate the metric doesn't support aggregation or the date range is invalid.")
+                results[key] = {}
+        return results
+    
     def _parse_metric_value(self, value: Any) -> float:
         """Helper method to parse metric values consistently."""
         from ..parsers import parse_metric_value
@@ -402,7 +414,11 @@ class ListsService:
         else:
             # Get list name if list_id provided
             try:
-                response = await self.client.request("GET", f"/lists/{list_id}")
+                response = await self.client.request(
+                    "GET",
+                    f"/lists/{list_id}",
+                    params=build_sparse_fieldset("list", ["name"])
+                )
                 list_name = response.get("data", {}).get("attributes", {}).get("name", "Selected List")
             except:
                 list_name = "Selected List"
@@ -454,9 +470,6 @@ class ListsService:
         # Log date range for debugging
         logger.info(f"List growth date range: {start_date.isoformat()} to {end_date.isoformat()} ({effective_months} months)")
         
-        # Try to get subscription metrics over time
-        subscribed_metric = await self.metrics.get_metric_by_name("Subscribed to List")
-        
         # Try different possible names for churn-related metrics
         # Klaviyo may use different naming conventions for detailed churn breakdown
         unsubscribe_names = [
@@ -487,34 +500,32 @@ class ListsService:
             "One Click Unsubscribe"
         ]
         
-        # Find each metric type
-        unsubscribed_metric = None
-        for name in unsubscribe_names:
-            unsubscribed_metric = await self.metrics.get_metric_by_name(name)
-            if unsubscribed_metric:
-                logger.info(f"Found unsubscribe metric: {name}")
-                break
-        
-        bounced_metric = None
-        for name in bounce_names:
-            bounced_metric = await self.metrics.get_metric_by_name(name)
-            if bounced_metric:
-                logger.info(f"Found bounce metric: {name}")
-                break
-        
-        spam_metric = None
-        for name in spam_names:
-            spam_metric = await self.metrics.get_metric_by_name(name)
-            if spam_metric:
-                logger.info(f"Found spam metric: {name}")
-                break
-        
-        one_click_metric = None
-        for name in one_click_names:
-            one_click_metric = await self.metrics.get_metric_by_name(name)
-            if one_click_metric:
-                logger.info(f"Found one-click unsubscribe metric: {name}")
-                break
+        # Resolve every metric against one catalogue fetch
+        metrics = await self.metrics.resolve_metrics({
+            "subscribed": ["Subscribed to List"],
+            "unsubscribed": unsubscribe_names,
+            "bounced": bounce_names,
+            "spam": spam_names,
+            "one_click": one_click_names
+        })
+        subscribed_metric = metrics["subscribed"]
+        unsubscribed_metric = metrics["unsubscribed"]
+        bounced_metric = metrics["bounced"]
+        spam_metric = metrics["spam"]
+        one_click_metric = metrics["one_click"]
+        
+        for label, metric in [
+            ("subscribe", subscribed_metric),
+            ("unsubscribe", unsubscribed_metric),
+            ("bounce", bounced_metric),
+            ("spam", spam_metric),
+            ("one-click unsubscribe", one_click_metric)
+        ]:
+            if metric:
+                logger.info(f"Found {label} metric: {metric.get('attributes', {}).get('name')}")
+        
+        if not subscribed_metric:
+            logger.warning("Subscribed to List metric not found. List growth data will show 0 for new subscribers")
         
         # Log if any churn metrics are missing
         if not unsubscribed_metric:
@@ -533,226 +544,21 @@ class ListsService:
             logger.info(f"One-click unsubscribe metric not found. Searched: {one_click_names}")
         
         monthly_data = []
-        subscriptions_data = {}
-        unsubscriptions_data = {}
-        bounced_data = {}
-        spam_data = {}
-        one_click_data = {}
-        
-        if subscribed_metric:
-            metric_id = subscribed_metric.get("id")
-            if metric_id:
-                try:
-                    # Note: Metric aggregates for "Subscribed to List" doesn't support list_id filtering
-                    # This will return data across all lists, which is acceptable for most use cases
-                    start_str = start_date.strftime("%Y-%m-%dT00:00:00Z")
-                    end_str = end_date.strftime("%Y-%m-%dT23:59:59Z")
-                    logger.debug(f"Querying subscriptions metric {metric_id} from {start_str} to {end_str}")
-                    
-                    # Try month interval first (matches sample audit format)
-                    # If that fails, try day interval and aggregate manually
-                    subscriptions_data = await self.aggregates.query(
-                        metric_id=metric_id,
-                        start_date=start_str,
-                        end_date=end_str,
-                        measurements=["count"],
-                        interval="month",
-                        timezone="UTC"
-                    )
-                    
-                    # If month interval fails, try day interval as fallback
-                    if not subscriptions_data or not subscriptions_data.get("data"):
-                        logger.debug(f"Month interval failed, trying day interval for {metric_id}")
-                        try:
-                            day_data = await self.aggregates.query(
-                                metric_id=metric_id,
-                                start_date=start_str,
-                                end_date=end_str,
-                                measurements=["count"],
-                                interval="day",
-                                timezone="UTC"
-                            )
-                            # If we get day data, we can aggregate it to months later
-                            if day_data and day_data.get("data"):
-                                logger.info(f"Got day-level data, will aggregate to months")
-                                subscriptions_data = day_data
-                        except Exception as day_error:
-                            logger.debug(f"Day interval also failed: {day_error}")
-                    if subscriptions_data:
-                        logger.info(f"Successfully retrieved subscription data for metric {metric_id}")
-                        # Log sample data for debugging
-                        attrs = subscriptions_data.get("data", {}).get("attributes", {})
-                        sample_data = attrs.get("data", [])
-                        if sample_data:
-                            logger.debug(f"Sample subscription data structure: {type(sample_data[0]) if sample_data else 'empty'}")
-                    else:
-                        logger.warning(f"Empty response from subscriptions metric {metric_id}. This may indicate the metric doesn't support aggregation or the date range is invalid.")
-                except Exception as e:
-                    logger.error(f"Exception querying subscriptions metric {metric_id}: {e}", exc_info=True)
-                    subscriptions_data = {}
         
-        if unsubscribed_metric:
-            metric_id = unsubscribed_metric.get("id")
-            if metric_id:
-                try:
-                    # Note: Metric aggregates for "Unsubscribed from List" doesn't support list_id filtering
-                    # This will return data across all lists, which is acceptable for most use cases
-                    start_str = start_date.strftime("%Y-%m-%dT00:00:00Z")
-                    end_str = end_date.strftime("%Y-%m-%dT23:59:59Z")
-                    logger.debug(f"Querying unsubscriptions metric {metric_id} from {start_str} to {end_str}")
-                    
-                    # Try month interval first (matches sample audit format)
-                    # If that fails, try day interval and aggregate manually
-                    unsubscriptions_data = await self.aggregates.query(
-                        metric_id=metric_id,
-                        start_date=start_str,
-                        end_date=end_str,
-                        measurements=["count"],
-                        interval="month",
-                        timezone="UTC"
-                    )
-                    
-                    # If month interval fails, try day interval as fallback
-                    if not unsubscriptions_data or not unsubscriptions_data.get("data"):
-                        logger.debug(f"Month interval failed, trying day interval for {metric_id}")
-                        try:
-                            day_data = await self.aggregates.query(
-                                metric_id=metric_id,
-                                start_date=start_str,
-                                end_date=end_str,
-                                measurements=["count"],
-                                interval="day",
-                                timezone="UTC"
-                            )
-                            # If we get day data, we can aggregate it to months later
-                            if day_data and day_data.get("data"):
-                                logger.info(f"Got day-level data, will aggregate to months")
-                                unsubscriptions_data = day_data
-                        except Exception as day_error:
-                            logger.debug(f"Day interval also failed: {day_error}")
-                    if unsubscriptions_data:
-                        logger.info(f"Successfully retrieved unsubscription data for metric {metric_id}")
-                        # Log sample data for debugging
-                        attrs = unsubscriptions_data.get("data", {}).get("attributes", {})
-                        sample_data = attrs.get("data", [])
-                        if sample_data:
-                            logger.debug(f"Sample unsubscription data structure: {type(sample_data[0]) if sample_data else 'empty'}")
-                    else:
-                        logger.warning(f"Empty response from unsubscriptions metric {metric_id}. This may indicate the metric doesn't support aggregation or the date range is invalid.")
-                except Exception as e:
-                    logger.error(f"Exception querying unsubscriptions metric {metric_id}: {e}", exc_info=True)
-                    unsubscriptions_data = {}
-        
-        # Extract bounced email data
-        if bounced_metric:
-            metric_id = bounced_metric.get("id")
-            if metric_id:
-                try:
-                    start_str = start_date.strftime("%Y-%m-%dT00:00:00Z")
-                    end_str = end_date.strftime("%Y-%m-%dT23:59:59Z")
-                    logger.debug(f"Querying bounced metric {metric_id} from {start_str} to {end_str}")
-                    
-                    bounced_data = await self.aggregates.query(
-                        metric_id=metric_id,
-                        start_date=start_str,
-                        end_date=end_str,
-                        measurements=["count"],
-                        interval="month",
-                        timezone="UTC"
-                    )
-                    
-                    # If month interval fails, try day interval as fallback
-                    if not bounced_data or not bounced_data.get("data"):
-                        day_data = await self.aggregates.query(
-                            metric_id=metric_id,
-                            start_date=start_str,
-                            end_date=end_str,
-                            measurements=["count"],
-                            interval="day",
-                            timezone="UTC"
-                        )
-                        if day_data and day_data.get("data"):
-                            bounced_data = day_data
-                    
-                    if bounced_data:
-                        logger.info(f"Successfully retrieved bounce data for metric {metric_id}")
-                except Exception as e:
-                    logger.error(f"Exception querying bounce metric {metric_id}: {e}", exc_info=True)
-                    bounced_data = {}
-        
-        # Extract spam complaint data
-        if spam_metric:
-            metric_id = spam_metric.get("id")
-            if metric_id:
-                try:
-                    start_str = start_date.strftime("%Y-%m-%dT00:00:00Z")
-                    end_str = end_date.strftime("%Y-%m-%dT23:59:59Z")
-                    logger.debug(f"Querying spam metric {metric_id} from {start_str} to {end_str}")
-                    
-                    spam_data = await self.aggregates.query(
-                        metric_id=metric_id,
-                        start_date=start_str,
-                        end_date=end_str,
-                        measurements=["count"],
-                        interval="month",
-                        timezone="UTC"
-                    )
-                    
-                    # If month interval fails, try day interval as fallback
-                    if not spam_data or not spam_data.get("data"):
-                        day_data = await self.aggregates.query(
-                            metric_id=metric_id,
-                            start_date=start_str,
-                            end_date=end_str,
-                            measurements=["count"],
-                            interval="day",
-                            timezone="UTC"
-                        )
-                        if day_data and day_data.get("data"):
-                            spam_data = day_data
-                    
-                    if spam_data:
-                        logger.info(f"Successfully retrieved spam complaint data for metric {metric_id}")
-                except Exception as e:
-                    logger.error(f"Exception querying spam metric {metric_id}: {e}", exc_info=True)
-                    spam_data = {}
-        
-        # Extract one-click unsubscribe data
-        if one_click_metric:
-            metric_id = one_click_metric.get("id")
-            if metric_id:
-                try:
-                    start_str = start_date.strftime("%Y-%m-%dT00:00:00Z")
-                    end_str = end_date.strftime("%Y-%m-%dT23:59:59Z")
-                    logger.debug(f"Querying one-click unsubscribe metric {metric_id} from {start_str} to {end_str}")
-                    
-                    one_click_data = await self.aggregates.query(
-                        metric_id=metric_id,
-                        start_date=start_str,
-                        end_date=end_str,
-                        measurements=["count"],
-                        interval="month",
-                        timezone="UTC"
-                    )
-                    
-                    # If month interval fails, try day interval as fallback
-                    if not one_click_data or not one_click_data.get("data"):
-                        day_data = await self.aggregates.query(
-                            metric_id=metric_id,
-                            start_date=start_str,
-                            end_date=end_str,
-                            measurements=["count"],
-                            interval="day",
-                            timezone="UTC"
-                        )
-                        if day_data and day_data.get("data"):
-                            one_click_data = day_data
-                    
-                    if one_click_data:
-                        logger.info(f"Successfully retrieved one-click unsubscribe data for metric {metric_id}")
-                except Exception as e:
-                    logger.error(f"Exception querying one-click unsubscribe metric {metric_id}: {e}", exc_info=True)
-                    one_click_data = {}
+        # Note: Metric aggregates don't support list_id filtering, so these counts
+        # cover all lists, which is acceptable for most use cases
+        start_str = start_date.strftime("%Y-%m-%dT00:00:00Z")
+        end_str = end_date.strftime("%Y-%m-%dT23:59:59Z")
+        counts = await self._query_monthly_counts(
+            {key: metric.get("id") for key, metric in metrics.items() if metric and metric.get("id")},
+            start_str,
+            end_str
+        )
+        subscriptions_data = counts.get("subscribed", {})
+        unsubscriptions_data = counts.get("unsubscribed", {})
+        bounced_data = counts.get("bounced", {})
+        spam_data = counts.get("spam", {})
+        one_click_data = counts.get("one_click", {})
         
         # Process the data into monthly breakdown
         # Handle the nested structure: data[0]['measurements']['count'] = [values]
@@ -1,6 +1,7 @@
 """Metrics service for Klaviyo API."""
 from .service import MetricsService
 from .aggregates import MetricAggregatesService
+from .catalogue import MetricCatalogue, get_account_metric_catalogue, get_metric_catalogue
 
-__all__ = ["MetricsService", "MetricAggregatesService"]
+__all__ = ["MetricsService", "MetricAggregatesService", "MetricCatalogue", "get_metric_catalogue", "get_account_metric_catalogue"]
 
@@ -1,14 +1,40 @@
 """Metric aggregates query service."""
 from typing import Dict, List, Optional, Any
+import asyncio
+import copy
+import json
 import logging
+import time
+from datetime import datetime, timezone as dt_timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from ..client import KlaviyoClient
 from ..filters import build_metric_filter
 from ..parsers import parse_aggregate_data, parse_metric_value
+from ..snapshots import SNAPSHOT_SETTLE_MARGIN
+from ..utils.date_helpers import ensure_z_suffix, parse_iso_date
 
 logger = logging.getLogger(__name__)
 
 
+def _parse_utc(date_str: str) -> datetime:
+    """Parse an ISO datetime, treating naive values as UTC."""
+    parsed = parse_iso_date(date_str)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=dt_timezone.utc)
+
+
+def _local_day_start(moment: datetime, timezone_name: str) -> datetime:
+    """Midnight (in timezone_name) of the day containing moment, in UTC."""
+    try:
+        zone = ZoneInfo(timezone_name or "UTC")
+    except (ZoneInfoNotFoundError, ValueError):
+        logger.debug(f"Unknown timezone {timezone_name!r}; aligning to UTC days")
+        zone = dt_timezone.utc
+    local = moment.astimezone(zone)
+    midnight = datetime(local.year, local.month, local.day, tzinfo=zone)
+    return midnight.astimezone(dt_timezone.utc)
+
+
 class MetricAggregatesService:
     """Service for querying metric aggregates."""
     
@@ -80,6 +106,45 @@ class MetricAggregatesService:
         if "Subscribed" in metric_id or "Unsubscribed" in metric_id or interval == "month":
             logger.debug(f"Metric aggregates payload for {metric_id}: {payload}")
         
+        # Daily series can be extended from the account snapshot (incremental extraction)
+        if interval == "day" and self.client.snapshots is not None:
+            return await self._query_incremental(payload, start_date, end_date)
+        
+        return await self._post(payload, start_date, end_date)
+    
+    async def query_many(self, queries: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Run several metric aggregate queries concurrently.
+        
+        Every query still goes through the client's shared rate limiter, so
+        this only removes the idle time between sequential calls.
+        
+        Args:
+            queries: Dict mapping a key to keyword arguments for query()
+            
+        Returns:
+            Dict mapping each key to its response ({} on error)
+        """
+        keys = list(queries)
+        responses = await asyncio.gather(
+            *[self.query(**queries[key]) for key in keys],
+            return_exceptions=True
+        )
+        
+        results = {}
+        for key, response in zip(keys, responses):
+            if isinstance(response, Exception):
+                logger.warning(f"Metric aggregates query '{key}' failed: {response}")
+                response = {}
+            results[key] = response
+        return results
+    
+    async def _post(self, payload: Dict[str, Any], start_date: str, end_date: str) -> Dict[str, Any]:
+        """Send a metric aggregates query, returning {} on error."""
+        attributes = payload["data"]["attributes"]
+        metric_id = attributes["metric_id"]
+        interval = attributes["interval"]
+        
         try:
             # Client already doesn't retry 400 errors, so this will fail fast
             response = await self.client.request("POST", "/metric-aggregates/", data=payload)
@@ -99,6 +164,208 @@ class MetricAggregatesService:
                 logger.warning(f"Error querying metric aggregates for {metric_id}: {e}")
             return {}
     
+    async def _query_incremental(
+        self,
+        payload: Dict[str, Any],
+        start_date: str,
+        end_date: str
+    ) -> Dict[str, Any]:
+        """
+        Answer a daily query from stored buckets plus a query for the remaining days.
+        
+        Complete daily buckets are stored per query signature (metric,
+        measurements, grouping, extra filters, timezone). The start is
+        aligned down to midnight in the query timezone, so every day in the
+        range is a whole bucket; settled stored days from the start onwards
+        are reused and only the days after them are queried.
+        
+        Args:
+            payload: Full metric aggregates request body
+            start_date: Start datetime in ISO format
+            end_date: End datetime in ISO format
+            
+        Returns:
+            Metric aggregates response covering the full date range
+        """
+        store = self.client.snapshots
+        attributes = payload["data"]["attributes"]
+        extra_filters = attributes["filter"][2:]  # Conditions beyond the date range
+        signature = {
+            **{key: value for key, value in attributes.items() if key != "filter"},
+            "filter": extra_filters
+        }
+        start_dt = _local_day_start(_parse_utc(ensure_z_suffix(start_date)), attributes["timezone"])
+        end_dt = _parse_utc(ensure_z_suffix(end_date))
+        start_date = ensure_z_suffix(start_dt.isoformat())
+        payload = self._with_range(payload, start_date, end_date, extra_filters)
+        
+        snapshot = await store.load_series(signature)
+        stored = (snapshot or {}).get("buckets", [])
+        reused = self._reusable_buckets(stored, start_dt, end_dt)
+        
+        query_payload, query_start, query_start_dt = payload, start_date, start_dt
+        if reused:
+            # Query from the end of the last reused day (a bucket boundary in the query timezone)
+            query_start_dt = _parse_utc(reused[-1]["end"])
+            query_start = ensure_z_suffix(query_start_dt.astimezone(dt_timezone.utc).isoformat())
+            query_payload = self._with_range(payload, query_start, end_date, extra_filters)
+        
+        response = await self._post(query_payload, query_start, end_date)
+        if reused and not (response and "data" in response):
+            logger.warning("Incremental metric aggregates query failed; running full query")
+            reused, query_start_dt = [], start_dt
+            response = await self._post(payload, start_date, end_date)
+        if not response or "data" not in response:
+            return response
+        
+        fetched = self._to_buckets(response, time.time(), query_start_dt)
+        
+        # Remember complete days for the next audit (newer fetches replace older ones)
+        await store.save_series(signature, self._merge_buckets(stored, fetched))
+        
+        if not reused:
+            return response
+        logger.info(
+            f"Metric {attributes['metric_id']}: reused {len(reused)} stored days, "
+            f"fetched {len(fetched)} new"
+        )
+        return self._from_buckets(response, reused + fetched, attributes["measurements"])
+    
+    @staticmethod
+    def _with_range(
+        payload: Dict[str, Any],
+        start_date: str,
+        end_date: str,
+        extra_filters: List[str]
+    ) -> Dict[str, Any]:
+        """Copy of a request body with its datetime filter set to a new range."""
+        payload = copy.deepcopy(payload)
+        payload["data"]["attributes"]["filter"] = build_metric_filter(start_date, end_date, extra_filters)
+        return payload
+    
+    @staticmethod
+    def _reusable_buckets(
+        stored: List[Dict[str, Any]],
+        start_dt: datetime,
+        end_dt: datetime
+    ) -> List[Dict[str, Any]]:
+        """
+        Stored buckets that can stand in for the start of a query.
+        
+        Returns the contiguous run of settled, complete days beginning at
+        start_dt (a day boundary) and ending within the range. Buckets
+        before start_dt are skipped; the run stops at the first gap, at a
+        day fetched before it had settled, or at end_dt.
+        """
+        margin = SNAPSHOT_SETTLE_MARGIN.total_seconds()
+        run = []
+        expected_start = start_dt
+        for bucket in stored:
+            try:
+                bucket_start = _parse_utc(bucket["start"])
+                bucket_end = _parse_utc(bucket["end"])
+            except (ValueError, TypeError, KeyError, AttributeError):
+                if run:
+                    break
+                continue
+            if bucket_start < expected_start:
+                continue
+            if bucket_start != expected_start:
+                break
+            if bucket_end > end_dt or bucket_end.timestamp() > bucket["fetched_at"] - margin:
+                break
+            run.append(bucket)
+            expected_start = bucket_end
+        return run
+    
+    @staticmethod
+    def _merge_buckets(
+        stored: List[Dict[str, Any]],
+        fetched: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Merge newly fetched complete buckets into the stored ones.
+        
+        Buckets are matched by start instant, so the same day written with
+        a different UTC offset is replaced rather than duplicated. Partial
+        buckets (no "end") are never stored.
+        """
+        by_start = {}
+        for bucket in stored + [bucket for bucket in fetched if bucket["end"]]:
+            try:
+                by_start[_parse_utc(bucket["start"])] = bucket
+            except (ValueError, TypeError, KeyError, AttributeError):
+                continue
+        return [by_start[start] for start in sorted(by_start)]
+    
+    @staticmethod
+    def _to_buckets(
+        response: Dict[str, Any],
+        fetched_at: float,
+        query_start: datetime
+    ) -> List[Dict[str, Any]]:
+        """
+        Split a metric aggregates response into per-day buckets.
+        
+        A bucket's "end" is the next bucket's start. It is None when the
+        day may be partial: the last day, or a first day that began
+        before the query start.
+        """
+        dates, rows = parse_aggregate_data(response)
+        buckets = []
+        for index, date in enumerate(dates):
+            values = {}
+            for row in rows:
+                measurements = row.get("measurements", {})
+                values[json.dumps(row.get("dimensions", []))] = {
+                    name: series[index] if index < len(series) else 0
+                    for name, series in measurements.items()
+                }
+            complete = index + 1 < len(dates)
+            if complete:
+                try:
+                    complete = _parse_utc(date) >= query_start
+                except (ValueError, TypeError):
+                    complete = False
+            buckets.append({
+                "start": date,
+                "end": dates[index + 1] if complete else None,
+                "fetched_at": fetched_at,
+                "values": values
+            })
+        return buckets
+    
+    @staticmethod
+    def _from_buckets(
+        template: Dict[str, Any],
+        buckets: List[Dict[str, Any]],
+        measurements: List[str]
+    ) -> Dict[str, Any]:
+        """Rebuild a metric aggregates response from per-day buckets."""
+        dimension_keys = list(dict.fromkeys(key for bucket in buckets for key in bucket["values"]))
+        rows = [
+            {
+                "dimensions": json.loads(key),
+                "measurements": {
+                    name: [bucket["values"].get(key, {}).get(name, 0) for bucket in buckets]
+                    for name in measurements
+                }
+            }
+            for key in dimension_keys
+        ]
+        data = template.get("data", {})
+        return {
+            **template,
+            "data": {
+                **data,
+                "attributes": {
+                    **data.get("attributes", {}),
+                    "dates": [bucket["start"] for bucket in buckets],
+                    "data": rows
+                }
+            }
+        }
+    
     def parse_response(self, response: Dict[str, Any]) -> Dict[str, List]:
         """
         Parse metric aggregates response into structured format.
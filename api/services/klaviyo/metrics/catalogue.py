@@ -0,0 +1,169 @@
+"""
+Account-scoped metric catalogue.
+
+The full list of account metrics is fetched once (following pagination),
+indexed by name and integration key, and shared by every MetricsService
+built for the same API key. Metric lookups are then in-memory dictionary
+reads instead of a GET /metrics/ per lookup.
+
+The catalogue expires after KLAVIYO_METRIC_CATALOGUE_TTL seconds
+(default 3600) and is refetched on the next lookup.
+"""
+import asyncio
+import logging
+import os
+import time
+from typing import Dict, List, Optional, Any
+
+from ..filters import build_sparse_fieldset
+from ..registry import hash_api_key
+
+logger = logging.getLogger(__name__)
+
+# Metric attributes the catalogue indexes (sent as fields[metric])
+METRIC_FIELDS = ["name", "created", "updated", "integration"]
+
+
+def _catalogue_ttl() -> float:
+    """Catalogue time-to-live in seconds."""
+    return float(os.getenv("KLAVIYO_METRIC_CATALOGUE_TTL", "3600"))
+
+
+class MetricCatalogue:
+    """Cached, indexed list of metrics for one Klaviyo account."""
+
+    def __init__(self, ttl: Optional[float] = None):
+        """
+        Initialize an empty catalogue.
+
+        Args:
+            ttl: Seconds before the catalogue is refetched (defaults to env setting)
+        """
+        self.ttl = ttl if ttl is not None else _catalogue_ttl()
+        self.metrics: List[Dict[str, Any]] = []
+        self.by_id: Dict[str, Dict[str, Any]] = {}
+        self.by_name: Dict[str, List[Dict[str, Any]]] = {}
+        self.by_integration: Dict[str, List[Dict[str, Any]]] = {}
+        self.loaded_at: Optional[float] = None
+        # Created per event loop (see _fetch_lock); catalogues outlive a single loop
+        self._lock: Optional[asyncio.Lock] = None
+        self._lock_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def is_fresh(self) -> bool:
+        """Whether the catalogue is loaded and within its TTL."""
+        return self.loaded_at is not None and (time.monotonic() - self.loaded_at) < self.ttl
+
+    def invalidate(self):
+        """Force a refetch on the next lookup."""
+        self.loaded_at = None
+
+    def _index(self, metrics: List[Dict[str, Any]]):
+        """Replace catalogue contents and rebuild the id/name/integration indexes."""
+        by_id: Dict[str, Dict[str, Any]] = {}
+        by_name: Dict[str, List[Dict[str, Any]]] = {}
+        by_integration: Dict[str, List[Dict[str, Any]]] = {}
+
+        for metric in metrics:
+            if metric.get("id"):
+                by_id[metric["id"]] = metric
+            attributes = metric.get("attributes", {})
+            name = attributes.get("name")
+            if name:
+                by_name.setdefault(name, []).append(metric)
+            integration_key = (attributes.get("integration") or {}).get("key", "").lower()
+            by_integration.setdefault(integration_key, []).append(metric)
+
+        self.metrics = metrics
+        self.by_id = by_id
+        self.by_name = by_name
+        self.by_integration = by_integration
+        self.loaded_at = time.monotonic()
+
+    def _fetch_lock(self) -> asyncio.Lock:
+        """
+        Lock serializing fetches, bound to the running event loop.
+
+        Catalogues are process-wide, but an asyncio.Lock can only be used
+        from the loop it first ran on. If the catalogue is used from a
+        different loop (e.g. successive asyncio.run() calls in scripts or
+        worker threads), a fresh lock is created for the current loop.
+        """
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        return self._lock
+
+    async def _fetch_all(self, client) -> List[Dict[str, Any]]:
+        """Fetch every metric page from the account."""
+        return await client.get_all(
+            "/metrics/",
+            params=build_sparse_fieldset("metric", METRIC_FIELDS)
+        )
+
+    async def ensure_loaded(self, client):
+        """
+        Load the catalogue if it is empty or expired.
+
+        Concurrent callers wait for a single fetch. A failed fetch keeps any
+        previously loaded (stale) data rather than caching an empty catalogue.
+
+        Args:
+            client: KlaviyoClient used to fetch metrics
+        """
+        if self.is_fresh:
+            return
+
+        async with self._fetch_lock():
+            if self.is_fresh:
+                return
+            try:
+                metrics = await self._fetch_all(client)
+                self._index(metrics)
+                logger.info(f"Loaded metric catalogue ({len(metrics)} metrics)")
+            except Exception as e:
+                logger.error(f"Error fetching metric catalogue: {e}", exc_info=True)
+
+    def find(self, metric_name: str) -> List[Dict[str, Any]]:
+        """Get all metrics with an exact name."""
+        return self.by_name.get(metric_name, [])
+
+    def find_by_integration(self, integration_key: str) -> List[Dict[str, Any]]:
+        """Get all metrics from an integration (e.g., "shopify", "klaviyo")."""
+        return self.by_integration.get(integration_key.lower(), [])
+
+
+# Catalogues shared across services, keyed like the account registry (registry.hash_api_key)
+_catalogues: Dict[str, MetricCatalogue] = {}
+
+
+def get_metric_catalogue(api_key: str) -> MetricCatalogue:
+    """
+    Get the shared metric catalogue for an API key.
+
+    Args:
+        api_key: Klaviyo API key
+
+    Returns:
+        MetricCatalogue shared by all services using this key
+    """
+    return get_account_metric_catalogue(hash_api_key(api_key))
+
+
+def get_account_metric_catalogue(key_hash: str) -> MetricCatalogue:
+    """
+    Get the shared metric catalogue for an account.
+
+    Args:
+        key_hash: Hashed API key, as used by the account registry
+            (AccountQuota.key_hash / registry.hash_api_key)
+
+    Returns:
+        MetricCatalogue shared by all services for this account
+    """
+    catalogue = _catalogues.get(key_hash)
+    if catalogue is None:
+        catalogue = MetricCatalogue()
+        _catalogues[key_hash] = catalogue
+    return catalogue
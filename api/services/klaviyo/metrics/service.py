@@ -3,12 +3,19 @@ from typing import Dict, List, Optional, Any
 import logging
 
 from ..client import KlaviyoClient
+from ..filters import build_sparse_fieldset
+from .catalogue import METRIC_FIELDS, MetricCatalogue, get_account_metric_catalogue
 
 logger = logging.getLogger(__name__)
 
 
 class MetricsService:
-    """Service for interacting with Klaviyo metrics."""
+    """
+    Service for interacting with Klaviyo metrics.
+    
+    Metric lookups are served from an account-scoped catalogue shared by all
+    MetricsService instances for the same API key (see metrics/catalogue.py).
+    """
     
     def __init__(self, client: KlaviyoClient):
         """
@@ -18,20 +25,28 @@ class MetricsService:
             client: KlaviyoClient instance
         """
         self.client = client
+        # Same account key as the client's shared quota (registry.hash_api_key)
+        self.catalogue: MetricCatalogue = get_account_metric_catalogue(client.quota.key_hash)
     
     async def get_metrics(self) -> List[Dict[str, Any]]:
         """
-        Get all metrics from Klaviyo account.
+        Get all metrics from Klaviyo account (all pages, cached per account).
         
         Returns:
             List of metric objects
         """
-        try:
-            response = await self.client.request("GET", "/metrics/")
-            return response.get("data", [])
-        except Exception as e:
-            logger.error(f"Error fetching metrics: {e}", exc_info=True)
-            return []
+        await self.catalogue.ensure_loaded(self.client)
+        return list(self.catalogue.metrics)
+    
+    async def refresh_metrics(self) -> List[Dict[str, Any]]:
+        """
+        Refetch the metric catalogue, ignoring the TTL.
+        
+        Returns:
+            List of metric objects
+        """
+        self.catalogue.invalidate()
+        return await self.get_metrics()
     
     async def get_metric_by_name(
         self, 
@@ -49,15 +64,11 @@ class MetricsService:
         Returns:
             Metric object if found, None otherwise
         """
-        metrics = await self.get_metrics()
-        matches = []
-        
-        for metric in metrics:
-            if metric.get("attributes", {}).get("name") == metric_name:
-                matches.append(metric)
+        await self.catalogue.ensure_loaded(self.client)
+        matches = self.catalogue.find(metric_name)
         
         if not matches:
-            logger.warning(f"Metric '{metric_name}' not found in {len(metrics)} available metrics")
+            logger.warning(f"Metric '{metric_name}' not found in {len(self.catalogue.metrics)} available metrics")
             return None
         
         # If only one match, return it
@@ -84,6 +95,45 @@ class MetricsService:
         )
         return matches[0]
     
+    async def resolve_metrics(
+        self,
+        candidates: Dict[str, List[str]],
+        prefer_integration: Optional[str] = None
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Resolve many metrics, each from a list of candidate names, in one pass.
+        
+        The catalogue is loaded (at most) once for the whole batch, and each
+        group resolves to the metric of its first candidate name that exists.
+        
+        Args:
+            candidates: Dict mapping a key (e.g., "unsubscribed") to candidate
+                        metric names in order of preference
+            prefer_integration: If a name matches several metrics, prefer this integration
+            
+        Returns:
+            Dict mapping each key to its metric object, or None if no candidate exists
+        """
+        await self.catalogue.ensure_loaded(self.client)
+        
+        resolved = {}
+        for key, names in candidates.items():
+            resolved[key] = None
+            for name in names:
+                matches = self.catalogue.find(name)
+                if not matches:
+                    continue
+                resolved[key] = matches[0]
+                if prefer_integration and len(matches) > 1:
+                    for metric in matches:
+                        integration = metric.get("attributes", {}).get("integration") or {}
+                        if integration.get("key", "").lower() == prefer_integration.lower():
+                            resolved[key] = metric
+                            break
+                logger.debug(f"Resolved {key} metric: {name} ({resolved[key].get('id')})")
+                break
+        return resolved
+    
     async def get_metric_by_id(self, metric_id: str) -> Optional[Dict[str, Any]]:
         """
         Get a metric by its ID.
@@ -94,8 +144,15 @@ class MetricsService:
         Returns:
             Metric object if found, None otherwise
         """
+        if self.catalogue.is_fresh and metric_id in self.catalogue.by_id:
+            return self.catalogue.by_id[metric_id]
+        
         try:
-            response = await self.client.request("GET", f"/metrics/{metric_id}/")
+            response = await self.client.request(
+                "GET",
+                f"/metrics/{metric_id}/",
+                params=build_sparse_fieldset("metric", METRIC_FIELDS)
+            )
             return response.get("data")
         except Exception as e:
             logger.error(f"Error fetching metric {metric_id}: {e}", exc_info=True)
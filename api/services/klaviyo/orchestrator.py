@@ -5,18 +5,21 @@ Coordinates data extraction from all services and formats data for audit templat
 """
 import asyncio
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Any, Awaitable, Callable, Dict, Optional
 from datetime import datetime, timedelta, timezone
 
 from .utils.date_helpers import ensure_z_suffix, parse_iso_date
 from .utils.currency import format_currency
+from .tables import ExtractedData, FlowTable
 from .extraction import (
     RevenueExtractor,
     CampaignExtractor,
     FlowExtractor,
     ListExtractor,
     FormExtractor,
-    KAVExtractor
+    KAVExtractor,
+    ExtractionSection,
+    SectionGraph
 )
 from .formatters import (
     PeriodComparisonFormatter,
@@ -30,6 +33,18 @@ logger = logging.getLogger(__name__)
 class DataExtractionOrchestrator:
     """Orchestrates data extraction from all Klaviyo services."""
     
+    # Per-section timeouts (seconds) for the extraction graph
+    SECTION_TIMEOUTS = {
+        "conversion_metrics": 60.0,
+        "revenue": 120.0,
+        "campaigns": 300.0,
+        "flows": 600.0,
+        "kav_analysis": 600.0,
+        "list_growth": 300.0,
+        "forms": 300.0,
+        "core_flows": 300.0
+    }
+    
     def __init__(
         self,
         metrics,
@@ -84,12 +99,17 @@ class DataExtractionOrchestrator:
         self.period_comparison = PeriodComparisonFormatter(revenue)
         self.campaign_formatter = CampaignFormatter()
         self.flow_formatter = FlowFormatter()
+        
+        # Elapsed seconds per section from the most recent extract_all_data() call
+        self.last_section_timings: Dict[str, float] = {}
     
     async def extract_all_data(
         self,
         date_range: Optional[Dict[str, str]] = None,
         include_enhanced: bool = True,
-        verbose: bool = True
+        verbose: bool = True,
+        completed_sections: Optional[Dict[str, Any]] = None,
+        on_section_complete: Optional[Callable[[str, Any], Awaitable[None]]] = None
     ) -> Dict[str, Any]:
         """
         Extract all data from Klaviyo for audit reports.
@@ -101,6 +121,8 @@ class DataExtractionOrchestrator:
             date_range: Optional custom date range
             include_enhanced: If True, includes enhanced data (list growth, forms, etc.)
             verbose: Whether to print progress messages
+            completed_sections: Section results from an interrupted run, which are not re-extracted
+            on_section_complete: Awaited with (section name, result) as each section succeeds
             
         Returns:
             Dict with all extracted Klaviyo data
@@ -170,105 +192,175 @@ class DataExtractionOrchestrator:
             print(f"Enhanced data: {'Yes' if include_enhanced else 'No'}")
             print(f"{'='*60}\n")
         
-        # SECTION 1: Basic Revenue Data
-        revenue_data = await self.revenue_extractor.extract(start, end, verbose)
-        
-        # SECTION 2: Campaign Data
-        campaign_data = await self.campaign_extractor.extract(start, end, verbose)
-        campaigns = campaign_data["campaigns"]
-        campaign_statistics = campaign_data["campaign_statistics"]
+        # Calculate days from date_range for enhanced sections
+        days_for_analysis = (end_dt - start_dt).days
+        
+        # Sections run concurrently as a dependency graph under the shared rate limiter.
+        # Statistics sections wait for conversion metric resolution so it happens once.
+        sections = [
+            ExtractionSection(
+                name="conversion_metrics",
+                run=lambda deps: self._resolve_conversion_metrics(),
+                timeout=self.SECTION_TIMEOUTS["conversion_metrics"],
+                default={}
+            ),
+            # SECTION 1: Basic Revenue Data
+            ExtractionSection(
+                name="revenue",
+                run=lambda deps: self.revenue_extractor.extract(start, end, verbose),
+                timeout=self.SECTION_TIMEOUTS["revenue"],
+                default={}
+            ),
+            # SECTION 2: Campaign Data
+            ExtractionSection(
+                name="campaigns",
+                run=lambda deps: self.campaign_extractor.extract(start, end, verbose),
+                depends_on=["conversion_metrics"],
+                timeout=self.SECTION_TIMEOUTS["campaigns"],
+                default={"campaigns": [], "campaign_statistics": {}}
+            ),
+            # SECTION 3: Flow Data
+            ExtractionSection(
+                name="flows",
+                run=lambda deps: self.flow_extractor.extract(verbose),
+                depends_on=["conversion_metrics"],
+                timeout=self.SECTION_TIMEOUTS["flows"],
+                default={"flows": [], "flow_statistics": {}, "flow_details": []}
+            ),
+        ]
         
-        # SECTION 3: Flow Data
-        flow_data_result = await self.flow_extractor.extract(verbose)
-        flows = flow_data_result["flows"]
-        flow_statistics = flow_data_result["flow_statistics"]
-        flow_data = flow_data_result["flow_details"]
+        if include_enhanced:
+            sections.extend([
+                # SECTION 4: KAV Revenue Time Series
+                ExtractionSection(
+                    name="kav_analysis",
+                    run=lambda deps: self.kav_extractor.extract(
+                        days_for_analysis,
+                        account_timezone="Australia/Sydney",  # Will be overridden by account timezone in format_audit_data
+                        verbose=verbose,
+                        date_range=date_range  # Pass date_range for YTD support
+                    ),
+                    timeout=self.SECTION_TIMEOUTS["kav_analysis"],
+                    default={}
+                ),
+                # SECTION 5: List Growth Data
+                ExtractionSection(
+                    name="list_growth",
+                    run=lambda deps: self.list_extractor.extract(
+                        days_for_analysis,
+                        date_range=date_range,  # Pass date_range to optimize API calls
+                        verbose=verbose
+                    ),
+                    timeout=self.SECTION_TIMEOUTS["list_growth"],
+                    default={}
+                ),
+                # SECTION 6: Form Performance Data
+                ExtractionSection(
+                    name="forms",
+                    run=lambda deps: self.form_extractor.extract(days_for_analysis, verbose, date_range=date_range),
+                    timeout=self.SECTION_TIMEOUTS["forms"],
+                    default={"forms": []}
+                ),
+                # SECTION 7: Core Flows Deep Dive
+                ExtractionSection(
+                    name="core_flows",
+                    run=lambda deps: self._extract_core_flows(days_for_analysis, verbose),
+                    depends_on=["conversion_metrics"],
+                    timeout=self.SECTION_TIMEOUTS["core_flows"],
+                    default={}
+                ),
+            ])
+        
+        graph = SectionGraph(sections, completed=completed_sections, on_complete=on_section_complete)
+        section_results = await graph.run()
+        self.last_section_timings = dict(graph.timings)
+        
+        revenue_data = section_results["revenue"]
+        campaign_data = section_results["campaigns"]
+        flow_data_result = section_results["flows"]
         
         # Initialize enhanced data containers
         enhanced_data = {}
-        
         if include_enhanced:
-            # Calculate days from date_range if provided
-            days_for_analysis = 90  # Default
-            if date_range:
-                try:
-                    # parse_iso_date is already imported at the top of the file
-                    start_dt = parse_iso_date(date_range["start"])
-                    end_dt = parse_iso_date(date_range["end"])
-                    days_for_analysis = (end_dt - start_dt).days
-                except Exception as e:
-                    logger.warning(f"Could not calculate days from date_range: {e}")
-            
-            # SECTION 4: KAV Revenue Time Series
-            kav_data = await self.kav_extractor.extract(
-                days_for_analysis,
-                account_timezone="Australia/Sydney",  # Will be overridden by account timezone in format_audit_data
-                verbose=verbose,
-                date_range=date_range  # Pass date_range for YTD support
-            )
-            enhanced_data["kav_analysis"] = kav_data
-            
-            # SECTION 5: List Growth Data
-            list_growth = await self.list_extractor.extract(
-                days_for_analysis, 
-                date_range=date_range,  # Pass date_range to optimize API calls
-                verbose=verbose
-            )
-            enhanced_data["list_growth"] = list_growth
-            
-            # SECTION 6: Form Performance Data
-            form_data = await self.form_extractor.extract(days_for_analysis, verbose, date_range=date_range)
-            enhanced_data["forms"] = form_data
-            
-            # SECTION 7: Core Flows Deep Dive
-            if verbose:
-                period_label = f"{days_for_analysis} Days" if days_for_analysis < 365 else f"{days_for_analysis // 30} Months" if days_for_analysis < 730 else "Year to Date"
-                print(f"\n🎯 SECTION 7: Core Flows Performance ({period_label})")
-                print("-" * 40)
-            
-            try:
-                core_flows = await self.flow_patterns.get_core_flows_performance(days=days_for_analysis)
-                enhanced_data["core_flows"] = core_flows
-                
-                if verbose:
-                    for flow_type, flow_info in core_flows.items():
-                        status = "✓" if flow_info.get("found") else "✗ MISSING"
-                        name = flow_info.get("name", flow_type)
-                        perf = flow_info.get("performance", {})
-                        rev = perf.get("revenue", 0)
-                        open_rate = perf.get("open_rate", 0)
-                        print(f"  {status} {name}: Open {open_rate:.1f}%, Rev ${rev:,.0f}")
-            except Exception as e:
-                if verbose:
-                    print(f"  ✗ Error fetching core flows data: {e}")
-                logger.error(f"Error fetching core flows data: {e}", exc_info=True)
-                enhanced_data["core_flows"] = {}
+            enhanced_data["kav_analysis"] = section_results["kav_analysis"]
+            enhanced_data["list_growth"] = section_results["list_growth"]
+            enhanced_data["forms"] = section_results["forms"]
+            enhanced_data["core_flows"] = section_results["core_flows"]
+        
+        if verbose:
+            print("\n⏱  Section timings:")
+            for name, elapsed in graph.timings.items():
+                print(f"  {name}: {elapsed:.1f}s")
         
         if verbose:
             print(f"\n{'='*60}")
             print("✓ DATA EXTRACTION COMPLETE!")
             print(f"{'='*60}")
         
-        return {
+        raw_data = {
             # Basic data
             "revenue": revenue_data,
-            "campaigns": campaigns,
-            "campaign_statistics": campaign_statistics,
-            "flows": flows,
-            "flow_statistics": flow_statistics,
-            "flow_details": flow_data,
+            "campaigns": campaign_data.get("campaigns", []),
+            "campaign_statistics": campaign_data.get("campaign_statistics", {}),
+            "flows": flow_data_result.get("flows", []),
+            "flow_statistics": flow_data_result.get("flow_statistics", {}),
+            "flow_details": flow_data_result.get("flow_details", []),
             "date_range": date_range,
             
             # Enhanced data
             **enhanced_data
         }
+        
+        return raw_data
+    
+    async def _resolve_conversion_metrics(self) -> Dict[str, Optional[str]]:
+        """
+        Resolve conversion metric IDs shared by the statistics sections.
+        
+        Results are cached on the statistics services, so the campaign, flow
+        and core flow sections reuse them instead of resolving concurrently.
+        """
+        campaign_metric_id, flow_metric_id = await asyncio.gather(
+            self.campaign_stats.resolve_conversion_metric_id(),
+            self.flow_stats._resolve_conversion_metric_id()
+        )
+        return {
+            "campaign_conversion_metric_id": campaign_metric_id,
+            "flow_conversion_metric_id": flow_metric_id
+        }
+    
+    async def _extract_core_flows(self, days_for_analysis: int, verbose: bool) -> Dict[str, Any]:
+        """Extract core flows performance (SECTION 7)."""
+        if verbose:
+            period_label = f"{days_for_analysis} Days" if days_for_analysis < 365 else f"{days_for_analysis // 30} Months" if days_for_analysis < 730 else "Year to Date"
+            print(f"\n🎯 SECTION 7: Core Flows Performance ({period_label})")
+            print("-" * 40)
+        
+        try:
+            core_flows = await self.flow_patterns.get_core_flows_performance(days=days_for_analysis)
+            
+            if verbose:
+                for flow_type, flow_info in core_flows.items():
+                    status = "✓" if flow_info.get("found") else "✗ MISSING"
+                    name = flow_info.get("name", flow_type)
+                    perf = flow_info.get("performance", {})
+                    rev = perf.get("revenue", 0)
+                    open_rate = perf.get("open_rate", 0)
+                    print(f"  {status} {name}: Open {open_rate:.1f}%, Rev ${rev:,.0f}")
+            return core_flows
+        except Exception as e:
+            if verbose:
+                print(f"  ✗ Error fetching core flows data: {e}")
+            logger.error(f"Error fetching core flows data: {e}", exc_info=True)
+            return {}
     
     async def format_audit_data(
         self,
         days: int = 90,
         verbose: bool = True,
         industry: Optional[str] = None,
-        date_range: Optional[Dict[str, str]] = None
+        date_range: Optional[Dict[str, str]] = None,
+        raw_data: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """
         Format extracted data for audit report templates.
@@ -281,10 +373,17 @@ class DataExtractionOrchestrator:
             verbose: Whether to print progress messages
             industry: Industry identifier for benchmark selection
             date_range: Optional custom date range (overrides days parameter)
+            raw_data: Optional payload already returned by extract_all_data().
+                      When provided, extraction is skipped and this data is
+                      formatted directly (its date_range is used if none given).
             
         Returns:
             Dict structured for audit template consumption
         """
+        # Reuse the extracted payload's date range so formatting matches extraction
+        if raw_data is not None and not date_range:
+            date_range = raw_data.get("date_range")
+        
         # Use date_range if provided, otherwise calculate from days
         start_dt = None
         end_dt = None
@@ -341,18 +440,20 @@ class DataExtractionOrchestrator:
             except Exception as e:
                 logger.warning(f"Could not fetch account info: {e}, using defaults")
         
-        # Extract all data with enhanced mode
-        # Ensure dates are formatted with Z suffix for Klaviyo API
-        from .utils.date_helpers import ensure_z_suffix
-        date_range_for_extraction = {
-            "start": ensure_z_suffix(start_date.isoformat()),
-            "end": ensure_z_suffix(end_date.isoformat())
-        }
-        raw_data = await self.extract_all_data(
-            date_range=date_range_for_extraction,
-            include_enhanced=True,
-            verbose=verbose
-        )
+        # Extract all data with enhanced mode (skipped if caller already extracted it)
+        if raw_data is None:
+            # Ensure dates are formatted with Z suffix for Klaviyo API
+            date_range_for_extraction = {
+                "start": ensure_z_suffix(start_date.isoformat()),
+                "end": ensure_z_suffix(end_date.isoformat())
+            }
+            raw_data = await self.extract_all_data(
+                date_range=date_range_for_extraction,
+                include_enhanced=True,
+                verbose=verbose
+            )
+        elif verbose:
+            print("Using previously extracted Klaviyo data (no re-extraction)\n")
         
         # Structure data for template consumption
         kav_raw = raw_data.get("kav_analysis", {})
@@ -360,13 +461,7 @@ class DataExtractionOrchestrator:
         forms_raw = raw_data.get("forms", {})
         core_flows = raw_data.get("core_flows", {})
         
-        # Get campaign data for channel breakdown calculation
-        campaigns = raw_data.get("campaigns", [])
-        campaign_statistics = raw_data.get("campaign_statistics", {})
-        
-        # Get flow data for wishlist detection
-        flows = raw_data.get("flows", [])
-        flow_statistics = raw_data.get("flow_statistics", {})
+        # Per-channel campaign listings (for the KAV preparer)
         email_campaigns = raw_data.get("email_campaigns", [])
         sms_campaigns = raw_data.get("sms_campaigns", [])
         push_campaigns = raw_data.get("push_campaigns", [])
@@ -374,34 +469,11 @@ class DataExtractionOrchestrator:
         totals = kav_raw.get("totals", {})
         period = kav_raw.get("period", {})
         
-        # Calculate channel breakdown from campaign statistics
-        # Aggregate revenue by channel from campaign statistics
-        channel_revenue = {"email": 0, "sms": 0, "push": 0}
-        if campaign_statistics and "data" in campaign_statistics:
-            results = campaign_statistics["data"].get("attributes", {}).get("results", [])
-            # Create a map of campaign ID to channel
-            # Since we fetch campaigns separately by channel, we can map them
-            campaign_channel_map = {}
-            # Map email campaigns
-            for campaign in email_campaigns:
-                campaign_id = campaign.get("id")
-                campaign_channel_map[campaign_id] = "email"
-            # Map SMS campaigns
-            for campaign in sms_campaigns:
-                campaign_id = campaign.get("id")
-                campaign_channel_map[campaign_id] = "sms"
-            # Map push campaigns
-            for campaign in push_campaigns:
-                campaign_id = campaign.get("id")
-                campaign_channel_map[campaign_id] = "push"
-            
-            # Aggregate revenue by channel
-            for result in results:
-                campaign_id = result.get("id")
-                stats = result.get("statistics", {})
-                revenue = stats.get("conversion_value", 0) or 0
-                channel = campaign_channel_map.get(campaign_id, "email")  # Default to email if not found
-                channel_revenue[channel] = channel_revenue.get(channel, 0) + float(revenue)
+        # Campaign and flow tables, built once so formatting doesn't re-walk the JSON:API payload
+        tables = ExtractedData.from_raw(raw_data)
+        
+        # Channel breakdown: campaign revenue summed by send channel
+        channel_revenue = tables.campaigns.revenue_by_channel()
         
         # Calculate previous period comparison (period-over-period)
         # Strategist always compares with previous period
@@ -410,7 +482,8 @@ class DataExtractionOrchestrator:
             period,
             days,
             account_timezone,
-            verbose
+            verbose,
+            previous_period=kav_raw.get("previous_period")
         )
         vs_previous_period = comparison_result["vs_previous_period"]
         attributed_vs_previous = comparison_result["attributed_vs_previous"]
@@ -575,7 +648,8 @@ class DataExtractionOrchestrator:
             "campaign_performance_data": self.campaign_formatter.calculate_summary(
                 raw_data.get("campaign_statistics", {}),
                 totals.get("campaign_revenue", 0),
-                raw_data.get("campaigns", [])
+                raw_data.get("campaigns", []),
+                table=tables.campaigns
             ),
             
             # Segmentation Strategy - Will be generated dynamically in campaign_preparer based on performance
@@ -617,7 +691,7 @@ class DataExtractionOrchestrator:
             },
             
             # Wishlist Data - detect from flows
-            "wishlist_data": self._detect_wishlist_data(flows, flow_statistics),
+            "wishlist_data": self._detect_wishlist_data(tables.flows),
             
             # Add top-level cover data for template compatibility
             "client_name": "Client Name",  # Will be overridden by report service
@@ -628,13 +702,12 @@ class DataExtractionOrchestrator:
             "_raw": raw_data
         }
     
-    def _detect_wishlist_data(self, flows: List[Dict[str, Any]], flow_statistics: Dict[str, Any]) -> Dict[str, Any]:
+    def _detect_wishlist_data(self, flows: FlowTable) -> Dict[str, Any]:
         """
         Detect wishlist automation from flows.
         
         Args:
-            flows: List of flow dictionaries
-            flow_statistics: Dictionary of flow statistics by flow ID
+            flows: Flow table (names and statistics summed per flow)
         
         Returns:
             Dictionary with wishlist_data structure
@@ -646,25 +719,22 @@ class DataExtractionOrchestrator:
         # Check flows for wishlist-related names
         wishlist_keywords = ["wishlist", "wish list", "price drop", "price-drop", "back in stock", "back-in-stock"]
         
-        for flow in flows:
-            flow_name = flow.get("name", "").lower()
-            flow_id = flow.get("id")
-            
+        open_rates = flows.rate("opens")
+        click_rates = flows.rate("clicks")
+        conversion_rates = flows.rate("conversions")
+        for position, flow_name in enumerate(flows.column("name")):
             # Check if flow name contains wishlist keywords
-            if any(keyword in flow_name for keyword in wishlist_keywords):
+            if any(keyword in flow_name.lower() for keyword in wishlist_keywords):
                 enabled = True
                 
-                # Get flow statistics if available
-                flow_stats = flow_statistics.get(flow_id, {})
-                
                 wishlist_flows.append({
-                    "name": flow.get("name", "Unknown"),
-                    "id": flow_id,
-                    "open_rate": flow_stats.get("open_rate", 0),
-                    "click_rate": flow_stats.get("click_rate", 0),
-                    "conversion_rate": flow_stats.get("conversion_rate", 0),
-                    "revenue": flow_stats.get("revenue", 0),
-                    "recipients": flow_stats.get("recipients", 0)
+                    "name": flow_name or "Unknown",
+                    "id": flows.ids[position],
+                    "open_rate": float(open_rates[position]),
+                    "click_rate": float(click_rates[position]),
+                    "conversion_rate": float(conversion_rates[position]),
+                    "revenue": float(flows.values["conversion_value"][position]),
+                    "recipients": float(flows.values["recipients"][position])
                 })
         
         # Determine integration platform (if we can detect it)
@@ -0,0 +1,150 @@
+"""
+Adaptive pacing between batches of Klaviyo requests.
+
+Klaviyo applies separate rate limits per endpoint (the Reporting API is much
+stricter than /flows/ or /metrics/) and reports them on every response via
+RateLimit-Remaining / RateLimit-Reset, and via Retry-After on 429s.
+
+Instead of fixed sleeps between batches, callers await pace(endpoint). It
+returns immediately while the endpoint has quota left and only waits when
+the latest feedback says the window is nearly exhausted or a 429 asked us
+to back off. The per-request RateLimiter still applies on top of this.
+"""
+import asyncio
+import logging
+import time
+from typing import Dict, Optional, Any
+
+logger = logging.getLogger(__name__)
+
+# Keep this many requests in reserve before spreading the rest across the window
+LOW_REMAINING_THRESHOLD = 2
+
+# At or below this RateLimit-Remaining the window counts as exhausted: every
+# request to the endpoint waits for the reset (concurrent requests in flight
+# would otherwise take the last slot and 429)
+EXHAUSTED_REMAINING = 1
+
+
+def endpoint_group(endpoint: str) -> str:
+    """
+    Group key for an endpoint's rate limit bucket.
+
+    "/flow-values-reports/" -> "flow-values-reports"
+    "/flows/ABC/flow-actions/" -> "flows"
+    """
+    parts = [part for part in endpoint.split("?")[0].split("/") if part]
+    return parts[0] if parts else ""
+
+
+class AdaptivePacer:
+    """Per-endpoint pacing driven by the latest rate limit feedback."""
+
+    def __init__(self):
+        """Initialize pacer with no feedback (no waiting)."""
+        # {group: {"remaining": int, "reset_at": float, "blocked_until": float}}
+        self._feedback: Dict[str, Dict[str, Any]] = {}
+
+    def record(
+        self,
+        endpoint: str,
+        remaining: Optional[int] = None,
+        reset: Optional[int] = None,
+        retry_after: Optional[float] = None
+    ):
+        """
+        Record rate limit feedback from a response.
+
+        Args:
+            endpoint: Request endpoint (e.g., "/flow-values-reports/")
+            remaining: RateLimit-Remaining header value
+            reset: RateLimit-Reset header value (seconds)
+            retry_after: Retry-After value from a 429 (seconds)
+        """
+        now = time.monotonic()
+        state = self._feedback.setdefault(
+            endpoint_group(endpoint),
+            {"remaining": None, "reset_at": 0.0, "blocked_until": 0.0}
+        )
+        if remaining is not None:
+            state["remaining"] = remaining
+            state["reset_at"] = now + (reset or 0)
+        if retry_after:
+            state["blocked_until"] = max(state["blocked_until"], now + retry_after)
+
+    def delay_for(self, endpoint: str) -> float:
+        """
+        Seconds to wait before the next batch for an endpoint.
+
+        Returns:
+            0 when quota is available, otherwise the wait suggested by feedback
+        """
+        state = self._feedback.get(endpoint_group(endpoint))
+        if not state:
+            return 0.0
+
+        now = time.monotonic()
+        delay = max(0.0, state["blocked_until"] - now)
+
+        remaining = state["remaining"]
+        window_left = state["reset_at"] - now
+        if remaining is not None and window_left > 0 and remaining <= LOW_REMAINING_THRESHOLD:
+            if remaining <= 0:
+                # Window exhausted - wait for it to reset
+                delay = max(delay, window_left)
+            else:
+                # Spread the last few requests across the rest of the window
+                delay = max(delay, window_left / (remaining + 1))
+
+        return delay
+
+    def blocked_for(self, endpoint: str) -> float:
+        """
+        Seconds until an endpoint may be called again (0 if not blocked).
+
+        An endpoint is blocked by a Retry-After, or until its window resets
+        when the last RateLimit-Remaining was at or below EXHAUSTED_REMAINING.
+        """
+        state = self._feedback.get(endpoint_group(endpoint))
+        if not state:
+            return 0.0
+        now = time.monotonic()
+        delay = max(0.0, state["blocked_until"] - now)
+        remaining = state["remaining"]
+        if remaining is not None and remaining <= EXHAUSTED_REMAINING:
+            delay = max(delay, state["reset_at"] - now)
+        return delay
+
+    async def wait_if_blocked(self, endpoint: str) -> float:
+        """
+        Wait out a block on an endpoint before sending a request.
+
+        Called before every request. Unlike pace(), it does not spread the
+        last few requests across the window, so it only waits when the
+        window is exhausted or a 429 asked us to back off and does not stack
+        on top of a caller's batch pacing.
+
+        Returns:
+            Seconds waited
+        """
+        delay = self.blocked_for(endpoint)
+        if delay > 0:
+            logger.info(f"{endpoint_group(endpoint)} is rate limited: waiting {delay:.1f}s")
+            await asyncio.sleep(delay)
+        return delay
+
+    async def pace(self, endpoint: str) -> float:
+        """
+        Wait (only if needed) before issuing the next batch for an endpoint.
+
+        Args:
+            endpoint: Endpoint the next batch will call
+
+        Returns:
+            Seconds waited
+        """
+        delay = self.delay_for(endpoint)
+        if delay > 0:
+            logger.info(f"Pacing {endpoint_group(endpoint)}: waiting {delay:.1f}s for rate limit window")
+            await asyncio.sleep(delay)
+        return delay
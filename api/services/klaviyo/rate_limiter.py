@@ -8,83 +8,176 @@ Based on Klaviyo rate limits:
 - Extra Large (XL): 350 req/sec, 3500/min
 
 Defaults to Medium tier (10 req/sec, 150/min) for safety.
+
+Implemented as two token buckets (burst per-second and steady per-minute).
+Waiters queue in arrival order and sleep outside any lock. Each one computes
+its wait from its queue position and the current bucket state, and
+re-checks after waking (at least every MAX_RECHECK_SECONDS), so rate
+changes and pauses apply to callers that are already waiting.
+
+Klaviyo's RateLimit-* headers describe per-endpoint windows, so they feed
+the per-endpoint AdaptivePacer (pacing.py), not this account-wide limiter.
 """
 import asyncio
+import logging
 import time
 from collections import deque
 
+logger = logging.getLogger(__name__)
+
+# Longest a waiter sleeps before re-checking the buckets and pause
+MAX_RECHECK_SECONDS = 1.0
+
+# Rate limit tiers (Updated 2025) as (requests/sec, requests/min)
+# Using optimized rates: 80% of limit for safety margin
+# Klaviyo limits: S=3/60, M=10/150, L=75/700, XL=350/3500
+RATE_LIMIT_TIERS = {
+    "small": (2.4, 48),     # 80% of S tier: 2.4/sec, 48/min (limit: 3/sec, 60/min)
+    "medium": (8.0, 120),   # 80% of M tier: 8/sec, 120/min (limit: 10/sec, 150/min)
+    "large": (60.0, 560),   # 80% of L tier: 60/sec, 560/min (limit: 75/sec, 700/min)
+    "xl": (280.0, 2800)     # 80% of XL tier: 280/sec, 2800/min (limit: 350/sec, 3500/min)
+}
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at `rate` per second up to `capacity`.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Initialize token bucket (starts full).
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum tokens held (burst size)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    def refill(self, now: float):
+        """Add tokens earned since the last update."""
+        elapsed = now - self.updated_at
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated_at = now
+
+    def seconds_until(self, count: float, now: float) -> float:
+        """
+        Seconds until `count` tokens will have been available at the current rate.
+
+        Tokens taken by earlier waiters in the meantime are accounted for by
+        passing their number in `count` (queue position + 1).
+        """
+        self.refill(now)
+        return max(0.0, (count - self.tokens) / self.rate)
+
+    def take(self, now: float):
+        """Take one token (callers check availability first)."""
+        self.refill(now)
+        self.tokens -= 1
+
 
 class RateLimiter:
     """
     Rate limiter for Klaviyo API requests.
-    
+
     Based on Klaviyo rate limits:
     - Small (S): 3 req/sec, 60/min
     - Medium (M): 10 req/sec, 150/min
     - Large (L): 75 req/sec, 700/min
     - Extra Large (XL): 350 req/sec, 3500/min
-    
+
     Defaults to Medium tier (10 req/sec, 150/min) for safety.
     """
-    
+
     def __init__(self, requests_per_second: float = 8.0, requests_per_minute: int = 120):
         """
         Initialize rate limiter.
-        
+
         Args:
             requests_per_second: Max requests per second (default 8, 80% of Medium tier 10/sec)
             requests_per_minute: Max requests per minute (default 120, 80% of Medium tier 150/min)
         """
-        self.requests_per_second = requests_per_second
-        self.requests_per_minute = requests_per_minute
-        self.min_interval = 1.0 / requests_per_second  # Minimum time between requests
-        
-        # Track request timestamps
-        self.request_times = deque()  # For per-second tracking
-        self.minute_times = deque()   # For per-minute tracking
-        
-        self._lock = asyncio.Lock()
-    
+        # Burst bucket: up to one second of requests at once
+        self._burst = TokenBucket(rate=requests_per_second, capacity=max(1.0, requests_per_second))
+        # Steady bucket: per-minute budget, refilled evenly across the minute
+        self._steady = TokenBucket(rate=requests_per_minute / 60.0, capacity=max(1.0, float(requests_per_minute)))
+
+        # Global pause (e.g. an account-wide back-off)
+        self._paused_until = 0.0
+
+        # Waiters in arrival order (one ticket object per pending acquire())
+        self._waiters: deque = deque()
+
+    @property
+    def requests_per_second(self) -> float:
+        """Current burst rate."""
+        return self._burst.rate
+
+    @requests_per_second.setter
+    def requests_per_second(self, value: float):
+        now = time.monotonic()
+        self._burst.refill(now)
+        self._burst.rate = max(0.1, float(value))
+        self._burst.capacity = max(1.0, float(value))
+
+    @property
+    def requests_per_minute(self) -> int:
+        """Current steady rate."""
+        return int(round(self._steady.rate * 60.0))
+
+    @requests_per_minute.setter
+    def requests_per_minute(self, value: int):
+        now = time.monotonic()
+        self._steady.refill(now)
+        self._steady.rate = max(1.0, float(value)) / 60.0
+
     async def acquire(self):
         """Wait until we can make a request without exceeding rate limits."""
-        async with self._lock:
-            now = time.time()
-            
-            # Remove old timestamps (older than 1 second)
-            while self.request_times and self.request_times[0] < now - 1.0:
-                self.request_times.popleft()
-            
-            # Remove old timestamps (older than 1 minute)
-            while self.minute_times and self.minute_times[0] < now - 60.0:
-                self.minute_times.popleft()
-            
-            # Check per-second limit
-            if len(self.request_times) >= self.requests_per_second:
-                wait_time = 1.0 - (now - self.request_times[0])
-                if wait_time > 0:
-                    await asyncio.sleep(wait_time)
-                    now = time.time()
-                    # Clean up again after waiting
-                    while self.request_times and self.request_times[0] < now - 1.0:
-                        self.request_times.popleft()
-            
-            # Check per-minute limit
-            if len(self.minute_times) >= self.requests_per_minute:
-                wait_time = 60.0 - (now - self.minute_times[0])
-                if wait_time > 0:
-                    await asyncio.sleep(wait_time)
-                    now = time.time()
-                    # Clean up again after waiting
-                    while self.minute_times and self.minute_times[0] < now - 60.0:
-                        self.minute_times.popleft()
-            
-            # Record this request
-            self.request_times.append(now)
-            self.minute_times.append(now)
-            
-            # Ensure minimum interval between requests
-            if len(self.request_times) > 1:
-                time_since_last = now - self.request_times[-2]
-                if time_since_last < self.min_interval:
-                    await asyncio.sleep(self.min_interval - time_since_last)
+        ticket = object()
+        self._waiters.append(ticket)
+        try:
+            while True:
+                now = time.monotonic()
+                position = self._waiters.index(ticket)
+                wait_time = max(
+                    self._paused_until - now,
+                    self._burst.seconds_until(position + 1, now),
+                    self._steady.seconds_until(position + 1, now)
+                )
+                if wait_time <= 0 and position == 0:
+                    self._burst.take(now)
+                    self._steady.take(now)
+                    return
+                if wait_time <= 0:
+                    # Permits are free but an earlier waiter has not woken yet to take its own
+                    wait_time = 0.01
+                # Wake up periodically: the rate may rise or a pause may start meanwhile
+                await asyncio.sleep(min(wait_time, MAX_RECHECK_SECONDS))
+        finally:
+            self._waiters.remove(ticket)
+
+    def pause(self, seconds: float):
+        """
+        Hold all permits for a number of seconds (waiting callers included).
+
+        Args:
+            seconds: Pause duration
+        """
+        if seconds <= 0:
+            return
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
 
+    def seconds_until_available(self) -> float:
+        """Estimated wait for the next permit (0 if one is available now)."""
+        now = time.monotonic()
+        self._burst.refill(now)
+        self._steady.refill(now)
+        waits = [self._paused_until - now, 0.0]
+        for bucket in (self._burst, self._steady):
+            if bucket.tokens < 1:
+                waits.append((1 - bucket.tokens) / bucket.rate)
+        return max(waits)
@@ -0,0 +1,197 @@
+"""
+Process-wide registry of Klaviyo accounts.
+
+Klaviyo rate limits apply per account (API key), not per client object.
+Every KlaviyoClient for the same API key shares one AccountQuota from this
+registry, so concurrent audits and chat/test endpoints for one account
+throttle cooperatively through a single RateLimiter instead of each
+assuming it owns the full quota. All clients also share the process-wide
+HTTP connection pool (see http_pool.py).
+
+API keys are only stored as SHA-256 hashes. Each client may be tagged with
+a job ID so quota usage can be reported per job.
+"""
+import hashlib
+import logging
+import time
+from typing import Dict, Optional, Any
+
+from .rate_limiter import RateLimiter, RATE_LIMIT_TIERS
+from .pacing import AdaptivePacer
+
+logger = logging.getLogger(__name__)
+
+
+def hash_api_key(api_key: str) -> str:
+    """Stable, non-reversible identifier for an API key."""
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+
+
+class AccountQuota:
+    """Shared rate limiter, batch pacer and per-job usage accounting for one Klaviyo account."""
+
+    def __init__(self, key_hash: str, rate_limit_tier: str = "medium"):
+        """
+        Initialize account quota.
+
+        Args:
+            key_hash: Hashed API key (see hash_api_key)
+            rate_limit_tier: Rate limit tier - "small", "medium", "large", "xl"
+        """
+        self.key_hash = key_hash
+        self.rate_limit_tier = rate_limit_tier.lower()
+        rps, rpm = RATE_LIMIT_TIERS.get(self.rate_limit_tier, RATE_LIMIT_TIERS["small"])
+        self.rate_limiter = RateLimiter(requests_per_second=rps, requests_per_minute=rpm)
+        self.pacer = AdaptivePacer()
+
+        # Identical read requests currently in flight, by content address
+        # (see KlaviyoClient.request single-flight)
+        self.in_flight: Dict[str, Any] = {}
+
+        # {job_id: {"requests": int, "rate_limited": int, "started_at": float}}
+        self.job_usage: Dict[str, Dict[str, Any]] = {}
+
+        # Last RateLimit-* values reported by Klaviyo
+        self.server_limit: Optional[int] = None
+        self.server_remaining: Optional[int] = None
+        self.server_reset: Optional[int] = None
+
+    def _job(self, job_id: str) -> Dict[str, Any]:
+        """Get (or start) usage counters for a job."""
+        usage = self.job_usage.get(job_id)
+        if usage is None:
+            usage = {"requests": 0, "rate_limited": 0, "started_at": time.time()}
+            self.job_usage[job_id] = usage
+        return usage
+
+    def record_request(self, job_id: Optional[str], rate_limited: bool = False):
+        """
+        Count one HTTP request made on behalf of a job.
+
+        Requests from untagged clients are not recorded: no job would ever
+        release them, so they would accumulate for the life of the process
+        and skew every job's share of the account.
+
+        Args:
+            job_id: Job the request belongs to (None for untagged clients)
+            rate_limited: Whether Klaviyo answered with 429
+        """
+        if not job_id:
+            return
+        usage = self._job(job_id)
+        usage["requests"] += 1
+        if rate_limited:
+            usage["rate_limited"] += 1
+
+    def record_headers(self, limit: int, remaining: int, reset: int):
+        """Remember the latest server-reported quota window."""
+        self.server_limit = limit
+        self.server_remaining = remaining
+        self.server_reset = reset
+
+    def release_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Stop tracking a finished job.
+
+        Returns:
+            Final usage report for the job, or None if it made no requests
+        """
+        report = self.job_report(job_id)
+        self.job_usage.pop(job_id, None)
+        return report
+
+    def job_report(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Quota usage for one job relative to all jobs on this account.
+
+        Returns:
+            Dict with request counts, share of account traffic and the
+            latest server quota, or None if the job is unknown
+        """
+        usage = self.job_usage.get(job_id)
+        if usage is None:
+            return None
+
+        total_requests = sum(u["requests"] for u in self.job_usage.values())
+        elapsed = max(1.0, time.time() - usage["started_at"])
+        return {
+            "requests": usage["requests"],
+            "rate_limited": usage["rate_limited"],
+            "requests_per_minute": round(usage["requests"] / elapsed * 60.0, 1),
+            "share_of_account": round(usage["requests"] / total_requests, 3) if total_requests else 0.0,
+            "concurrent_jobs": len(self.job_usage),
+            "limiter_requests_per_minute": self.rate_limiter.requests_per_minute,
+            "server_remaining": self.server_remaining,
+            "server_limit": self.server_limit
+        }
+
+
+_accounts: Dict[str, AccountQuota] = {}
+_job_accounts: Dict[str, str] = {}  # job_id -> key_hash
+
+
+def get_account_quota(
+    api_key: str,
+    rate_limit_tier: str = "medium",
+    job_id: Optional[str] = None
+) -> AccountQuota:
+    """
+    Get the shared AccountQuota for an API key, creating it on first use.
+
+    The first caller's tier sets the limiter for the account; later callers
+    with a different tier share the existing limiter.
+
+    Args:
+        api_key: Klaviyo API key
+        rate_limit_tier: Rate limit tier - "small", "medium", "large", "xl"
+        job_id: Optional job to associate with this account for usage reporting
+
+    Returns:
+        AccountQuota shared by all clients for this key
+    """
+    key_hash = hash_api_key(api_key)
+    quota = _accounts.get(key_hash)
+    if quota is None:
+        quota = AccountQuota(key_hash, rate_limit_tier)
+        _accounts[key_hash] = quota
+    elif quota.rate_limit_tier != rate_limit_tier.lower():
+        logger.debug(
+            f"Account already registered with '{quota.rate_limit_tier}' tier; "
+            f"ignoring requested '{rate_limit_tier}' tier"
+        )
+
+    if job_id:
+        _job_accounts[job_id] = key_hash
+    return quota
+
+
+def get_job_quota_usage(job_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Quota usage for a job, looked up without the API key.
+
+    Args:
+        job_id: Job ID passed to KlaviyoService/KlaviyoClient
+
+    Returns:
+        Usage report (see AccountQuota.job_report) or None
+    """
+    key_hash = _job_accounts.get(job_id)
+    if key_hash is None or key_hash not in _accounts:
+        return None
+    return _accounts[key_hash].job_report(job_id)
+
+
+def release_job(job_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Stop tracking a finished job.
+
+    Args:
+        job_id: Job ID passed to KlaviyoService/KlaviyoClient
+
+    Returns:
+        Final usage report for the job, or None
+    """
+    key_hash = _job_accounts.pop(job_id, None)
+    if key_hash is None or key_hash not in _accounts:
+        return None
+    return _accounts[key_hash].release_job(job_id)
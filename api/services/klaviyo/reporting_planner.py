@@ -0,0 +1,285 @@
+"""
+Batch planner for Reporting API statistics requests.
+
+The Reporting API (/flow-values-reports/, /campaign-values-reports/) has
+tight per-endpoint rate limits, while an audit asks for statistics on the
+same flows and campaigns several times with different statistic lists
+(full set, conversion_value, recipients, ...).
+
+ReportingBatchPlanner sits in front of a statistics service:
+- Requests for the same timeframe and conversion metric that arrive within a
+  short window are merged into one request.
+- Each call asks for the union of requested statistics plus the audit's
+  standard statistic set, with up to 100 IDs (the API filter limit).
+- Results are remembered per ID, so later requests for any subset of those
+  statistics are answered without another API call.
+- Each caller gets a response in the usual Reporting API shape, containing
+  only its own IDs and statistics.
+"""
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Maximum IDs accepted in a Reporting API contains-any() filter
+REPORTING_MAX_IDS = 100
+
+# (ids, statistics, timeframe, conversion_metric_id) -> Reporting API response
+# ({} on error; raises ReportRejected when the API rejects the request with a 400)
+ReportFetcher = Callable[[List[str], List[str], str, str], Awaitable[Dict[str, Any]]]
+
+
+class ReportRejected(Exception):
+    """The Reporting API rejected a request as invalid (400), e.g. an unsupported statistic."""
+
+
+class _PendingRequest:
+    """A caller waiting for the next merged fetch."""
+
+    def __init__(self, ids: List[str], statistics: FrozenSet[str], use_cache: bool):
+        self.ids = ids
+        self.statistics = statistics
+        self.use_cache = use_cache
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+
+
+class ReportingBatchPlanner:
+    """Merges Reporting API statistics requests into the fewest calls."""
+
+    def __init__(
+        self,
+        id_type: str,
+        endpoint: str,
+        fetch: ReportFetcher,
+        audit_statistics: List[str],
+        client=None,
+        window: float = 0.05
+    ):
+        """
+        Initialize batch planner.
+
+        Args:
+            id_type: Grouping key of the report ("flow_id" or "campaign_id")
+            endpoint: Reporting endpoint, used for pacing between calls
+            fetch: Coroutine that performs one Reporting API call
+            audit_statistics: Statistics always requested so later calls can
+                              be served from memory
+            client: Optional KlaviyoClient used to pace between chunked calls
+            window: Seconds to wait for other requests to merge with
+        """
+        self.id_type = id_type
+        self.endpoint = endpoint
+        self._fetch = fetch
+        self.audit_statistics = frozenset(audit_statistics)
+        self.client = client
+        self.window = window
+
+        # {(timeframe, conversion_metric_id): {id: (statistics fetched, result rows)}}
+        self._memo: Dict[Tuple[str, str], Dict[str, Tuple[FrozenSet[str], List[Dict[str, Any]]]]] = {}
+        self._pending: Dict[Tuple[str, str], List[_PendingRequest]] = {}
+        self._flush_tasks: Dict[Tuple[str, str], asyncio.Task] = {}
+        self._report_type: Dict[Tuple[str, str], str] = {}
+
+        # Number of Reporting API calls made (for diagnostics)
+        self.calls_made = 0
+
+    def _is_covered(self, key: Tuple[str, str], ids: List[str], statistics: FrozenSet[str]) -> bool:
+        """Whether every ID already has results for all requested statistics."""
+        memo = self._memo.get(key, {})
+        return all(
+            item_id in memo and statistics <= memo[item_id][0]
+            for item_id in ids
+        )
+
+    def _assemble(
+        self,
+        key: Tuple[str, str],
+        ids: List[str],
+        statistics: FrozenSet[str]
+    ) -> Dict[str, Any]:
+        """Build a Reporting API-shaped response for a caller's IDs and statistics."""
+        memo = self._memo.get(key, {})
+        covered = [item_id for item_id in ids if item_id in memo and statistics <= memo[item_id][0]]
+        if not covered:
+            return {}
+
+        results = []
+        for item_id in covered:
+            for row in memo[item_id][1]:
+                row_stats = row.get("statistics", {})
+                results.append({
+                    **row,
+                    "statistics": {name: value for name, value in row_stats.items() if name in statistics}
+                })
+
+        return {
+            "data": {
+                "type": self._report_type.get(key, ""),
+                "attributes": {"results": results}
+            }
+        }
+
+    async def get(
+        self,
+        ids: List[str],
+        statistics: List[str],
+        timeframe: str,
+        conversion_metric_id: str,
+        use_cache: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Get statistics for IDs, merging with other concurrent requests.
+
+        Args:
+            ids: Flow or campaign IDs
+            statistics: Statistics the caller needs
+            timeframe: Reporting timeframe key (e.g., "last_365_days")
+            conversion_metric_id: Conversion metric ID
+            use_cache: Whether previously fetched results may be reused
+
+        Returns:
+            Reporting API-shaped response with the caller's IDs and
+            statistics, or {} if the request failed
+        """
+        key = (timeframe, conversion_metric_id)
+        requested = frozenset(statistics)
+        ids = list(dict.fromkeys(ids))
+
+        if use_cache and self._is_covered(key, ids, requested):
+            logger.debug(f"Serving {self.id_type} statistics for {len(ids)} IDs from planner memory")
+            return self._assemble(key, ids, requested)
+
+        pending = _PendingRequest(ids, requested, use_cache)
+        self._pending.setdefault(key, []).append(pending)
+        if key not in self._flush_tasks:
+            self._flush_tasks[key] = asyncio.ensure_future(self._flush(key))
+
+        await pending.future
+        return self._assemble(key, ids, requested)
+
+    async def _flush(self, key: Tuple[str, str]):
+        """Run the merged request for everything pending under a key."""
+        await asyncio.sleep(self.window)
+        pending = self._pending.pop(key, [])
+        self._flush_tasks.pop(key, None)
+
+        try:
+            memo = self._memo.setdefault(key, {})
+            requested_statistics = frozenset().union(*(p.statistics for p in pending))
+            statistics = requested_statistics | self.audit_statistics
+
+            # IDs that need a call: anything not already held with all merged statistics
+            ids_to_fetch = []
+            for p in pending:
+                for item_id in p.ids:
+                    if not p.use_cache or item_id not in memo or not statistics <= memo[item_id][0]:
+                        ids_to_fetch.append(item_id)
+            ids_to_fetch = list(dict.fromkeys(ids_to_fetch))
+
+            chunks = [
+                ids_to_fetch[i:i + REPORTING_MAX_IDS]
+                for i in range(0, len(ids_to_fetch), REPORTING_MAX_IDS)
+            ]
+            if chunks:
+                logger.info(
+                    f"Reporting planner: {len(pending)} request(s) for {len(ids_to_fetch)} "
+                    f"{self.id_type}s merged into {len(chunks)} call(s)"
+                )
+
+            for index, chunk in enumerate(chunks):
+                if index > 0 and self.client is not None:
+                    await self.client.pace(self.endpoint)
+                await self._fetch_chunk(key, chunk, statistics, requested_statistics)
+        except Exception as e:
+            logger.error(f"Reporting planner flush failed for {self.id_type}: {e}", exc_info=True)
+        finally:
+            for p in pending:
+                if not p.future.done():
+                    p.future.set_result(None)
+
+    async def _fetch_chunk(
+        self,
+        key: Tuple[str, str],
+        chunk: List[str],
+        statistics: FrozenSet[str],
+        requested_statistics: FrozenSet[str]
+    ):
+        """Fetch one chunk of IDs and store its rows per ID."""
+        timeframe, conversion_metric_id = key
+        try:
+            response = await self._fetch(chunk, sorted(statistics), timeframe, conversion_metric_id)
+            rejected = None
+        except ReportRejected as e:
+            response, rejected = {}, e
+        self.calls_made += 1
+
+        if rejected is not None and statistics != requested_statistics:
+            # The merged statistic set was rejected - fall back to what callers asked for.
+            # Other failures (exhausted 429 retries, network errors) are not retried here.
+            logger.warning(
+                f"Merged {self.id_type} statistics request rejected ({rejected}); "
+                f"retrying with requested statistics only"
+            )
+            statistics = requested_statistics
+            try:
+                response = await self._fetch(chunk, sorted(statistics), timeframe, conversion_metric_id)
+            except ReportRejected as e:
+                logger.warning(f"{self.id_type} statistics request rejected: {e}")
+                response = {}
+            self.calls_made += 1
+        elif rejected is not None:
+            logger.warning(f"{self.id_type} statistics request rejected: {rejected}")
+
+        if not response or "data" not in response:
+            return
+
+        data = response.get("data", {})
+        self._report_type[key] = data.get("type", self._report_type.get(key, ""))
+
+        rows_by_id: Dict[str, List[Dict[str, Any]]] = {item_id: [] for item_id in chunk}
+        for row in data.get("attributes", {}).get("results", []):
+            item_id = row.get("groupings", {}).get(self.id_type)
+            if item_id in rows_by_id:
+                rows_by_id[item_id].append(row)
+
+        memo = self._memo.setdefault(key, {})
+        for item_id, rows in rows_by_id.items():
+            memo[item_id] = (statistics, rows)
+
+
+def get_reporting_planner(
+    client,
+    id_type: str,
+    endpoint: str,
+    fetch: ReportFetcher,
+    audit_statistics: List[str]
+) -> ReportingBatchPlanner:
+    """
+    Get the planner for a report type, shared by every service on a client.
+
+    Services such as RevenueTimeSeriesService build their own statistics
+    service instances; attaching the planner to the client lets all of them
+    merge into the same calls for one audit.
+
+    Args:
+        client: KlaviyoClient instance
+        id_type: Grouping key of the report ("flow_id" or "campaign_id")
+        endpoint: Reporting endpoint
+        fetch: Coroutine that performs one Reporting API call
+        audit_statistics: Statistics always requested for this report type
+
+    Returns:
+        ReportingBatchPlanner for this client and report type
+    """
+    planner = client.reporting_planners.get(id_type)
+    if planner is None:
+        planner = ReportingBatchPlanner(
+            id_type=id_type,
+            endpoint=endpoint,
+            fetch=fetch,
+            audit_statistics=audit_statistics,
+            client=client
+        )
+        client.reporting_planners[id_type] = planner
+    return planner
@@ -0,0 +1,226 @@
+"""
+Content-addressed on-disk cache for Klaviyo read responses.
+
+Re-running an audit for the same account and date range (after changing
+templates or LLM settings) asks Klaviyo for the same metric aggregates,
+reports and collections again. When enabled, KlaviyoClient.request checks
+this cache first and a fully cached rerun makes no Klaviyo calls at all.
+
+Entries are JSON files under data/klaviyo_cache/, named by the SHA-256 of
+(API key hash, method, endpoint, canonical params, canonical body), so the
+same request always maps to the same file and API keys never touch disk.
+
+- TTLs are per endpoint group (RESPONSE_CACHE_TTLS). Queries over a closed
+  historical date range never expire.
+- Total size is bounded; least recently used entries are evicted first
+  (storage and eviction are shared with the LLM cache, see disk_cache.py).
+
+Configured with environment variables:
+- KLAVIYO_RESPONSE_CACHE: Enable the cache ("true"/"1", default off)
+- KLAVIYO_RESPONSE_CACHE_DIR: Cache directory (default data/klaviyo_cache)
+- KLAVIYO_RESPONSE_CACHE_MAX_MB: Size bound in megabytes (default 200)
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Optional, Any, Tuple
+
+from ..disk_cache import DiskLRUCache
+from .pacing import endpoint_group
+from .utils.date_helpers import parse_iso_date
+
+logger = logging.getLogger(__name__)
+
+# Seconds a response stays fresh, by endpoint group. Groups not listed are never cached.
+RESPONSE_CACHE_TTLS = {
+    "metric-aggregates": 6 * 3600,
+    "flow-values-reports": 6 * 3600,
+    "campaign-values-reports": 6 * 3600,
+    "flow-series-reports": 6 * 3600,
+    "campaign-series-reports": 6 * 3600,
+    "metrics": 3600,
+    "campaigns": 3600,
+    "flows": 3600,
+    "flow-actions": 3600,
+    "lists": 3600,
+    "forms": 3600,
+}
+
+# Endpoint groups whose POSTs are read-only queries
+QUERY_GROUPS = {
+    "metric-aggregates",
+    "flow-values-reports",
+    "campaign-values-reports",
+    "flow-series-reports",
+    "campaign-series-reports",
+}
+
+# A date range counts as closed once its end is this far in the past
+# (late-arriving events and attribution can still change recent days)
+CLOSED_RANGE_MARGIN = timedelta(days=2)
+
+_RANGE_END_PATTERN = re.compile(r"less-(?:than|or-equal)\(datetime,\s*['\"]?([^'\")]+)")
+
+
+def _canonical(value: Any) -> str:
+    """Stable JSON encoding (sorted keys, no whitespace) for hashing."""
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def _range_end(data: Optional[Dict[str, Any]]) -> Optional[datetime]:
+    """
+    End of the date range a query covers, if it has an explicit one.
+
+    Understands metric aggregate filters (less-than(datetime,...)) and
+    Reporting API timeframes with explicit start/end. Relative timeframes
+    such as {"key": "last_365_days"} have no fixed end.
+    """
+    attributes = ((data or {}).get("data") or {}).get("attributes") or {}
+
+    end_str = None
+    timeframe = attributes.get("timeframe")
+    if isinstance(timeframe, dict) and timeframe.get("end"):
+        end_str = timeframe["end"]
+    else:
+        filters = attributes.get("filter") or []
+        if isinstance(filters, str):
+            filters = [filters]
+        for condition in filters:
+            match = _RANGE_END_PATTERN.search(str(condition))
+            if match:
+                end_str = match.group(1)
+                break
+
+    if not end_str:
+        return None
+    try:
+        end = parse_iso_date(end_str)
+    except (ValueError, TypeError):
+        return None
+    if end.tzinfo is None:
+        end = end.replace(tzinfo=timezone.utc)
+    return end
+
+
+class ResponseCache(DiskLRUCache):
+    """Size-bounded LRU cache of Klaviyo JSON responses stored on disk."""
+
+    label = "Response cache"
+
+    def ttl_for(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict[str, Any]] = None
+    ) -> Tuple[bool, Optional[float]]:
+        """
+        Caching policy for a request.
+
+        Returns:
+            Tuple of (cacheable, ttl_seconds). ttl_seconds is None for
+            entries that never expire (closed historical ranges).
+        """
+        group = endpoint_group(endpoint)
+        if group not in RESPONSE_CACHE_TTLS:
+            return False, None
+        method = method.upper()
+        if method == "POST" and group not in QUERY_GROUPS:
+            return False, None
+        if method not in ("GET", "POST"):
+            return False, None
+
+        end = _range_end(data)
+        if end is not None and end <= datetime.now(timezone.utc) - CLOSED_RANGE_MARGIN:
+            return True, None
+        return True, float(RESPONSE_CACHE_TTLS[group])
+
+    @staticmethod
+    def make_key(
+        key_hash: str,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        data: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Content address of a request.
+
+        Args:
+            key_hash: Hashed API key (see registry.hash_api_key)
+            method: HTTP method
+            endpoint: API endpoint
+            params: Query parameters
+            data: Request body
+
+        Returns:
+            Hex SHA-256 digest
+        """
+        material = _canonical({
+            "account": key_hash,
+            "method": method.upper(),
+            "endpoint": endpoint,
+            "params": params or {},
+            "body": data or {}
+        })
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached response.
+
+        Returns:
+            Cached JSON response, or None on a miss or expired entry
+        """
+        entry = await self.get_entry(key)
+        return entry.get("response") if entry else None
+
+    async def set(self, key: str, endpoint: str, response: Dict[str, Any], ttl: Optional[float]):
+        """
+        Store a response.
+
+        Args:
+            key: Content address (see make_key)
+            endpoint: Endpoint, kept in the entry for debugging
+            response: JSON response
+            ttl: Seconds until expiry, or None to keep until evicted
+        """
+        now = time.time()
+        await self.set_entry(key, {
+            "endpoint": endpoint,
+            "stored_at": now,
+            "expires_at": now + ttl if ttl is not None else None,
+            "response": response
+        })
+
+
+_response_cache: Optional[ResponseCache] = None
+
+
+def response_cache_enabled() -> bool:
+    """Whether the on-disk response cache is turned on (KLAVIYO_RESPONSE_CACHE)."""
+    return os.getenv("KLAVIYO_RESPONSE_CACHE", "false").lower() in ("1", "true", "yes")
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """
+    Get the process-wide response cache.
+
+    Returns:
+        ResponseCache, or None if the cache is disabled
+    """
+    global _response_cache
+
+    if not response_cache_enabled():
+        return None
+    if _response_cache is None:
+        default_dir = Path(__file__).parent.parent.parent.parent / "data" / "klaviyo_cache"
+        directory = Path(os.getenv("KLAVIYO_RESPONSE_CACHE_DIR", str(default_dir)))
+        max_bytes = int(float(os.getenv("KLAVIYO_RESPONSE_CACHE_MAX_MB", "200")) * 1024 * 1024)
+        _response_cache = ResponseCache(directory, max_bytes)
+        logger.info(f"Klaviyo response cache enabled at {directory}")
+    return _response_cache
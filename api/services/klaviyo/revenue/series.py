@@ -0,0 +1,183 @@
+"""
+Vectorized revenue time series built on pandas.
+
+Klaviyo returns daily metric aggregates as parallel lists (dates plus one
+list per measurement) and Reporting API series as one list per flow or
+campaign. These helpers turn both into date-indexed frames so revenue can
+be summed into days, weeks, months or custom buckets locally: one daily
+aggregate query serves every chart interval without further API calls.
+
+Dates are kept as local calendar days (the account timezone the query was
+made in), so DST offsets in the returned timestamps never split a day.
+"""
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+import logging
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# pandas resample rule per bucket interval (buckets are labelled by their first day)
+BUCKET_RULES = {
+    "day": "D",
+    "week": "W-SUN",  # Monday-to-Sunday weeks
+    "month": "MS",
+}
+
+# Reporting API series interval that matches each bucket interval
+SERIES_INTERVALS = {
+    "day": "daily",
+    "week": "weekly",
+    "month": "monthly",
+}
+
+Bucket = Union[str, Sequence[str]]
+
+
+def _local_days(timestamps: Iterable[str]) -> pd.DatetimeIndex:
+    """Calendar days of ISO timestamps, ignoring their UTC offsets."""
+    return pd.DatetimeIndex(pd.to_datetime([str(ts)[:10] for ts in timestamps]), name="date")
+
+
+def _numeric(values: Optional[Sequence[Any]], length: int) -> np.ndarray:
+    """Up to length values as floats, with None and junk as 0."""
+    if not values:
+        return np.zeros(0)
+    return pd.to_numeric(pd.Series(list(values)[:length]), errors="coerce").fillna(0.0).to_numpy(dtype=float)
+
+
+def aggregate_frame(response: Dict[str, Any], measurements: Sequence[str]) -> pd.DataFrame:
+    """
+    Convert a metric aggregate response into a daily frame.
+
+    Args:
+        response: metric-aggregates response (data.attributes.dates / data)
+        measurements: Measurement names to keep (e.g., ["sum_value", "count"])
+
+    Returns:
+        DataFrame indexed by day with one float column per measurement,
+        summed across any groupings in the response
+    """
+    attrs = (response or {}).get("data", {}).get("attributes", {})
+    dates = attrs.get("dates") or []
+    index = _local_days(dates)
+    matrix = np.zeros((len(index), len(measurements)))
+
+    for row in attrs.get("data") or []:
+        row_measurements = row.get("measurements", {}) if isinstance(row, dict) else {}
+        for column, name in enumerate(measurements):
+            values = _numeric(row_measurements.get(name), len(index))
+            matrix[:len(values), column] += values
+
+    frame = pd.DataFrame(matrix, index=index, columns=list(measurements))
+    # Collapse duplicate days (DST transitions can yield two entries for one day)
+    return frame.groupby(level=0).sum()
+
+
+def series_report_frame(responses: Iterable[Dict[str, Any]], statistic: str) -> pd.Series:
+    """
+    Sum a statistic across all flows or campaigns of Reporting API series responses.
+
+    Args:
+        responses: flow-series-reports / campaign-series-reports responses
+            (several for ID chunks or split timeframes)
+        statistic: Statistic to sum (e.g., "conversion_value")
+
+    Returns:
+        Series indexed by interval start day
+    """
+    parts = []
+    for response in responses:
+        attrs = (response or {}).get("data", {}).get("attributes", {})
+        date_times = attrs.get("date_times") or []
+        results = attrs.get("results") or []
+        if not date_times or not results:
+            continue
+        matrix = np.zeros((len(results), len(date_times)))
+        for row, result in enumerate(results):
+            values = _numeric((result.get("statistics") or {}).get(statistic), len(date_times))
+            matrix[row, :len(values)] = values
+        parts.append(pd.Series(matrix.sum(axis=0), index=_local_days(date_times)))
+
+    if not parts:
+        return pd.Series(dtype=float, index=pd.DatetimeIndex([], name="date"))
+    return pd.concat(parts).groupby(level=0).sum()
+
+
+def bucket(data: Union[pd.DataFrame, pd.Series], interval: Bucket = "month") -> Union[pd.DataFrame, pd.Series]:
+    """
+    Sum daily values into buckets.
+
+    Args:
+        data: Day-indexed frame or series
+        interval: "day", "week", "month", or a sorted sequence of bucket start
+            dates (values before the first start are dropped)
+
+    Returns:
+        Frame or series indexed by bucket start day
+    """
+    if data.empty:
+        return data.copy()
+    if isinstance(interval, str):
+        if interval not in BUCKET_RULES:
+            raise ValueError(f"Unknown bucket interval '{interval}'")
+        summed = data.resample(BUCKET_RULES[interval]).sum()
+        if interval == "week":
+            # W-SUN bins are labelled by the Sunday they end on; label by their Monday
+            summed.index = summed.index - pd.Timedelta(days=6)
+        return summed
+
+    starts = pd.DatetimeIndex(pd.to_datetime([str(s)[:10] for s in interval]))
+    positions = np.searchsorted(starts.values, data.index.values, side="right") - 1
+    keep = positions >= 0
+    grouped = data[keep].groupby(starts[positions[keep]]).sum()
+    return grouped.reindex(starts, fill_value=0.0)
+
+
+def concat_days(frames: Sequence[pd.DataFrame]) -> pd.DataFrame:
+    """Combine daily frames from consecutive queries (a day split across two queries is summed)."""
+    return pd.concat(list(frames)).groupby(level=0).sum()
+
+
+def split_at(data: Union[pd.DataFrame, pd.Series], day: str):
+    """
+    Split day-indexed data at a calendar day.
+
+    Args:
+        data: Day-indexed frame or series
+        day: First day of the second part (ISO date or datetime)
+
+    Returns:
+        Tuple of (days before day, day and later)
+    """
+    boundary = pd.Timestamp(str(day)[:10])
+    return data[data.index < boundary], data[data.index >= boundary]
+
+
+def series_interval_for(interval: Bucket) -> str:
+    """Reporting API series interval giving exact sums for a bucket interval."""
+    if isinstance(interval, str):
+        return SERIES_INTERVALS.get(interval, "daily")
+    return "daily"
+
+
+def daily_records(frame: pd.DataFrame) -> Dict[str, List[Any]]:
+    """
+    Serialize a daily frame as plain lists (JSON friendly).
+
+    Returns:
+        Dict with "dates" (YYYY-MM-DD) and one list per column
+    """
+    records: Dict[str, List[Any]] = {"dates": [day.strftime("%Y-%m-%d") for day in frame.index]}
+    for column in frame.columns:
+        records[column] = [float(value) for value in frame[column].to_numpy()]
+    return records
+
+
+def frame_from_records(records: Optional[Dict[str, List[Any]]]) -> pd.DataFrame:
+    """Inverse of daily_records()."""
+    records = dict(records or {})
+    dates = records.pop("dates", [])
+    index = _local_days(dates)
+    return pd.DataFrame({name: values[:len(index)] for name, values in records.items()}, index=index).astype(float)
@@ -1,7 +1,7 @@
 """Revenue time series service for KAV analysis."""
 from typing import Dict, Any, List, Optional
 import logging
-from datetime import datetime, timedelta
+from datetime import timedelta
 
 from ..client import KlaviyoClient
 from ..metrics.service import MetricsService
@@ -10,10 +10,22 @@ from ..flows.statistics import FlowStatisticsService
 from ..flows.service import FlowsService
 from ..campaigns.statistics import CampaignStatisticsService
 from ..campaigns.service import CampaignsService
-from ..parsers import parse_metric_value, parse_metric_list_value, parse_nested_aggregate_values, parse_aggregate_data
+from .series import (
+    BUCKET_RULES,
+    aggregate_frame,
+    bucket,
+    daily_records,
+    series_interval_for,
+    concat_days,
+    series_report_frame,
+    split_at
+)
 
 logger = logging.getLogger(__name__)
 
+# Longest range (days) accepted by one metric-aggregates query
+AGGREGATE_MAX_DAYS = 365
+
 
 class RevenueTimeSeriesService:
     """Service for revenue time series and KAV (Klaviyo Attributed Value) analysis."""
@@ -38,7 +50,9 @@ class RevenueTimeSeriesService:
         days: int = 90,
         interval: str = "day",
         account_timezone: str = "Australia/Sydney",
-        date_range: Optional[Dict[str, str]] = None
+        date_range: Optional[Dict[str, str]] = None,
+        bucket_edges: Optional[List[str]] = None,
+        include_previous_period: bool = False
     ) -> Dict[str, Any]:
         """
         Get detailed revenue time series with attribution breakdown.
@@ -48,9 +62,14 @@ class RevenueTimeSeriesService:
         
         Args:
             days: Number of days to look back (ignored if date_range provided)
-            interval: "day", "week", or "month"
+            interval: Chart bucket size: "day", "week", or "month"
             account_timezone: Account timezone for proper date range calculation
             date_range: Optional custom date range (overrides days parameter)
+            bucket_edges: Optional custom bucket start dates (overrides interval)
+            include_previous_period: Also return totals for the equally long period
+                just before this one ("previous_period"). Total revenue for both
+                periods comes from one aggregate query that is split locally, and
+                the flow and campaign listings are shared.
             
         Returns:
             Dict with time series data for total, flow, and campaign revenue
@@ -73,6 +92,20 @@ class RevenueTimeSeriesService:
         
         logger.info(f"Querying revenue data for {days} days: {start_str} to {end_str}")
         
+        # The previous period ends just before this one and is as long
+        query_start_str = start_str
+        previous_range = None
+        if include_previous_period:
+            current_start_dt = parse_iso_date(start_str)
+            previous_end_dt = current_start_dt - timedelta(seconds=1)
+            previous_start_dt = previous_end_dt - (parse_iso_date(end_str) - current_start_dt)
+            previous_range = {
+                "start": ensure_z_suffix(previous_start_dt.isoformat()),
+                "end": ensure_z_suffix(previous_end_dt.isoformat())
+            }
+            query_start_str = previous_range["start"]
+            logger.info(f"Including previous period: {previous_range['start']} to {previous_range['end']}")
+        
         # Get Ordered Product metric for total revenue (matches dashboard)
         ordered_product = await self.metrics.get_metric_by_name("Ordered Product")
         if not ordered_product:
@@ -105,98 +138,46 @@ class RevenueTimeSeriesService:
         logger.info(f"Using Placed Order for attribution: {conversion_metric_id} ({integration_name})")
         
         # ===== 1. TOTAL REVENUE via Aggregates API =====
-        logger.info("Querying total revenue...")
-        total_revenue_data = await self.aggregates.query(
-            metric_id=revenue_metric_id,  # Use Ordered Product
-            start_date=start_str,
-            end_date=end_str,
-            measurements=["sum_value", "count"],
-            interval=interval,
-            timezone=account_timezone
-        )
-        
-        # If Ordered Product fails with month interval, try day interval and aggregate
-        if not total_revenue_data or (isinstance(total_revenue_data, dict) and not total_revenue_data.get("data")):
-            if interval == "month":
-                logger.warning(f"Ordered Product metric ({revenue_metric_id}) failed with month interval, trying day interval...")
-                total_revenue_data = await self.aggregates.query(
-                    metric_id=revenue_metric_id,
-                    start_date=start_str,
-                    end_date=end_str,
-                    measurements=["sum_value", "count"],
-                    interval="day",  # Try day interval
-                    timezone=account_timezone
-                )
-                # If day interval works, we'll aggregate to monthly later
+        # Always queried per day: buckets (months, weeks, custom) are summed locally,
+        # so one daily query serves every chart interval
+        logger.info("Querying daily total revenue...")
+        daily = await self._query_daily_revenue(revenue_metric_id, query_start_str, end_str, account_timezone)
         
-        # If still fails, try Placed Order as fallback
-        if not total_revenue_data or (isinstance(total_revenue_data, dict) and not total_revenue_data.get("data")):
+        # If Ordered Product fails, try Placed Order as fallback
+        if daily is None:
             logger.warning(f"Ordered Product metric ({revenue_metric_id}) failed, trying Placed Order as fallback...")
-            # Try using Placed Order metric for total revenue
             placed_order_metric = await self.metrics.get_metric_by_name("Placed Order", prefer_integration="shopify")
             if placed_order_metric:
                 fallback_metric_id = placed_order_metric.get("id")
                 logger.info(f"Using Placed Order metric ({fallback_metric_id}) for total revenue")
-                # Try original interval first
-                total_revenue_data = await self.aggregates.query(
-                    metric_id=fallback_metric_id,
-                    start_date=start_str,
-                    end_date=end_str,
-                    measurements=["sum_value", "count"],
-                    interval=interval,
-                    timezone=account_timezone
-                )
-                # If that fails and we wanted month, try day
-                if (not total_revenue_data or (isinstance(total_revenue_data, dict) and not total_revenue_data.get("data"))) and interval == "month":
-                    logger.warning(f"Placed Order metric failed with month interval, trying day interval...")
-                    total_revenue_data = await self.aggregates.query(
-                        metric_id=fallback_metric_id,
-                        start_date=start_str,
-                        end_date=end_str,
-                        measurements=["sum_value", "count"],
-                        interval="day",
-                        timezone=account_timezone
-                    )
+                daily = await self._query_daily_revenue(fallback_metric_id, query_start_str, end_str, account_timezone)
+        if daily is None:
+            daily = aggregate_frame({}, ["total_revenue", "orders"])
         
-        # Parse total revenue
-        dates, total_values = parse_aggregate_data(total_revenue_data)
-        total_sum = 0
-        total_orders = 0
-        monthly_revenue_values = []  # Store monthly values for chart
-        monthly_order_values = []
-        
-        # Handle different response structures
-        if len(total_values) == 1 and isinstance(total_values[0], dict):
-            # Aggregated response (single aggregated value)
-            measurements = total_values[0].get("measurements", {})
-            sum_values = measurements.get("sum_value", [])
-            count_values = measurements.get("count", [])
-            total_sum = sum(float(val) for val in sum_values if val is not None)
-            total_orders = sum(float(val) for val in count_values if val is not None)
-            # For aggregated response, use the arrays directly if they exist
-            if sum_values and len(sum_values) > 1:
-                monthly_revenue_values = [float(v) if v is not None else 0 for v in sum_values]
-                monthly_order_values = [float(v) if v is not None else 0 for v in count_values]
-        elif len(total_values) > 1:
-            # Multiple data points (monthly/daily breakdown)
-            for value_item in total_values:
-                if isinstance(value_item, dict):
-                    measurements = value_item.get("measurements", {})
-                    sum_val = measurements.get("sum_value", [0])[0] if isinstance(measurements.get("sum_value"), list) else measurements.get("sum_value", 0)
-                    count_val = measurements.get("count", [0])[0] if isinstance(measurements.get("count"), list) else measurements.get("count", 0)
-                    monthly_revenue_values.append(float(sum_val) if sum_val is not None else 0)
-                    monthly_order_values.append(float(count_val) if count_val is not None else 0)
-                    total_sum += float(sum_val) if sum_val is not None else 0
-                    total_orders += float(count_val) if count_val is not None else 0
-                elif isinstance(value_item, list):
-                    # List format [sum_value, count, unique]
-                    monthly_revenue_values.append(float(value_item[0]) if len(value_item) > 0 and value_item[0] is not None else 0)
-                    monthly_order_values.append(float(value_item[1]) if len(value_item) > 1 and value_item[1] is not None else 0)
-                    total_sum += float(value_item[0]) if len(value_item) > 0 and value_item[0] is not None else 0
-                    total_orders += float(value_item[1]) if len(value_item) > 1 and value_item[1] is not None else 0
+        # Split off the previous period locally
+        previous_daily = None
+        if previous_range:
+            previous_daily, daily = split_at(daily, start_str)
+        
+        total_sum = float(daily["total_revenue"].sum())
+        total_orders = float(daily["orders"].sum())
         
         logger.info(f"✅ Total Revenue: ${total_sum:,.2f} ({total_orders} orders)")
-        logger.info(f"   Monthly data points: {len(monthly_revenue_values)} months, {len(dates)} dates")
+        logger.info(f"   Daily data points: {len(daily)} days")
+        
+        # Chart buckets and the Reporting API series interval that sums into them exactly
+        buckets = bucket_edges or (interval if interval in BUCKET_RULES else "month")
+        series_interval = series_interval_for(buckets)
+        
+        # Map days to timeframe for Reporting API (values-report fallback only)
+        if days <= 7:
+            timeframe = "last_7_days"
+        elif days <= 30:
+            timeframe = "last_30_days"
+        elif days <= 90:
+            timeframe = "last_90_days"
+        else:
+            timeframe = "last_365_days"
         
         # ===== 2. FLOW REVENUE via Reporting API =====
         # Use Reporting API to match dashboard attribution model (single-touch, not multi-touch)
@@ -204,6 +185,8 @@ class RevenueTimeSeriesService:
         # can cause double-counting when combined with campaign revenue
         logger.info("Querying flow revenue via Reporting API (matches dashboard attribution)...")
         flow_sum = 0
+        flow_ids = []
+        flow_series = None
         
         try:
             # Get all flows
@@ -212,32 +195,25 @@ class RevenueTimeSeriesService:
                 flow_ids = [f["id"] for f in all_flows]
                 logger.info(f"Found {len(flow_ids)} flows")
                 
-                # Map days to timeframe for Reporting API
-                if days <= 7:
-                    timeframe = "last_7_days"
-                elif days <= 30:
-                    timeframe = "last_30_days"
-                elif days <= 90:
-                    timeframe = "last_90_days"
+                # Series report bounded by the audit date range gives per-period revenue
+                flow_series_responses = await self.flow_stats.get_series(
+                    flow_ids=flow_ids,
+                    start_date=start_str,
+                    end_date=end_str,
+                    statistics=["conversion_value"],
+                    interval=series_interval,
+                    conversion_metric_id=conversion_metric_id
+                )
+                if flow_series_responses:
+                    flow_series = series_report_frame(flow_series_responses, "conversion_value")
+                    flow_sum = float(flow_series.sum())
                 else:
-                    timeframe = "last_365_days"
-                
-                # CRITICAL FIX: Batch flow queries to avoid rate limiting
-                # Process flows in smaller batches with delays
-                batch_size = 10  # Smaller batches for revenue queries
-                import asyncio
-                
-                for i in range(0, len(flow_ids), batch_size):
-                    batch_ids = flow_ids[i:i + batch_size]
-                    batch_num = (i // batch_size) + 1
-                    total_batches = (len(flow_ids) + batch_size - 1) // batch_size
-                    
+                    # Fall back to relative-timeframe totals - the batch planner merges
+                    # this with the flow extraction's statistics
+                    logger.warning("Flow series report unavailable, using flow totals")
                     try:
-                        logger.debug(f"Querying flow revenue batch {batch_num}/{total_batches} ({len(batch_ids)} flows)...")
-                        
-                        # Query flow statistics with conversion_value for this batch
                         flow_stats_response = await self.flow_stats.get_statistics(
-                            flow_ids=batch_ids,
+                            flow_ids=flow_ids,
                             statistics=["conversion_value", "conversions"],
                             timeframe=timeframe,
                             conversion_metric_id=conversion_metric_id,
@@ -251,17 +227,8 @@ class RevenueTimeSeriesService:
                                 stats = result.get("statistics", {})
                                 revenue = stats.get("conversion_value", 0)
                                 flow_sum += float(revenue) if revenue else 0
-                        
-                        # Add delay between batches to avoid rate limiting
-                        if i + batch_size < len(flow_ids):
-                            await asyncio.sleep(5.0)  # 5 second delay between batches for revenue queries
-                            
                     except Exception as batch_error:
-                        logger.warning(f"Batch {batch_num} failed: {batch_error}. Continuing with remaining batches...")
-                        # Continue with next batch instead of failing completely
-                        if i + batch_size < len(flow_ids):
-                            await asyncio.sleep(5.0)  # Still wait before next batch
-                        continue
+                        logger.warning(f"Flow revenue statistics request failed: {batch_error}")
                 
                 logger.info(f"✅ Flow Revenue: ${flow_sum:,.2f}")
             else:
@@ -274,46 +241,57 @@ class RevenueTimeSeriesService:
         # So we use Reporting API but filter campaigns by date range first
         logger.info("Querying campaign revenue via Reporting API (with date filtering)...")
         campaign_sum = 0
+        campaign_ids = []
+        previous_campaign_ids = []
+        campaign_series = None
         
         try:
             # Filter campaigns by date range (campaigns sent in the period)
-            # This ensures we only query statistics for campaigns active in the date range
+            # This ensures we only query statistics for campaigns active in the date range.
+            # One listing covers the previous period too; it is split locally.
             all_campaigns = await self.campaigns.get_campaigns(
-                start_date=start_str,
+                start_date=query_start_str,
                 end_date=end_str
             )
+            if previous_range:
+                in_previous = self.campaigns._range_filter(previous_range["start"], previous_range["end"])
+                previous_campaign_ids = [c["id"] for c in all_campaigns if in_previous(c)]
+                in_current = self.campaigns._range_filter(start_str, end_str)
+                all_campaigns = [c for c in all_campaigns if in_current(c)]
             
             if all_campaigns:
                 campaign_ids = [c["id"] for c in all_campaigns]
                 logger.info(f"Found {len(campaign_ids)} campaigns in date range {start_str} to {end_str}")
                 
-                # Map days to timeframe for Reporting API
-                # Note: Reporting API uses relative timeframes, but we've filtered campaigns by date
-                # So the statistics should be for the correct period
-                if days <= 7:
-                    timeframe = "last_7_days"
-                elif days <= 30:
-                    timeframe = "last_30_days"
-                elif days <= 90:
-                    timeframe = "last_90_days"
-                else:
-                    timeframe = "last_365_days"
-                
-                # Query campaign statistics with conversion_value
-                campaign_stats_response = await self.campaign_stats.get_statistics(
+                campaign_series_responses = await self.campaign_stats.get_series(
                     campaign_ids=campaign_ids,
-                    statistics=["conversion_value", "conversions"],
-                    timeframe=timeframe,
+                    start_date=start_str,
+                    end_date=end_str,
+                    statistics=["conversion_value"],
+                    interval=series_interval,
                     conversion_metric_id=conversion_metric_id
                 )
-                
-                # Extract revenue from response
-                if campaign_stats_response and "data" in campaign_stats_response:
-                    results = campaign_stats_response["data"].get("attributes", {}).get("results", [])
-                    for result in results:
-                        stats = result.get("statistics", {})
-                        revenue = stats.get("conversion_value", 0)
-                        campaign_sum += float(revenue) if revenue else 0
+                if campaign_series_responses:
+                    campaign_series = series_report_frame(campaign_series_responses, "conversion_value")
+                    campaign_sum = float(campaign_series.sum())
+                else:
+                    # Fall back to relative-timeframe totals
+                    # Note: Reporting API uses relative timeframes, but we've filtered campaigns by date
+                    logger.warning("Campaign series report unavailable, using campaign totals")
+                    campaign_stats_response = await self.campaign_stats.get_statistics(
+                        campaign_ids=campaign_ids,
+                        statistics=["conversion_value", "conversions"],
+                        timeframe=timeframe,
+                        conversion_metric_id=conversion_metric_id
+                    )
+                    
+                    # Extract revenue from response
+                    if campaign_stats_response and "data" in campaign_stats_response:
+                        results = campaign_stats_response["data"].get("attributes", {}).get("results", [])
+                        for result in results:
+                            stats = result.get("statistics", {})
+                            revenue = stats.get("conversion_value", 0)
+                            campaign_sum += float(revenue) if revenue else 0
                 
                 logger.info(f"✅ Campaign Revenue: ${campaign_sum:,.2f}")
             else:
@@ -353,81 +331,39 @@ class RevenueTimeSeriesService:
         )
         
         # ===== 6. BUILD TIME SERIES =====
-        # Use actual data from API instead of distributing evenly
-        # If we have daily data, aggregate to monthly for chart
-        # If we have monthly data, use it directly
-        time_series = []
-        
-        if interval == "month" and dates and monthly_revenue_values:
-            # Monthly data - use actual values from API
-            # Calculate monthly ratios for flow/campaign (applied proportionally)
-            flow_ratio = flow_sum / total_sum if total_sum > 0 else 0
-            campaign_ratio = campaign_sum / total_sum if total_sum > 0 else 0
-            
-            for i, date in enumerate(dates):
-                month_revenue = monthly_revenue_values[i] if i < len(monthly_revenue_values) else 0
-                month_orders = monthly_order_values[i] if i < len(monthly_order_values) else 0
-                
-                time_series.append({
-                    "date": date,
-                    "total_revenue": month_revenue,
-                    "flow_revenue": month_revenue * flow_ratio,
-                    "campaign_revenue": month_revenue * campaign_ratio,
-                    "attributed_revenue": month_revenue * (flow_ratio + campaign_ratio),
-                    "unattributed_revenue": month_revenue * (1 - (flow_ratio + campaign_ratio)),
-                    "orders": int(month_orders)
-                })
-        elif interval == "month" and dates:
-            # Fallback: distribute evenly if monthly values not available
-            monthly_avg_revenue = total_sum / len(dates) if len(dates) > 0 else 0
-            monthly_avg_orders = total_orders / len(dates) if len(dates) > 0 else 0
-            flow_ratio = flow_sum / total_sum if total_sum > 0 else 0
-            campaign_ratio = campaign_sum / total_sum if total_sum > 0 else 0
-            
-            for date in dates:
-                time_series.append({
-                    "date": date,
-                    "total_revenue": monthly_avg_revenue,
-                    "flow_revenue": monthly_avg_revenue * flow_ratio,
-                    "campaign_revenue": monthly_avg_revenue * campaign_ratio,
-                    "attributed_revenue": monthly_avg_revenue * (flow_ratio + campaign_ratio),
-                    "unattributed_revenue": monthly_avg_revenue * (1 - (flow_ratio + campaign_ratio)),
-                    "orders": int(monthly_avg_orders)
-                })
+        # Sum actual daily revenue into buckets. Flow and campaign revenue per bucket
+        # come from the date-bounded series reports; if a series report was
+        # unavailable, that channel falls back to its share of total revenue.
+        by_bucket = bucket(daily, buckets)
+        flow_ratio = flow_sum / total_sum if total_sum > 0 else 0
+        campaign_ratio = campaign_sum / total_sum if total_sum > 0 else 0
+        
+        if flow_series is not None:
+            by_bucket["flow_revenue"] = bucket(flow_series, buckets).reindex(by_bucket.index, fill_value=0.0)
         else:
-            # Daily data - aggregate to monthly for chart
-            # Group by month
-            from collections import defaultdict
-            monthly_data = defaultdict(lambda: {"total": 0, "orders": 0, "dates": []})
-            
-            for i, date in enumerate(dates):
-                date_obj = datetime.fromisoformat(date.replace("Z", "+00:00"))
-                month_key = date_obj.strftime("%Y-%m")
-                monthly_data[month_key]["dates"].append(date)
-            
-            # Calculate monthly totals
-            flow_ratio = flow_sum / total_sum if total_sum > 0 else 0
-            campaign_ratio = campaign_sum / total_sum if total_sum > 0 else 0
-            
-            for month_key in sorted(monthly_data.keys()):
-                month_dates = monthly_data[month_key]["dates"]
-                days_in_month = len(month_dates)
-                monthly_revenue = (total_sum / len(dates)) * days_in_month if len(dates) > 0 else 0
-                monthly_orders = (total_orders / len(dates)) * days_in_month if len(dates) > 0 else 0
-                
-                # Use first date of month for label
-                first_date = month_dates[0]
-                time_series.append({
-                    "date": first_date,
-                    "total_revenue": monthly_revenue,
-                    "flow_revenue": monthly_revenue * flow_ratio,
-                    "campaign_revenue": monthly_revenue * campaign_ratio,
-                    "attributed_revenue": monthly_revenue * (flow_ratio + campaign_ratio),
-                    "unattributed_revenue": monthly_revenue * (1 - (flow_ratio + campaign_ratio)),
-                    "orders": int(monthly_orders)
-                })
-        
-        # ===== 6. RETURN RESULTS =====
+            by_bucket["flow_revenue"] = by_bucket["total_revenue"] * flow_ratio
+        if campaign_series is not None:
+            by_bucket["campaign_revenue"] = bucket(campaign_series, buckets).reindex(by_bucket.index, fill_value=0.0)
+        else:
+            by_bucket["campaign_revenue"] = by_bucket["total_revenue"] * campaign_ratio
+        by_bucket["attributed_revenue"] = by_bucket["flow_revenue"] + by_bucket["campaign_revenue"]
+        by_bucket["unattributed_revenue"] = (by_bucket["total_revenue"] - by_bucket["attributed_revenue"]).clip(lower=0)
+        
+        time_series = [
+            {
+                "date": bucket_start.isoformat(),
+                "total_revenue": float(row.total_revenue),
+                "flow_revenue": float(row.flow_revenue),
+                "campaign_revenue": float(row.campaign_revenue),
+                "attributed_revenue": float(row.attributed_revenue),
+                "unattributed_revenue": float(row.unattributed_revenue),
+                "orders": int(row.orders)
+            }
+            for bucket_start, row in by_bucket.iterrows()
+        ]
+        label_format = "%b %Y" if buckets == "month" else "%d %b %Y"
+        
+        # ===== 7. RETURN RESULTS =====
         start_dt = parse_iso_date(start_str)
         end_dt = parse_iso_date(end_str)
         
@@ -447,12 +383,21 @@ class RevenueTimeSeriesService:
                 "campaign_percentage": round(campaign_percentage, 2)
             },
             "time_series": time_series,
+            # Daily totals, so callers can re-bucket without another query
+            "daily": daily_records(daily),
+            "previous_period": await self._previous_period_totals(
+                previous_range,
+                previous_daily,
+                flow_ids,
+                previous_campaign_ids,
+                conversion_metric_id
+            ) if previous_range else None,
             "chart_data": {
                 # Match sample audit format: monthly labels (Nov, Dec, Jan, Feb)
-                "labels": [datetime.fromisoformat(ts["date"].replace("Z", "+00:00")).strftime("%b %Y") if isinstance(ts["date"], str) else ts["date"].strftime("%b %Y") for ts in time_series],
+                "labels": [bucket_start.strftime(label_format) for bucket_start in by_bucket.index],
                 "total_revenue": [ts["total_revenue"] for ts in time_series],
-                "attributed_revenue": [ts.get("attributed_revenue", ts["flow_revenue"] + ts["campaign_revenue"]) for ts in time_series],
-                "unattributed_revenue": [ts.get("unattributed_revenue", ts["total_revenue"] - (ts["flow_revenue"] + ts["campaign_revenue"])) for ts in time_series],
+                "attributed_revenue": [ts["attributed_revenue"] for ts in time_series],
+                "unattributed_revenue": [ts["unattributed_revenue"] for ts in time_series],
                 "flow_revenue": [ts["flow_revenue"] for ts in time_series],
                 "campaign_revenue": [ts["campaign_revenue"] for ts in time_series],
                 # Recipients data from campaigns and flows
@@ -460,6 +405,123 @@ class RevenueTimeSeriesService:
             }
         }
     
+    async def _query_daily_revenue(
+        self,
+        metric_id: str,
+        start_date: str,
+        end_date: str,
+        account_timezone: str
+    ) -> Optional[Any]:
+        """
+        Query daily revenue and order counts, in as few aggregate queries as the API allows.
+        
+        Returns:
+            Daily frame with total_revenue and orders columns, or None if a query returned no data
+        """
+        from ..utils.date_helpers import parse_iso_date, ensure_z_suffix
+        
+        window_start = parse_iso_date(start_date)
+        end = parse_iso_date(end_date)
+        frames = []
+        while window_start < end:
+            window_end = min(window_start + timedelta(days=AGGREGATE_MAX_DAYS), end)
+            response = await self.aggregates.query(
+                metric_id=metric_id,
+                start_date=ensure_z_suffix(window_start.isoformat()),
+                end_date=ensure_z_suffix(window_end.isoformat()),
+                measurements=["sum_value", "count"],
+                interval="day",
+                timezone=account_timezone
+            )
+            if not response or (isinstance(response, dict) and not response.get("data")):
+                return None
+            frames.append(aggregate_frame(response, ["sum_value", "count"]))
+            window_start = window_end
+        
+        if not frames:
+            return None
+        return concat_days(frames).rename(columns={"sum_value": "total_revenue", "count": "orders"})
+    
+    async def _previous_period_totals(
+        self,
+        previous_range: Dict[str, str],
+        previous_daily: Any,
+        flow_ids: List[str],
+        campaign_ids: List[str],
+        conversion_metric_id: str
+    ) -> Dict[str, Any]:
+        """
+        Totals for the previous period, reusing the listings fetched for the current one.
+        
+        Total revenue comes from the already split daily frame; attributed
+        revenue from series reports bounded by the previous period.
+        
+        Values reports only take relative timeframes (last_90_days, ...),
+        which cannot describe the previous period, so there is no totals
+        fallback like the current period has. If a series report returns
+        nothing, flow/campaign/attributed revenue are None and
+        "attributed_available" is False instead of counting as $0.
+        """
+        from ..utils.date_helpers import parse_iso_date
+        
+        total_revenue = float(previous_daily["total_revenue"].sum()) if previous_daily is not None else 0.0
+        
+        flow_revenue = 0.0
+        campaign_revenue = 0.0
+        if flow_ids:
+            responses = await self.flow_stats.get_series(
+                flow_ids,
+                previous_range["start"],
+                previous_range["end"],
+                statistics=["conversion_value"],
+                interval="monthly",
+                conversion_metric_id=conversion_metric_id
+            )
+            if responses:
+                flow_revenue = float(series_report_frame(responses, "conversion_value").sum())
+            else:
+                logger.warning("Previous period flow series report unavailable")
+                flow_revenue = None
+        if campaign_ids:
+            responses = await self.campaign_stats.get_series(
+                campaign_ids,
+                previous_range["start"],
+                previous_range["end"],
+                statistics=["conversion_value"],
+                interval="monthly",
+                conversion_metric_id=conversion_metric_id
+            )
+            if responses:
+                campaign_revenue = float(series_report_frame(responses, "conversion_value").sum())
+            else:
+                logger.warning("Previous period campaign series report unavailable")
+                campaign_revenue = None
+        
+        attributed_available = flow_revenue is not None and campaign_revenue is not None
+        attributed_revenue = flow_revenue + campaign_revenue if attributed_available else None
+        
+        start_dt = parse_iso_date(previous_range["start"])
+        end_dt = parse_iso_date(previous_range["end"])
+        if attributed_available:
+            logger.info(f"Previous period: ${total_revenue:,.2f} total, ${attributed_revenue:,.2f} attributed")
+        else:
+            logger.info(f"Previous period: ${total_revenue:,.2f} total, attributed revenue unavailable")
+        
+        return {
+            "period": {
+                "start_date": start_dt.strftime("%B %d, %Y"),
+                "end_date": end_dt.strftime("%B %d, %Y"),
+                "days": (end_dt - start_dt).days
+            },
+            "totals": {
+                "total_revenue": total_revenue,
+                "attributed_revenue": attributed_revenue,
+                "flow_revenue": flow_revenue,
+                "campaign_revenue": campaign_revenue,
+                "attributed_available": attributed_available
+            }
+        }
+    
     async def _get_recipients_time_series(
         self, 
         flow_ids: List[str],
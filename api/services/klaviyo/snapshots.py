@@ -0,0 +1,149 @@
+"""
+Per-account extraction snapshots for incremental audits.
+
+A repeat audit of the same account mostly asks for data we already pulled:
+the same campaigns and the same closed days of metric aggregates. When
+enabled, each account gets a snapshot directory under
+data/klaviyo_snapshots/<api key hash>/ holding:
+
+- campaigns/<channel>.json: every campaign seen for a channel, plus when it
+  was synced. Follow-up audits only fetch campaigns updated since then.
+- series/<hash>.json: complete daily metric aggregate buckets per query
+  (metric, measurements, grouping, extra filters and timezone). Follow-up
+  audits only query days not already covered by settled buckets.
+
+Days (and campaign updates) closer than SNAPSHOT_SETTLE_MARGIN to the time
+they were fetched are always refetched, since late events and attribution
+can still change them.
+
+Configured with environment variables:
+- KLAVIYO_INCREMENTAL_EXTRACTION: Enable snapshots ("true"/"1", default off)
+- KLAVIYO_SNAPSHOT_DIR: Snapshot directory (default data/klaviyo_snapshots)
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+from datetime import timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Any
+
+logger = logging.getLogger(__name__)
+
+# Data fetched less than this long ago may still change and is refetched
+SNAPSHOT_SETTLE_MARGIN = timedelta(days=2)
+
+
+def _digest(value: Any) -> str:
+    """SHA-256 of a value's canonical JSON encoding."""
+    material = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class AccountSnapshotStore:
+    """Snapshot files for one Klaviyo account."""
+
+    def __init__(self, directory: Path):
+        """
+        Initialize snapshot store.
+
+        Args:
+            directory: Account snapshot directory
+        """
+        self.directory = Path(directory)
+
+    def _read_json(self, path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable snapshot {path.name}: {e}")
+            return None
+
+    def _write_json(self, path: Path, value: Dict[str, Any]):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(value, f, separators=(",", ":"), default=str)
+        os.replace(tmp_path, path)
+
+    async def _load(self, path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            return await asyncio.to_thread(self._read_json, path)
+        except Exception as e:
+            logger.warning(f"Snapshot read failed: {e}")
+            return None
+
+    async def _save(self, path: Path, value: Dict[str, Any]):
+        try:
+            await asyncio.to_thread(self._write_json, path, value)
+        except Exception as e:
+            logger.warning(f"Snapshot write failed: {e}")
+
+    async def load_campaigns(self, channel: str) -> Optional[Dict[str, Any]]:
+        """
+        Load the campaign snapshot for a channel.
+
+        Returns:
+            Dict with "campaigns" and "synced_at" (epoch seconds), or None
+        """
+        return await self._load(self.directory / "campaigns" / f"{channel}.json")
+
+    async def save_campaigns(self, channel: str, campaigns: List[Dict[str, Any]], synced_at: float):
+        """Store every known campaign for a channel."""
+        await self._save(
+            self.directory / "campaigns" / f"{channel}.json",
+            {"channel": channel, "synced_at": synced_at, "campaigns": campaigns}
+        )
+
+    async def load_series(self, signature: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Load stored daily buckets for a metric aggregate query.
+
+        Args:
+            signature: Query attributes identifying the series
+
+        Returns:
+            Dict with "buckets" ([{"start", "end", "fetched_at", "values"}]), or None
+        """
+        return await self._load(self.directory / "series" / f"{_digest(signature)}.json")
+
+    async def save_series(self, signature: Dict[str, Any], buckets: List[Dict[str, Any]]):
+        """Store daily buckets for a metric aggregate query."""
+        await self._save(
+            self.directory / "series" / f"{_digest(signature)}.json",
+            {"signature": signature, "buckets": buckets}
+        )
+
+
+_stores: Dict[str, AccountSnapshotStore] = {}
+
+
+def incremental_extraction_enabled() -> bool:
+    """Whether per-account snapshots are turned on (KLAVIYO_INCREMENTAL_EXTRACTION)."""
+    return os.getenv("KLAVIYO_INCREMENTAL_EXTRACTION", "false").lower() in ("1", "true", "yes")
+
+
+def get_snapshot_store(key_hash: str) -> Optional[AccountSnapshotStore]:
+    """
+    Get the snapshot store for an account.
+
+    Args:
+        key_hash: Hashed API key (see registry.hash_api_key)
+
+    Returns:
+        AccountSnapshotStore, or None if incremental extraction is disabled
+    """
+    if not incremental_extraction_enabled():
+        return None
+    store = _stores.get(key_hash)
+    if store is None:
+        default_dir = Path(__file__).parent.parent.parent.parent / "data" / "klaviyo_snapshots"
+        root = Path(os.getenv("KLAVIYO_SNAPSHOT_DIR", str(default_dir)))
+        store = AccountSnapshotStore(root / key_hash)
+        _stores[key_hash] = store
+    return store
@@ -0,0 +1,317 @@
+"""
+Compact, column-oriented tables of extracted Klaviyo data.
+
+The raw extraction payload keeps Klaviyo's JSON:API shape (one nested dict
+per campaign, flow and reporting row), which every consumer re-walks with
+.get() chains. These tables are built once from that payload:
+
+- CampaignTable: one row per campaign (name, channel, summed statistics)
+- FlowTable: one row per flow (name, status, statistics summed over its messages)
+
+Numeric columns are numpy arrays and text columns are plain lists, so a
+table costs a few arrays instead of thousands of dicts, and aggregates
+(totals, per-channel sums, rates) are vectorized. Building them takes one
+pass over the payload, so they are rebuilt where needed rather than stored
+next to it (which would grow checkpoints). to_dict()/from_dict()
+give a JSON form for callers that do want to persist a table.
+"""
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Reporting statistics kept as counts (summed across a campaign's or flow's messages)
+COUNT_STATISTICS = ("recipients", "delivered", "opens", "clicks", "conversions", "conversion_value")
+
+# Reporting rates kept as counts (rate x recipients), so they can be summed too
+RATE_STATISTICS = {
+    "bounce_rate": "bounced",
+    "unsubscribe_rate": "unsubscribes",
+    "spam_complaint_rate": "spam_complaints",
+}
+
+NUMERIC_COLUMNS = COUNT_STATISTICS + tuple(RATE_STATISTICS.values())
+
+
+def _number(value: Any) -> float:
+    """A statistic as a float (None and junk as 0)."""
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _report_rows(report: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Result rows of a values report (campaign-values-reports / flow-values-reports)."""
+    if not isinstance(report, dict):
+        return []
+    return (report.get("data") or {}).get("attributes", {}).get("results") or []
+
+
+class StatsTable:
+    """Per-item (campaign or flow) statistics as parallel columns."""
+
+    __slots__ = ("ids", "text", "values", "_positions")
+
+    # Text columns of this table type
+    TEXT_COLUMNS: Sequence[str] = ("name",)
+
+    def __init__(
+        self,
+        ids: List[str],
+        text: Optional[Dict[str, List[str]]] = None,
+        values: Optional[Dict[str, np.ndarray]] = None
+    ):
+        """
+        Initialize a table.
+
+        Args:
+            ids: Row IDs
+            text: Text columns (each as long as ids)
+            values: Numeric columns (each as long as ids)
+        """
+        self.ids = list(ids)
+        self.text = {name: list((text or {}).get(name) or [""] * len(self.ids)) for name in self.TEXT_COLUMNS}
+        self.values = {
+            name: np.asarray((values or {}).get(name, np.zeros(len(self.ids))), dtype=float)
+            for name in NUMERIC_COLUMNS
+        }
+        self._positions = {item_id: position for position, item_id in enumerate(self.ids)}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def _build(
+        cls,
+        items: Iterable[Dict[str, Any]],
+        report: Optional[Dict[str, Any]],
+        id_key: str,
+        text_of
+    ) -> "StatsTable":
+        """
+        Build a table from API objects and a values report.
+
+        Args:
+            items: Campaign or flow objects (rows, in order)
+            report: Values report with one result per message
+            id_key: Groupings key holding the row ID (e.g., "campaign_id")
+            text_of: Callable(item, groupings) returning the text columns of a row
+
+        Returns:
+            Table with one row per item, plus rows for reported IDs not in items
+        """
+        ids: List[str] = []
+        text: Dict[str, List[str]] = {name: [] for name in cls.TEXT_COLUMNS}
+        positions: Dict[str, int] = {}
+
+        def add_row(item_id: str, item: Dict[str, Any], groupings: Dict[str, Any]):
+            positions[item_id] = len(ids)
+            ids.append(item_id)
+            for name, value in text_of(item, groupings).items():
+                text[name].append(value or "")
+
+        for item in items:
+            if item.get("id") and item["id"] not in positions:
+                add_row(item["id"], item, {})
+
+        rows = _report_rows(report)
+        row_positions = np.empty(len(rows), dtype=int)
+        matrix = np.zeros((len(rows), len(NUMERIC_COLUMNS)))
+        for index, row in enumerate(rows):
+            groupings = row.get("groupings") or {}
+            item_id = groupings.get(id_key) or row.get("id")
+            if item_id not in positions:
+                add_row(item_id, {}, groupings)
+            row_positions[index] = positions[item_id]
+            statistics = row.get("statistics") or {}
+            recipients = _number(statistics.get("recipients"))
+            for column, name in enumerate(COUNT_STATISTICS):
+                matrix[index, column] = _number(statistics.get(name))
+            for offset, (rate, name) in enumerate(RATE_STATISTICS.items()):
+                matrix[index, len(COUNT_STATISTICS) + offset] = _number(statistics.get(rate)) * recipients
+
+        # Sum message rows into their campaign or flow
+        totals = np.zeros((len(ids), len(NUMERIC_COLUMNS)))
+        np.add.at(totals, row_positions, matrix)
+        return cls(ids, text, {name: totals[:, column] for column, name in enumerate(NUMERIC_COLUMNS)})
+
+    def column(self, name: str) -> Any:
+        """A numeric (array) or text (list) column."""
+        if name in self.values:
+            return self.values[name]
+        return self.text[name]
+
+    def total(self, name: str, mask: Optional[np.ndarray] = None) -> float:
+        """Sum of a numeric column, optionally over masked rows only."""
+        values = self.values[name]
+        return float(values[mask].sum() if mask is not None else values.sum())
+
+    def rate(self, numerator: str, denominator: str = "recipients") -> np.ndarray:
+        """Per-row rate in percent (0 where the denominator is 0)."""
+        top = self.values[numerator]
+        bottom = self.values[denominator]
+        return np.divide(top * 100, bottom, out=np.zeros_like(top), where=bottom > 0)
+
+    def sum_by(self, key: str, name: str) -> Dict[str, float]:
+        """Sum of a numeric column per value of a text column."""
+        labels = np.asarray(self.text[key], dtype=object)
+        groups, inverse = np.unique(labels, return_inverse=True) if len(labels) else ([], [])
+        sums = np.bincount(inverse, weights=self.values[name], minlength=len(groups)) if len(labels) else []
+        return {str(group): float(value) for group, value in zip(groups, sums)}
+
+    def row(self, item_id: str) -> Optional[Dict[str, Any]]:
+        """One row as a dict, or None for an unknown ID."""
+        position = self._positions.get(item_id)
+        if position is None:
+            return None
+        row = {"id": item_id}
+        row.update({name: column[position] for name, column in self.text.items()})
+        row.update({name: float(column[position]) for name, column in self.values.items()})
+        return row
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON form: ids plus one list per column."""
+        return {
+            "ids": self.ids,
+            "text": self.text,
+            "values": {name: column.tolist() for name, column in self.values.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "StatsTable":
+        """Inverse of to_dict()."""
+        data = data or {}
+        return cls(data.get("ids") or [], data.get("text"), data.get("values"))
+
+
+class CampaignTable(StatsTable):
+    """One row per campaign: name, channel and summed statistics."""
+
+    __slots__ = ()
+
+    TEXT_COLUMNS = ("name", "channel")
+
+    @classmethod
+    def from_extraction(
+        cls,
+        campaigns: Iterable[Dict[str, Any]],
+        campaign_statistics: Optional[Dict[str, Any]],
+        channels: Optional[Dict[str, str]] = None
+    ) -> "CampaignTable":
+        """
+        Build the table from extracted campaigns and their values report.
+
+        Args:
+            campaigns: Campaign objects
+            campaign_statistics: campaign-values-reports response
+            channels: Optional campaign ID to channel map (e.g., from per-channel listings)
+
+        Returns:
+            CampaignTable
+        """
+        channels = dict(channels or {})
+        for row in _report_rows(campaign_statistics):
+            groupings = row.get("groupings") or {}
+            if groupings.get("campaign_id") and groupings.get("send_channel"):
+                channels.setdefault(groupings["campaign_id"], groupings["send_channel"])
+
+        def text_of(campaign: Dict[str, Any], groupings: Dict[str, Any]) -> Dict[str, str]:
+            attributes = campaign.get("attributes", {})
+            campaign_id = campaign.get("id") or groupings.get("campaign_id")
+            channel = (
+                channels.get(campaign_id)
+                or (attributes.get("send_options") or {}).get("channel")
+                or attributes.get("channel")
+                or "email"
+            )
+            return {"name": attributes.get("name", ""), "channel": str(channel).lower()}
+
+        return cls._build(campaigns, campaign_statistics, "campaign_id", text_of)
+
+    def revenue_by_channel(self) -> Dict[str, float]:
+        """Conversion value per send channel (email, sms, push always present)."""
+        revenue = {"email": 0.0, "sms": 0.0, "push": 0.0}
+        revenue.update(self.sum_by("channel", "conversion_value"))
+        return revenue
+
+
+class FlowTable(StatsTable):
+    """One row per flow: name, status and statistics summed over its messages."""
+
+    __slots__ = ()
+
+    TEXT_COLUMNS = ("name", "status")
+
+    @classmethod
+    def from_extraction(
+        cls,
+        flows: Iterable[Dict[str, Any]],
+        flow_statistics: Optional[Dict[str, Any]]
+    ) -> "FlowTable":
+        """
+        Build the table from extracted flows and their values report.
+
+        Args:
+            flows: Flow objects
+            flow_statistics: flow-values-reports response
+
+        Returns:
+            FlowTable
+        """
+        def text_of(flow: Dict[str, Any], groupings: Dict[str, Any]) -> Dict[str, str]:
+            attributes = flow.get("attributes", {})
+            return {"name": attributes.get("name", ""), "status": attributes.get("status", "")}
+
+        return cls._build(flows, flow_statistics, "flow_id", text_of)
+
+
+class ExtractedData:
+    """Campaign and flow tables for one extraction."""
+
+    __slots__ = ("campaigns", "flows")
+
+    def __init__(self, campaigns: CampaignTable, flows: FlowTable):
+        self.campaigns = campaigns
+        self.flows = flows
+
+    @classmethod
+    def from_raw(cls, raw_data: Dict[str, Any]) -> "ExtractedData":
+        """
+        Build the tables from an extract_all_data() payload.
+
+        Args:
+            raw_data: Extraction payload (JSON:API shaped)
+
+        Returns:
+            ExtractedData
+        """
+        channels = {}
+        for channel in ("email", "sms", "push"):
+            for campaign in raw_data.get(f"{channel}_campaigns") or []:
+                channels[campaign.get("id")] = channel
+        return cls(
+            CampaignTable.from_extraction(
+                raw_data.get("campaigns") or [],
+                raw_data.get("campaign_statistics"),
+                channels
+            ),
+            FlowTable.from_extraction(raw_data.get("flows") or [], raw_data.get("flow_statistics"))
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON form of all tables."""
+        return {
+            "campaigns": self.campaigns.to_dict(),
+            "flows": self.flows.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ExtractedData":
+        """Inverse of to_dict()."""
+        return cls(
+            CampaignTable.from_dict(data.get("campaigns")),
+            FlowTable.from_dict(data.get("flows"))
+        )
@@ -21,6 +21,9 @@ import json
 from typing import Dict, Any, Optional, Literal, List
 from datetime import datetime
 
+from .registry import get_llm_service, shared_chat_client
+from .response_cache import get_llm_response_cache
+
 logger = logging.getLogger(__name__)
 
 # Try to import Pydantic for structured output
@@ -64,7 +67,8 @@ class LLMService:
             claude_model: Claude model name (e.g., "claude-sonnet-4-5")
             openai_model: OpenAI model name (e.g., "gpt-4o")
             gemini_model: Gemini model name (e.g., "gemini-2.0-flash-exp")
-            llm_config: Optional dict with LLM configuration (overrides individual params)
+            llm_config: Optional dict with LLM configuration (overrides individual params).
+                "bypass_cache": True skips the LLM response cache for this service.
         """
         # If llm_config is provided, use it to override individual params
         if llm_config:
@@ -83,6 +87,7 @@ class LLMService:
         self.claude_model = claude_model
         self.openai_model = openai_model
         self.gemini_model = gemini_model
+        self.bypass_cache = bool(llm_config.get("bypass_cache")) if llm_config else False
         
         # Initialize LLM clients (will be created dynamically when needed)
         # This allows each request to use its own API keys from the UI
@@ -107,7 +112,8 @@ class LLMService:
         section: str,
         data: Dict[str, Any],
         context: Optional[Dict[str, Any]] = None,
-        provider: Optional[LLMProvider] = None
+        provider: Optional[LLMProvider] = None,
+        use_cache: Optional[bool] = None
     ) -> Dict[str, Any]:
         """
         Generate strategic insights for a specific audit section.
@@ -117,6 +123,8 @@ class LLMService:
             data: Formatted data for the section
             context: Additional context (industry, benchmarks, etc.)
             provider: LLM provider to use (defaults to self.default_provider)
+            use_cache: Whether to reuse a cached response for an identical prompt
+                (defaults to on unless the service was configured with bypass_cache)
             
         Returns:
             Dict with insights, typically:
@@ -144,12 +152,30 @@ class LLMService:
             logger.error("No LLM clients available. Returning fallback response.")
             return self._get_fallback_response(section, data)
         
+        # Identical prompts to the same model and temperature reuse the stored response
+        if use_cache is None:
+            use_cache = not self.bypass_cache
+        cache = get_llm_response_cache() if use_cache else None
+        cache_key = None
+        if cache is not None:
+            cache_key = cache.make_key(
+                provider,
+                getattr(client, "model", None) or getattr(client, "model_name", None),
+                getattr(client, "temperature", None),
+                prompt
+            )
+        
         try:
-            # Invoke LLM
-            response = await client.ainvoke(prompt)
-            
-            # Parse response
-            content = response.content if hasattr(response, 'content') else str(response)
+            content = await cache.get(cache_key) if cache_key else None
+            cached = content is not None
+            if cached:
+                logger.info(f"✓ Reusing cached LLM response for {section}")
+            else:
+                # Invoke LLM
+                response = await client.ainvoke(prompt)
+                
+                # Parse response
+                content = response.content if hasattr(response, 'content') else str(response)
             
             # Log raw response for debugging (first 500 chars)
             logger.info(f"Raw LLM response for {section} (first 500 chars):\n{content[:500]}")
@@ -303,6 +329,9 @@ class LLMService:
                         # Primary is a string but doesn't start with {, so it's already text
                         pass  # No action needed, already valid text
             
+            # Only fresh responses are stored, so a hit does not extend the entry's TTL
+            if cache_key and not cached:
+                await cache.set(cache_key, section, content)
             logger.info(f"✓ Generated {section} insights using {provider}")
             return insights
             
@@ -311,18 +340,24 @@ class LLMService:
             return self._get_fallback_response(section, data)
     
     def _get_client(self, provider: LLMProvider):
-        """Get or create LLM client for provider using API keys from instance."""
+        """Get LLM client for provider using API keys from instance (shared process-wide, see registry.py)."""
         if provider == "claude":
             if not self._claude_client and self.anthropic_api_key:
-                self._claude_client = self._create_claude_client()
+                self._claude_client = shared_chat_client(
+                    "claude", self.anthropic_api_key, self.claude_model, self._create_claude_client
+                )
             return self._claude_client
         elif provider == "openai":
             if not self._openai_client and self.openai_api_key:
-                self._openai_client = self._create_openai_client()
+                self._openai_client = shared_chat_client(
+                    "openai", self.openai_api_key, self.openai_model, self._create_openai_client
+                )
             return self._openai_client
         elif provider == "gemini":
             if not self._gemini_client and self.gemini_api_key:
-                self._gemini_client = self._create_gemini_client()
+                self._gemini_client = shared_chat_client(
+                    "gemini", self.gemini_api_key, self.gemini_model, self._create_gemini_client
+                )
             return self._gemini_client
         else:
             return None
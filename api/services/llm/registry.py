@@ -0,0 +1,131 @@
+"""
+Process-wide registry of LLM clients and services.
+
+Building a LangChain chat model (ChatAnthropic, ChatOpenAI, ...) creates its
+own SDK client and HTTP connection pool. Audit jobs prepare a dozen report
+sections and chat sessions make one call per turn, all with the same API
+key and model, so clients are built once per (provider, API key, model) and
+reused by every LLMService in the process.
+
+LLMService instances are shared the same way: get_llm_service() returns one
+service per LLM configuration, so all sections of a job (and every chat turn
+for a report) use the same instance and its already-built clients.
+
+API keys are only stored as SHA-256 hashes. Both caches are bounded LRUs so
+keys supplied by many users over time do not accumulate.
+"""
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Maximum cached chat clients / services (least recently used are dropped)
+MAX_CACHED_CLIENTS = 32
+MAX_CACHED_SERVICES = 32
+
+_clients: "OrderedDict[str, Any]" = OrderedDict()
+_services: "OrderedDict[str, Any]" = OrderedDict()
+_lock = threading.RLock()
+
+
+def _hash(value: Optional[str]) -> str:
+    """Stable, non-reversible identifier for an API key."""
+    return hashlib.sha256(value.encode("utf-8")).hexdigest() if value else ""
+
+
+def _remember(cache: "OrderedDict[str, Any]", key: str, value: Any, limit: int):
+    """Store a value as most recently used, evicting the oldest beyond limit."""
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > limit:
+        cache.popitem(last=False)
+
+
+def shared_chat_client(
+    provider: str,
+    api_key: str,
+    model: Optional[str],
+    create: Callable[[], Any]
+) -> Any:
+    """
+    Get the shared chat client for a provider, API key and model.
+
+    Args:
+        provider: "claude", "openai" or "gemini"
+        api_key: Provider API key
+        model: Configured model name (None for the provider default)
+        create: Builds the client when none is cached; may return None on failure
+
+    Returns:
+        Chat client, or None if it could not be created (failures are not cached)
+    """
+    key = f"{provider}:{_hash(api_key)}:{model or ''}"
+    with _lock:
+        client = _clients.get(key)
+        if client is not None:
+            _clients.move_to_end(key)
+            return client
+
+        client = create()
+        if client is not None:
+            _remember(_clients, key, client, MAX_CACHED_CLIENTS)
+        return client
+
+
+def _config_key(llm_config: Dict[str, Any]) -> str:
+    """Cache key for an LLM configuration (API keys hashed)."""
+    fingerprint = {
+        "provider": llm_config.get("provider") or "claude",
+        "anthropic_api_key": _hash(llm_config.get("anthropic_api_key")),
+        "openai_api_key": _hash(llm_config.get("openai_api_key")),
+        "gemini_api_key": _hash(llm_config.get("gemini_api_key")),
+        "claude_model": llm_config.get("claude_model"),
+        "openai_model": llm_config.get("openai_model"),
+        "gemini_model": llm_config.get("gemini_model"),
+        "bypass_cache": bool(llm_config.get("bypass_cache")),
+    }
+    return json.dumps(fingerprint, sort_keys=True)
+
+
+def get_llm_service(llm_config: Optional[Dict[str, Any]] = None):
+    """
+    Get the shared LLMService for an LLM configuration.
+
+    Equivalent to LLMService(llm_config=llm_config) but reuses the instance
+    (and its chat clients) for identical configurations, so callers no longer
+    construct services on the hot path.
+
+    Args:
+        llm_config: Dict with provider, *_api_key and *_model entries (missing
+            keys fall back to environment variables, as in LLMService)
+
+    Returns:
+        Shared LLMService instance
+    """
+    from . import LLMService
+
+    llm_config = llm_config or {}
+    key = _config_key(llm_config)
+    with _lock:
+        service = _services.get(key)
+        if service is not None:
+            _services.move_to_end(key)
+            return service
+
+        service = LLMService(
+            default_provider=llm_config.get("provider", "claude"),
+            llm_config=llm_config or None
+        )
+        _remember(_services, key, service, MAX_CACHED_SERVICES)
+        return service
+
+
+def clear():
+    """Drop all cached clients and services (e.g., after rotating API keys)."""
+    with _lock:
+        _clients.clear()
+        _services.clear()
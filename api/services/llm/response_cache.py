@@ -0,0 +1,132 @@
+"""
+Deterministic on-disk cache of LLM responses.
+
+Regenerating a report after a template or CSS change renders exactly the
+same prompt for every section. LLMService.generate_insights looks the
+prompt up here first, so a re-render with unchanged data makes no LLM calls.
+
+Entries are JSON files under data/llm_cache/, named by the SHA-256 of
+(provider, model, temperature, rendered prompt). Only responses that parsed
+into valid insights are stored, so a malformed answer is asked again next
+time. API keys are not part of the key and never touch disk.
+
+- Entries expire after LLM_RESPONSE_CACHE_TTL seconds from when they were
+  stored; reading an entry does not extend it.
+- Total size is bounded; least recently used entries are evicted first
+  (storage and eviction are shared with the Klaviyo cache, see disk_cache.py).
+- Callers can skip the cache per request (generate_insights(use_cache=False)
+  or "bypass_cache" in llm_config).
+
+Configured with environment variables:
+- LLM_RESPONSE_CACHE: Enable the cache ("true"/"1", default on)
+- LLM_RESPONSE_CACHE_DIR: Cache directory (default data/llm_cache)
+- LLM_RESPONSE_CACHE_TTL: Seconds an entry stays valid (default 7 days)
+- LLM_RESPONSE_CACHE_MAX_MB: Size bound in megabytes (default 100)
+"""
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from ..disk_cache import DiskLRUCache
+
+logger = logging.getLogger(__name__)
+
+
+class LLMResponseCache(DiskLRUCache):
+    """Size-bounded LRU cache of raw LLM response text stored on disk."""
+
+    label = "LLM response cache"
+
+    def __init__(self, directory: Path, max_bytes: int, ttl_seconds: float):
+        """
+        Initialize LLM response cache.
+
+        Args:
+            directory: Directory holding cache entries
+            max_bytes: Total size bound; LRU entries are evicted beyond it
+            ttl_seconds: Seconds an entry stays valid
+        """
+        super().__init__(directory, max_bytes)
+        self.ttl_seconds = ttl_seconds
+
+    @staticmethod
+    def make_key(provider: str, model: Optional[str], temperature: Optional[float], prompt: Any) -> str:
+        """
+        Content address of an LLM call.
+
+        Args:
+            provider: "claude", "openai" or "gemini"
+            model: Model the client was built with
+            temperature: Sampling temperature of the client
+            prompt: Rendered prompt (from get_prompt_template)
+
+        Returns:
+            Hex SHA-256 digest
+        """
+        material = json.dumps({
+            "provider": provider,
+            "model": model,
+            "temperature": temperature,
+            "prompt": hashlib.sha256(str(prompt).encode("utf-8")).hexdigest()
+        }, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    async def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached response.
+
+        Returns:
+            Raw response text, or None on a miss or expired entry
+        """
+        entry = await self.get_entry(key)
+        return entry.get("content") if entry else None
+
+    async def set(self, key: str, section: str, content: str):
+        """
+        Store a response.
+
+        Args:
+            key: Content address (see make_key)
+            section: Prompt section, kept in the entry for debugging
+            content: Raw response text
+        """
+        now = time.time()
+        await self.set_entry(key, {
+            "section": section,
+            "stored_at": now,
+            "expires_at": now + self.ttl_seconds,
+            "content": content
+        })
+
+
+_llm_response_cache: Optional[LLMResponseCache] = None
+
+
+def llm_response_cache_enabled() -> bool:
+    """Whether the LLM response cache is turned on (LLM_RESPONSE_CACHE)."""
+    return os.getenv("LLM_RESPONSE_CACHE", "true").lower() in ("1", "true", "yes")
+
+
+def get_llm_response_cache() -> Optional[LLMResponseCache]:
+    """
+    Get the process-wide LLM response cache.
+
+    Returns:
+        LLMResponseCache, or None if the cache is disabled
+    """
+    global _llm_response_cache
+
+    if not llm_response_cache_enabled():
+        return None
+    if _llm_response_cache is None:
+        default_dir = Path(__file__).parent.parent.parent.parent / "data" / "llm_cache"
+        directory = Path(os.getenv("LLM_RESPONSE_CACHE_DIR", str(default_dir)))
+        max_bytes = int(float(os.getenv("LLM_RESPONSE_CACHE_MAX_MB", "100")) * 1024 * 1024)
+        ttl_seconds = float(os.getenv("LLM_RESPONSE_CACHE_TTL", str(7 * 24 * 3600)))
+        _llm_response_cache = LLMResponseCache(directory, max_bytes, ttl_seconds)
+        logger.info(f"LLM response cache enabled at {directory}")
+    return _llm_response_cache
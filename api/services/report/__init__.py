@@ -12,7 +12,9 @@ from jinja2 import Environment, FileSystemLoader
 from datetime import datetime
 import json
 import asyncio
+import os
 import platform
+import time
 
 # Import modular components
 from .formatters import (
@@ -39,6 +41,12 @@ from .data_preparers import (
 from .pdf_generator import generate_pdf_weasyprint, generate_pdf_playwright
 
 
+def _llm_concurrency(llm_config: Optional[Dict[str, Any]] = None) -> int:
+    """Maximum section preparers calling the LLM at once (llm_config "max_concurrency" or REPORT_LLM_CONCURRENCY)."""
+    configured = (llm_config or {}).get("max_concurrency") or os.getenv("REPORT_LLM_CONCURRENCY", "4")
+    return max(1, int(configured))
+
+
 class EnhancedReportService:
     """
     Enhanced report generation matching consultant-quality audits.
@@ -154,7 +162,8 @@ class EnhancedReportService:
         auditor_name: Optional[str] = None,
         client_code: Optional[str] = None,
         industry: Optional[str] = None,
-        llm_config: Optional[Dict[str, Any]] = None
+        llm_config: Optional[Dict[str, Any]] = None,
+        checkpoints: Optional[Any] = None
     ) -> Dict[str, Any]:
         """
         Generate a professional comprehensive audit report.
@@ -167,10 +176,20 @@ class EnhancedReportService:
             client_name: Name of the client being audited
             auditor_name: Name of auditor (defaults to "Andzen Team")
             client_code: Optional Andzen client code
+            llm_config: Optional LLM settings passed to the section preparers;
+                "max_concurrency" caps concurrent LLM calls (default REPORT_LLM_CONCURRENCY)
+            checkpoints: Optional JobCheckpoints. Each prepared section ("sections.<name>"),
+                the rendered HTML ("report.render") and the PDF/Word files are saved as
+                they complete and reused when an interrupted job is resumed.
         
         Returns:
             Dict with report_url, pdf_url (if available), and report_data
         """
+        async def stage(name: str, produce):
+            if checkpoints is None:
+                return await produce()
+            return await checkpoints.run(name, produce)
+        
         # Load the main audit report template
         template = self.env.get_template("audit_report.html")
         
@@ -203,38 +222,41 @@ class EnhancedReportService:
         if llm_config:
             account_context["llm_config"] = llm_config
         
-        # Prepare full context with all section data using modular preparers
-        context = {
-            # Cover page
-            "cover_data": cover_data,
-            
-            # CSS content for embedding
-            "css_content": css_content,
-            "client_name": client_name,
-            
+        # Section preparers only depend on audit_data, so they run concurrently (each is
+        # one LLM round trip); at most llm_concurrency of them call the LLM at a time
+        llm_concurrency = _llm_concurrency(llm_config)
+        llm_slots = asyncio.Semaphore(llm_concurrency)
+        
+        def bounded(produce):
+            async def run():
+                async with llm_slots:
+                    return await produce()
+            return run
+        
+        section_preparers = {
             # KAV Analysis (Pages 2-3)
-            "kav_data": await prepare_kav_data(
+            "kav_data": lambda: prepare_kav_data(
                 audit_data.get("kav_data", {}), 
                 client_name,
                 account_context=account_context
             ),
             
             # List Growth (Page 4)
-            "list_growth_data": await prepare_list_growth_data(
+            "list_growth_data": lambda: prepare_list_growth_data(
                 audit_data.get("list_growth_data", {}),
                 client_name,
                 account_context
             ),
 
             # Data Capture (Pages 5-6)
-            "data_capture_data": await prepare_data_capture_data(
+            "data_capture_data": lambda: prepare_data_capture_data(
                 audit_data.get("data_capture_data", {}),
                 client_name,
                 account_context
             ),
 
             # Automation Overview (Page 7)
-            "automation_overview_data": await prepare_automation_data(
+            "automation_overview_data": lambda: prepare_automation_data(
                 audit_data.get("automation_overview_data", {}),
                 benchmarks,
                 client_name,
@@ -242,7 +264,7 @@ class EnhancedReportService:
             ),
 
             # Welcome Series (Page 8)
-            "welcome_flow_data": await prepare_flow_data(
+            "welcome_flow_data": lambda: prepare_flow_data(
                 audit_data.get("welcome_flow_data", {}),
                 "welcome_series",
                 benchmarks,
@@ -251,7 +273,7 @@ class EnhancedReportService:
             ),
 
             # Abandoned Cart (Pages 9-10)
-            "abandoned_cart_data": await prepare_abandoned_cart_data(
+            "abandoned_cart_data": lambda: prepare_abandoned_cart_data(
                 audit_data.get("abandoned_cart_data", {}),
                 benchmarks,
                 client_name,
@@ -259,7 +281,7 @@ class EnhancedReportService:
             ),
 
             # Browse Abandonment (Page 11)
-            "browse_abandonment_data": await prepare_browse_abandonment_data(
+            "browse_abandonment_data": lambda: prepare_browse_abandonment_data(
                 audit_data.get("browse_abandonment_data", {}),
                 benchmarks,
                 client_name,
@@ -267,21 +289,15 @@ class EnhancedReportService:
             ),
 
             # Post Purchase (Pages 12-13)
-            "post_purchase_data": await prepare_post_purchase_data(
+            "post_purchase_data": lambda: prepare_post_purchase_data(
                 audit_data.get("post_purchase_data", {}),
                 benchmarks,
                 client_name,
                 account_context
             ),
 
-            # Reviews (Page 14)
-            "reviews_data": audit_data.get("reviews_data", {}),
-
-            # Wishlist (Pages 15-16)
-            "wishlist_data": audit_data.get("wishlist_data", {}),
-
             # Campaign Performance (Page 17)
-            "campaign_performance_data": await prepare_campaign_performance_data(
+            "campaign_performance_data": lambda: prepare_campaign_performance_data(
                 audit_data.get("campaign_performance_data", {}),
                 benchmarks,
                 client_name,
@@ -289,6 +305,33 @@ class EnhancedReportService:
             ),
         }
         
+        # Checkpointed sections are restored without waiting for an LLM slot
+        started = time.monotonic()
+        prepared_sections = await asyncio.gather(*[
+            stage(f"sections.{name}", bounded(produce))
+            for name, produce in section_preparers.items()
+        ])
+        print(f"✓ Prepared {len(section_preparers)} report sections in {time.monotonic() - started:.1f}s "
+              f"({llm_concurrency} concurrent)")
+        
+        # Prepare full context with all section data using modular preparers
+        context = {
+            # Cover page
+            "cover_data": cover_data,
+            
+            # CSS content for embedding
+            "css_content": css_content,
+            "client_name": client_name,
+            
+            **dict(zip(section_preparers, prepared_sections)),
+
+            # Reviews (Page 14)
+            "reviews_data": audit_data.get("reviews_data", {}),
+
+            # Wishlist (Pages 15-16)
+            "wishlist_data": audit_data.get("wishlist_data", {}),
+        }
+        
         # Add segmentation data AFTER campaign_performance_data is prepared
         # Get segmentation recommendation from campaign performance data
         campaign_segmentation = context.get("campaign_performance_data", {}).get("segmentation_recommendation", {})
@@ -311,28 +354,100 @@ class EnhancedReportService:
         # Phase 3: Strategic Recommendations (Enhanced Intelligence)
         # Pass prepared context so strategic thesis can access kav_interpretation, pattern_diagnosis, etc.
         # Must be added AFTER context is fully built
-        context["strategic_recommendations_data"] = await prepare_strategic_recommendations(audit_data, prepared_context=context)
+        context["strategic_recommendations_data"] = await stage(
+            "sections.strategic_recommendations_data",
+            lambda: prepare_strategic_recommendations(audit_data, prepared_context=context)
+        )
         
         # Add data for new sections
         context["why_andzen_data"] = {"show": True}  # Always show Why Andzen section
         context["next_steps_data"] = {"show": True}  # Always show Next Steps section
         
-        # Render HTML
-        html_content = template.render(**context)
+        # Render HTML (reusing the file written before an interruption, if it is still there)
+        rendered = await checkpoints.load("report.render") if checkpoints is not None else None
+        if rendered and Path(rendered["html_path"]).exists():
+            output_path = Path(rendered["html_path"])
+            filename = rendered["filename"]
+            with open(output_path, "r", encoding="utf-8") as f:
+                html_content = f.read()
+        else:
+            html_content = template.render(**context)
+            
+            # Save report
+            output_dir = Path(__file__).parent.parent.parent / "data" / "reports"
+            output_dir.mkdir(parents=True, exist_ok=True)
+            
+            client_slug = client_name.replace(" ", "_").replace("'", "")
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            filename = f"audit_{client_slug}_{timestamp}.html"
+            output_path = output_dir / filename
+            
+            with open(output_path, "w", encoding="utf-8") as f:
+                f.write(html_content)
+            
+            if checkpoints is not None:
+                await checkpoints.save("report.render", {"html_path": str(output_path), "filename": filename})
         
-        # Save report
-        output_dir = Path(__file__).parent.parent.parent / "data" / "reports"
-        output_dir.mkdir(parents=True, exist_ok=True)
+        # PDF and Word files are optional; only successful outputs are checkpointed
+        pdf_path = await self._restore_output(checkpoints, "report.pdf")
+        if pdf_path is None:
+            pdf_path = await self._generate_pdf(output_path)
+            if pdf_path and checkpoints is not None:
+                await checkpoints.save("report.pdf", {"path": str(pdf_path)})
         
-        client_slug = client_name.replace(" ", "_").replace("'", "")
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"audit_{client_slug}_{timestamp}.html"
-        output_path = output_dir / filename
+        # Generate Word document if possible
+        word_path = await self._restore_output(checkpoints, "report.word")
+        if word_path is None:
+            try:
+                word_path = await self._generate_word_document(output_path, html_content)
+                if word_path:
+                    print("✓ Word document generated")
+                    if checkpoints is not None:
+                        await checkpoints.save("report.word", {"path": str(word_path)})
+            except Exception as e:
+                print(f"⚠ Word document generation skipped: {e}")
         
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(html_content)
+        return {
+            "html_url": str(output_path),
+            "pdf_url": str(pdf_path) if pdf_path else None,
+            "word_url": str(word_path) if word_path else None,
+            "html_content": html_content,  # Include HTML content for inline display
+            "filename": filename,
+            "pages": 19,
+            "sections": [
+                "Cover Page",
+                "KAV Analysis", 
+                "List Growth",
+                "Data Capture",
+                "Automation Overview",
+                "Welcome Series",
+                "Abandoned Cart",
+                "Browse Abandonment",
+                "Post Purchase",
+                "Reviews",
+                "Wishlist",
+                "Campaign Performance",
+                "Segmentation Strategy",
+                "Strategic Recommendations"
+            ]
+        }
+    
+    async def _restore_output(self, checkpoints: Optional[Any], stage: str) -> Optional[Path]:
+        """Path of an output file saved by an earlier run of this job, if it still exists."""
+        if checkpoints is None:
+            return None
+        saved = await checkpoints.load(stage)
+        if saved and saved.get("path") and Path(saved["path"]).exists():
+            return Path(saved["path"])
+        return None
+    
+    async def _generate_pdf(self, output_path: Path) -> Optional[Path]:
+        """
+        Generate a PDF from the rendered HTML report.
         
-        # Attempt PDF generation with proper error handling
+        Uses Playwright first on Windows and WeasyPrint first elsewhere, falling
+        back to the other. PDF output is optional, so failures return None.
+        """
         pdf_path = None
         
         try:
@@ -381,39 +496,7 @@ class EnhancedReportService:
             print(f"⚠ PDF generation encountered an error (continuing without PDF): {e}")
             pdf_path = None
         
-        # Generate Word document if possible
-        word_path = None
-        try:
-            word_path = await self._generate_word_document(output_path, html_content)
-            if word_path:
-                print("✓ Word document generated")
-        except Exception as e:
-            print(f"⚠ Word document generation skipped: {e}")
-        
-        return {
-            "html_url": str(output_path),
-            "pdf_url": str(pdf_path) if pdf_path else None,
-            "word_url": str(word_path) if word_path else None,
-            "html_content": html_content,  # Include HTML content for inline display
-            "filename": filename,
-            "pages": 19,
-            "sections": [
-                "Cover Page",
-                "KAV Analysis", 
-                "List Growth",
-                "Data Capture",
-                "Automation Overview",
-                "Welcome Series",
-                "Abandoned Cart",
-                "Browse Abandonment",
-                "Post Purchase",
-                "Reviews",
-                "Wishlist",
-                "Campaign Performance",
-                "Segmentation Strategy",
-                "Strategic Recommendations"
-            ]
-        }
+        return pdf_path
     
     async def _generate_word_document(self, html_path: Path, html_content: str) -> Optional[Path]:
         """
@@ -289,22 +289,12 @@ async def prepare_campaign_performance_data(
     
     # Try to use LLM service for insights
     try:
-        from ...llm import LLMService
+        from ...llm import get_llm_service
         from ...llm.formatter import LLMDataFormatter
         
-        # Initialize LLM service with config from account_context if available
+        # Shared LLM service for the config from account_context (see llm/registry.py)
         llm_config = account_context.get("llm_config", {}) if account_context else {}
-        default_provider = llm_config.get("provider", "claude")
-        llm_service = LLMService(
-            default_provider=default_provider,
-            anthropic_api_key=llm_config.get("anthropic_api_key"),
-            openai_api_key=llm_config.get("openai_api_key"),
-            gemini_api_key=llm_config.get("gemini_api_key"),
-            claude_model=llm_config.get("claude_model"),
-            openai_model=llm_config.get("openai_model"),
-            gemini_model=llm_config.get("gemini_model"),
-            llm_config=llm_config if llm_config else None
-        )
+        llm_service = get_llm_service(llm_config)
         
         # Get industry from account_context
         industry = account_context.get("industry", "retail") if account_context else "retail"
@@ -259,21 +259,12 @@ async def _generate_executive_insights(
     """Generate executive insights using LLM if available."""
     
     try:
-        from ...llm import LLMService
+        from ...llm import get_llm_service
         from ...llm.formatter import LLMDataFormatter
         
         # Initialize LLM service
         llm_config = account_context.get("llm_config", {}) if account_context else {}
-        llm_service = LLMService(
-            default_provider=llm_config.get("provider", "claude"),
-            anthropic_api_key=llm_config.get("anthropic_api_key"),
-            openai_api_key=llm_config.get("openai_api_key"),
-            gemini_api_key=llm_config.get("gemini_api_key"),
-            claude_model=llm_config.get("claude_model"),
-            openai_model=llm_config.get("openai_model"),
-            gemini_model=llm_config.get("gemini_model"),
-            llm_config=llm_config if llm_config else None
-        )
+        llm_service = get_llm_service(llm_config)
         
         # Format audit data for LLM
         formatted_data = LLMDataFormatter.format_for_generic_analysis(
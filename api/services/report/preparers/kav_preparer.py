@@ -128,22 +128,12 @@ async def prepare_kav_data(
     
     # Try to use LLM service for insights
     try:
-        from ...llm import LLMService
+        from ...llm import get_llm_service
         from ...llm.formatter import LLMDataFormatter
         
-        # Initialize LLM service with config from account_context if available
+        # Shared LLM service for the config from account_context (see llm/registry.py)
         llm_config = account_context.get("llm_config", {}) if account_context else {}
-        default_provider = llm_config.get("provider", "claude")
-        llm_service = LLMService(
-            default_provider=default_provider,
-            anthropic_api_key=llm_config.get("anthropic_api_key"),
-            openai_api_key=llm_config.get("openai_api_key"),
-            gemini_api_key=llm_config.get("gemini_api_key"),
-            claude_model=llm_config.get("claude_model"),
-            openai_model=llm_config.get("openai_model"),
-            gemini_model=llm_config.get("gemini_model"),
-            llm_config=llm_config if llm_config else None
-        )
+        llm_service = get_llm_service(llm_config)
         
         # Get industry from account_context if available
         industry = account_context.get("industry", "retail") if account_context else "retail"
@@ -293,7 +283,8 @@ async def prepare_kav_data(
     # We don't have flow/campaign breakdown for previous period, so we'll estimate
     # based on current period percentages or set growth to 0
     if previous_period:
-        previous_attributed_revenue = previous_period.get("attributed_revenue", 0)
+        # None when the previous period's attributed revenue could not be fetched
+        previous_attributed_revenue = previous_period.get("attributed_revenue") or 0
         # Estimate previous flow/campaign revenue using current percentages
         # This is an approximation - ideally we'd fetch previous period breakdown
         if attributed_revenue > 0 and previous_attributed_revenue > 0:
@@ -108,18 +108,9 @@ Return only the JSON object, no additional text."""
     if not llm_service:
         account_context = all_audit_data.get("account_context", {})
         llm_config = account_context.get("llm_config", {}) if account_context else {}
-        from ...llm import LLMService
+        from ...llm import get_llm_service
         
-        llm_service = LLMService(
-            default_provider=llm_config.get("provider", "claude"),
-            anthropic_api_key=llm_config.get("anthropic_api_key"),
-            openai_api_key=llm_config.get("openai_api_key"),
-            gemini_api_key=llm_config.get("gemini_api_key"),
-            claude_model=llm_config.get("claude_model"),
-            openai_model=llm_config.get("openai_model"),
-            gemini_model=llm_config.get("gemini_model"),
-            llm_config=llm_config if llm_config else None
-        )
+        llm_service = get_llm_service(llm_config)
     
     try:
         # Log the prompt for debugging
@@ -343,22 +334,12 @@ async def prepare_strategic_recommendations(audit_data: Dict[str, Any], prepared
     
     # Try to use LLM service for insights
     try:
-        from ...llm import LLMService
+        from ...llm import get_llm_service
         from ...llm.formatter import LLMDataFormatter
         
-        # Initialize LLM service with config from account_context if available
+        # Shared LLM service for the config from account_context (see llm/registry.py)
         llm_config = account_context.get("llm_config", {}) if account_context else {}
-        default_provider = llm_config.get("provider", "claude")
-        llm_service = LLMService(
-            default_provider=default_provider,
-            anthropic_api_key=llm_config.get("anthropic_api_key"),
-            openai_api_key=llm_config.get("openai_api_key"),
-            gemini_api_key=llm_config.get("gemini_api_key"),
-            claude_model=llm_config.get("claude_model"),
-            openai_model=llm_config.get("openai_model"),
-            gemini_model=llm_config.get("gemini_model"),
-            llm_config=llm_config if llm_config else None
-        )
+        llm_service = get_llm_service(llm_config)
         
         # Format data for LLM - use format_for_generic_analysis for strategic recommendations
         formatted_data = LLMDataFormatter.format_for_generic_analysis(
@@ -500,17 +481,8 @@ async def prepare_strategic_recommendations(audit_data: Dict[str, Any], prepared
             # Try to get LLM service from account_context if available
             account_context = audit_data.get("account_context", {})
             llm_config = account_context.get("llm_config", {}) if account_context else {}
-            from ...llm import LLMService
-            thesis_llm_service = LLMService(
-                default_provider=llm_config.get("provider", "claude"),
-                anthropic_api_key=llm_config.get("anthropic_api_key"),
-                openai_api_key=llm_config.get("openai_api_key"),
-                gemini_api_key=llm_config.get("gemini_api_key"),
-                claude_model=llm_config.get("claude_model"),
-                openai_model=llm_config.get("openai_model"),
-                gemini_model=llm_config.get("gemini_model"),
-                llm_config=llm_config if llm_config else None
-            )
+            from ...llm import get_llm_service
+            thesis_llm_service = get_llm_service(llm_config)
             strategic_thesis = await generate_strategic_thesis(thesis_data_source, thesis_llm_service, prepared_context)
         except Exception as e:
             logger.warning(f"Failed to generate strategic thesis: {e}")
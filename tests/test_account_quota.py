@@ -0,0 +1,27 @@
+"""
+Tests for per-job usage accounting on a shared Klaviyo account quota.
+"""
+from api.services.klaviyo.registry import AccountQuota
+
+
+def test_untagged_requests_are_not_recorded():
+    quota = AccountQuota("account-hash")
+    quota.record_request(None)
+    quota.record_request("job-1")
+    quota.record_request("job-1", rate_limited=True)
+
+    assert list(quota.job_usage) == ["job-1"]
+    report = quota.job_report("job-1")
+    assert report["requests"] == 2
+    assert report["rate_limited"] == 1
+    assert report["share_of_account"] == 1.0
+
+
+def test_released_jobs_stop_counting_towards_the_account():
+    quota = AccountQuota("account-hash")
+    quota.record_request("job-1")
+    quota.record_request("job-2")
+
+    assert quota.release_job("job-1")["share_of_account"] == 0.5
+    assert quota.job_report("job-2")["share_of_account"] == 1.0
+    assert quota.job_usage.keys() == {"job-2"}
@@ -0,0 +1,85 @@
+"""
+Tests for audit job checkpoints.
+"""
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from decimal import Decimal
+from enum import Enum
+
+import numpy as np
+import pytest
+
+from api.services.checkpoints import JobCheckpoints, to_plain
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class Channel(Enum):
+    EMAIL = "email"
+
+
+@dataclass
+class Finding:
+    channel: Channel
+    revenue: Decimal
+
+
+def stage_output():
+    return {
+        "generated_at": datetime(2025, 3, 1, 12, 30, tzinfo=timezone.utc),
+        "findings": (Finding(Channel.EMAIL, Decimal("12.50")),),
+        "by_month": {3: np.float64(1.5), None: np.array([1, 2])},
+        "flags": [True, np.bool_(False)]
+    }
+
+
+def test_to_plain_matches_json_round_trip():
+    assert to_plain(stage_output()) == {
+        "generated_at": "2025-03-01T12:30:00+00:00",
+        "findings": [{"channel": "email", "revenue": 12.5}],
+        "by_month": {"3": 1.5, "null": [1, 2]},
+        "flags": [True, False]
+    }
+
+
+def test_to_plain_rejects_values_without_json_form():
+    with pytest.raises(TypeError):
+        to_plain({"client": object()})
+
+
+def test_run_returns_same_form_fresh_and_restored(tmp_path):
+    calls = []
+
+    async def produce():
+        calls.append(1)
+        return stage_output()
+
+    fresh = run(JobCheckpoints("job-1", root=tmp_path).run("analysis", produce))
+    restored = run(JobCheckpoints("job-1", root=tmp_path).run("analysis", produce))
+
+    assert len(calls) == 1
+    assert fresh == restored
+    assert type(fresh["findings"]) is list
+
+
+def test_save_logs_unserializable_output_without_checkpointing(tmp_path):
+    checkpoints = JobCheckpoints("job-2", root=tmp_path)
+    run(checkpoints.save("report.render", {"client": object()}))
+
+    assert not checkpoints.has("report.render")
+    assert not (tmp_path / "job-2" / "report.render.json").exists()
+
+
+def test_run_returns_unserializable_output_without_checkpointing(tmp_path):
+    output = {"client": object(), "path": ("a", "b")}
+
+    async def produce():
+        return output
+
+    checkpoints = JobCheckpoints("job-3", root=tmp_path)
+    assert run(checkpoints.run("klaviyo_data", produce)) is output
+    assert not checkpoints.has("klaviyo_data")
+    assert not (tmp_path / "job-3" / "klaviyo_data.json").exists()
@@ -0,0 +1,66 @@
+"""
+Tests for the shared on-disk LRU cache.
+"""
+import asyncio
+import os
+import time
+
+from api.services.disk_cache import DiskLRUCache
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def key(n):
+    return f"{n:064x}"
+
+
+def entry(size, expires_at=None):
+    return {"expires_at": expires_at, "value": "x" * size}
+
+
+def test_round_trip_and_hit_miss_counts(tmp_path):
+    cache = DiskLRUCache(tmp_path, max_bytes=10_000)
+    run(cache.set_entry(key(1), entry(10)))
+
+    assert run(cache.get_entry(key(1)))["value"] == "x" * 10
+    assert run(cache.get_entry(key(2))) is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_expired_entries_are_removed(tmp_path):
+    cache = DiskLRUCache(tmp_path, max_bytes=10_000)
+    run(cache.set_entry(key(1), entry(10, expires_at=time.time() - 1)))
+
+    assert run(cache.get_entry(key(1))) is None
+    assert cache.stats()["entries"] == 0
+    assert not cache._path(key(1)).exists()
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path):
+    cache = DiskLRUCache(tmp_path, max_bytes=250)
+    run(cache.set_entry(key(1), entry(80)))
+    run(cache.set_entry(key(2), entry(80)))
+    # Reading key 1 makes key 2 the least recently used
+    run(cache.get_entry(key(1)))
+    run(cache.set_entry(key(3), entry(80)))
+
+    assert run(cache.get_entry(key(2))) is None
+    assert run(cache.get_entry(key(1))) is not None
+    assert run(cache.get_entry(key(3))) is not None
+    assert cache.stats()["bytes"] <= 250
+
+
+def test_index_rebuilt_from_disk_keeps_access_order(tmp_path):
+    cache = DiskLRUCache(tmp_path, max_bytes=250)
+    run(cache.set_entry(key(1), entry(80)))
+    run(cache.set_entry(key(2), entry(80)))
+    os.utime(cache._path(key(1)), (time.time() + 10, time.time() + 10))
+
+    restarted = DiskLRUCache(tmp_path, max_bytes=250)
+    run(restarted.set_entry(key(3), entry(80)))
+
+    assert run(restarted.get_entry(key(2))) is None
+    assert run(restarted.get_entry(key(1))) is not None
@@ -0,0 +1,155 @@
+"""
+Tests for incremental daily metric aggregates (bucket splitting, merging and reuse).
+"""
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+
+from api.services.klaviyo.metrics.aggregates import MetricAggregatesService, _local_day_start
+from api.services.klaviyo.snapshots import AccountSnapshotStore
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def response_for(dates, counts):
+    return {
+        "data": {
+            "type": "metric-aggregate",
+            "attributes": {
+                "dates": dates,
+                "data": [{"dimensions": [], "measurements": {"count": counts}}]
+            }
+        }
+    }
+
+
+def bucket(start, end, count, fetched_at=None):
+    return {
+        "start": start,
+        "end": end,
+        "fetched_at": time.time() if fetched_at is None else fetched_at,
+        "values": {"[]": {"count": count}}
+    }
+
+
+class FakeMetricsApi:
+    """Answers daily UTC metric aggregates; each day's count is its day of the month."""
+
+    def __init__(self, store):
+        self.snapshots = store
+        self.ranges = []
+
+    async def request(self, method, path, data=None):
+        filters = data["data"]["attributes"]["filter"]
+        start = datetime.fromisoformat(filters[0].split(",")[1].rstrip(")").replace("Z", "+00:00"))
+        end = datetime.fromisoformat(filters[1].split(",")[1].rstrip(")").replace("Z", "+00:00"))
+        self.ranges.append((start, end))
+
+        day = start.replace(hour=0, minute=0, second=0, microsecond=0)
+        dates, counts = [], []
+        while day < end:
+            dates.append(day.isoformat())
+            counts.append(day.day)
+            day += timedelta(days=1)
+        return response_for(dates, counts)
+
+
+def test_local_day_start_uses_query_timezone():
+    moment = datetime(2025, 3, 10, 15, 30, tzinfo=timezone.utc)
+
+    assert _local_day_start(moment, "UTC") == datetime(2025, 3, 10, tzinfo=timezone.utc)
+    # 15:30 UTC is 02:30 on 11 March in Sydney (UTC+11)
+    assert _local_day_start(moment, "Australia/Sydney") == datetime(2025, 3, 10, 13, tzinfo=timezone.utc)
+    assert _local_day_start(moment, "Not/AZone") == datetime(2025, 3, 10, tzinfo=timezone.utc)
+
+
+def test_to_buckets_marks_only_whole_days_complete():
+    dates = ["2025-03-01T00:00:00+00:00", "2025-03-02T00:00:00+00:00", "2025-03-03T00:00:00+00:00"]
+    response = response_for(dates, [1, 2, 3])
+
+    aligned = MetricAggregatesService._to_buckets(
+        response, 100.0, datetime(2025, 3, 1, tzinfo=timezone.utc)
+    )
+    assert [b["end"] for b in aligned] == [dates[1], dates[2], None]
+    assert [b["values"]["[]"]["count"] for b in aligned] == [1, 2, 3]
+
+    # A first day that began before the query start is partial
+    mid_day = MetricAggregatesService._to_buckets(
+        response, 100.0, datetime(2025, 3, 1, 12, tzinfo=timezone.utc)
+    )
+    assert [b["end"] for b in mid_day] == [None, dates[2], None]
+
+
+def test_merge_buckets_replaces_same_day_and_drops_partial():
+    stored = [
+        bucket("2025-03-02T00:00:00Z", "2025-03-03T00:00:00Z", 20),
+        bucket("2025-03-01T00:00:00Z", "2025-03-02T00:00:00Z", 10),
+    ]
+    fetched = [
+        bucket("2025-03-02T00:00:00+00:00", "2025-03-03T00:00:00+00:00", 21),
+        bucket("2025-03-03T00:00:00+00:00", None, 30),
+    ]
+
+    merged = MetricAggregatesService._merge_buckets(stored, fetched)
+    assert [b["values"]["[]"]["count"] for b in merged] == [10, 21]
+
+
+def test_reusable_buckets_start_inside_stored_range():
+    settled = time.time()
+    stored = [
+        bucket(f"2025-03-0{day}T00:00:00Z", f"2025-03-0{day + 1}T00:00:00Z", day, settled)
+        for day in range(1, 6)
+    ]
+    start = datetime(2025, 3, 3, tzinfo=timezone.utc)
+
+    reused = MetricAggregatesService._reusable_buckets(
+        stored, start, datetime(2025, 3, 30, tzinfo=timezone.utc)
+    )
+    assert [b["values"]["[]"]["count"] for b in reused] == [3, 4, 5]
+
+    # Stops at the range end
+    reused = MetricAggregatesService._reusable_buckets(
+        stored, start, datetime(2025, 3, 5, 12, tzinfo=timezone.utc)
+    )
+    assert [b["values"]["[]"]["count"] for b in reused] == [3, 4]
+
+    # Stops at a gap and at a day fetched before it had settled
+    gappy = stored[:3] + stored[4:]
+    assert len(MetricAggregatesService._reusable_buckets(
+        gappy, start, datetime(2025, 3, 30, tzinfo=timezone.utc)
+    )) == 1
+    unsettled = stored[:3] + [bucket("2025-03-04T00:00:00Z", "2025-03-05T00:00:00Z", 4, 0.0)]
+    assert len(MetricAggregatesService._reusable_buckets(
+        unsettled, start, datetime(2025, 3, 30, tzinfo=timezone.utc)
+    )) == 1
+
+
+def test_repeat_query_reuses_stored_days(tmp_path):
+    api = FakeMetricsApi(AccountSnapshotStore(tmp_path))
+    service = MetricAggregatesService(api)
+
+    async def scenario():
+        first = await service.query(
+            "M1", "2025-03-01T09:15:00Z", "2025-03-20T00:00:00Z", measurements=["count"]
+        )
+        # A later, rolling window that starts mid-day inside the stored range
+        second = await service.query(
+            "M1", "2025-03-05T18:40:00Z", "2025-03-25T06:00:00Z", measurements=["count"]
+        )
+        return first, second
+
+    first, second = run(scenario())
+
+    # Starts are aligned to the day, so the first response covers whole days
+    assert api.ranges[0][0] == datetime(2025, 3, 1, tzinfo=timezone.utc)
+    assert first["data"]["attributes"]["dates"][0] == "2025-03-01T00:00:00+00:00"
+
+    # 5-18 March came from the snapshot (the last day of a response may be
+    # partial, so 19 March was not stored); only the days after were queried
+    assert api.ranges[1][0] == datetime(2025, 3, 19, tzinfo=timezone.utc)
+    attributes = second["data"]["attributes"]
+    assert attributes["dates"][0] == "2025-03-05T00:00:00+00:00"
+    assert len(attributes["dates"]) == 21
+    assert attributes["data"][0]["measurements"]["count"] == list(range(5, 26))
@@ -0,0 +1,39 @@
+"""
+Tests for the shared metric catalogue.
+"""
+import asyncio
+
+from api.services.klaviyo.metrics.catalogue import MetricCatalogue
+
+
+class FakeClient:
+    def __init__(self):
+        self.fetches = 0
+
+    async def get_all(self, endpoint, params=None):
+        self.fetches += 1
+        await asyncio.sleep(0.01)
+        return [{"id": "M1", "attributes": {"name": "Placed Order", "integration": {"key": "shopify"}}}]
+
+
+async def load_concurrently(catalogue, client, callers=5):
+    await asyncio.gather(*[catalogue.ensure_loaded(client) for _ in range(callers)])
+
+
+def test_concurrent_lookups_share_one_fetch():
+    catalogue, client = MetricCatalogue(ttl=3600), FakeClient()
+    asyncio.run(load_concurrently(catalogue, client))
+
+    assert client.fetches == 1
+    assert catalogue.find("Placed Order")[0]["id"] == "M1"
+    assert catalogue.find_by_integration("Shopify")[0]["id"] == "M1"
+
+
+def test_catalogue_can_be_used_from_successive_event_loops():
+    catalogue, client = MetricCatalogue(ttl=3600), FakeClient()
+    asyncio.run(load_concurrently(catalogue, client))
+    catalogue.invalidate()
+    # A lock bound to the first loop would fail here under contention
+    asyncio.run(load_concurrently(catalogue, client))
+
+    assert client.fetches == 2
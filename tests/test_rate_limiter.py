@@ -0,0 +1,168 @@
+"""
+Tests for the Klaviyo account rate limiter and per-endpoint pacer.
+"""
+import asyncio
+import time
+
+import pytest
+
+from api.services.klaviyo import rate_limiter as rate_limiter_module
+from api.services.klaviyo.pacing import AdaptivePacer
+from api.services.klaviyo.rate_limiter import RateLimiter, TokenBucket
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+async def timed_acquires(limiter: RateLimiter, count: int):
+    """Acquire `count` permits concurrently; returns completion offsets in arrival order."""
+    started = time.monotonic()
+    finished = []
+
+    async def one(index):
+        await limiter.acquire()
+        finished.append((index, time.monotonic() - started))
+
+    await asyncio.gather(*[one(i) for i in range(count)])
+    return finished
+
+
+@pytest.fixture(autouse=True)
+def fast_recheck(monkeypatch):
+    monkeypatch.setattr(rate_limiter_module, "MAX_RECHECK_SECONDS", 0.05)
+
+
+def test_token_bucket_refills_up_to_capacity():
+    bucket = TokenBucket(rate=10.0, capacity=5.0)
+    now = bucket.updated_at
+    for _ in range(5):
+        bucket.take(now)
+    assert bucket.seconds_until(1, now) == pytest.approx(0.1)
+    assert bucket.seconds_until(3, now) == pytest.approx(0.3)
+
+    bucket.refill(now + 10)
+    assert bucket.tokens == 5.0
+
+
+def test_burst_bucket_allows_one_second_of_requests_then_spaces_them():
+    limiter = RateLimiter(requests_per_second=5, requests_per_minute=6000)
+    finished = run(timed_acquires(limiter, 7))
+
+    offsets = [offset for _, offset in finished]
+    assert all(offset < 0.05 for offset in offsets[:5])
+    assert offsets[5] == pytest.approx(0.2, abs=0.06)
+    assert offsets[6] == pytest.approx(0.4, abs=0.06)
+
+
+def test_steady_bucket_limits_sustained_rate():
+    limiter = RateLimiter(requests_per_second=100, requests_per_minute=600)
+    limiter._steady.tokens = 0.0
+    finished = run(timed_acquires(limiter, 3))
+
+    offsets = [offset for _, offset in finished]
+    assert offsets == sorted(offsets)
+    assert offsets[0] == pytest.approx(0.1, abs=0.06)
+    assert offsets[2] == pytest.approx(0.3, abs=0.06)
+
+
+def test_permits_are_granted_in_arrival_order():
+    limiter = RateLimiter(requests_per_second=20, requests_per_minute=60000)
+    limiter._burst.tokens = 0.0
+    finished = run(timed_acquires(limiter, 6))
+    assert [index for index, _ in finished] == list(range(6))
+
+
+def test_waiters_speed_up_when_rate_rises():
+    limiter = RateLimiter(requests_per_second=100, requests_per_minute=60)
+    limiter._steady.tokens = 0.0
+
+    async def scenario():
+        waiters = asyncio.ensure_future(timed_acquires(limiter, 5))
+        await asyncio.sleep(0.1)
+        # At 1 req/s these waiters would need up to 5s
+        limiter.requests_per_minute = 60000
+        return await waiters
+
+    finished = run(scenario())
+    assert max(offset for _, offset in finished) < 0.5
+
+
+def test_pause_applies_to_callers_already_waiting():
+    limiter = RateLimiter(requests_per_second=100, requests_per_minute=600)
+    limiter._steady.tokens = 0.0
+
+    async def scenario():
+        waiter = asyncio.ensure_future(timed_acquires(limiter, 1))
+        await asyncio.sleep(0.02)
+        limiter.pause(0.4)
+        return await waiter
+
+    (_, offset), = run(scenario())
+    assert offset >= 0.4
+
+
+def test_cancelled_waiter_does_not_hold_up_the_queue():
+    limiter = RateLimiter(requests_per_second=10, requests_per_minute=60000)
+    limiter._burst.tokens = 0.0
+
+    async def scenario():
+        first = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        started = time.monotonic()
+        second = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0.01)
+        first.cancel()
+        await second
+        return time.monotonic() - started
+
+    # The second waiter moves to the head and only needs the first token
+    assert run(scenario()) == pytest.approx(0.1, abs=0.06)
+    assert not limiter._waiters
+
+
+def test_pacer_waits_only_for_the_endpoint_that_is_low():
+    pacer = AdaptivePacer()
+    pacer.record("/flow-values-reports/", remaining=0, reset=30)
+
+    assert pacer.delay_for("/flow-values-reports/") == pytest.approx(30, abs=0.5)
+    assert pacer.delay_for("/flows/") == 0.0
+    assert pacer.delay_for("/metrics/") == 0.0
+
+
+def test_pacer_spreads_last_requests_across_the_window():
+    pacer = AdaptivePacer()
+    pacer.record("/campaign-values-reports/", remaining=1, reset=10)
+    assert pacer.delay_for("/campaign-values-reports/") == pytest.approx(5, abs=0.5)
+
+    pacer.record("/campaign-values-reports/", remaining=100, reset=10)
+    assert pacer.delay_for("/campaign-values-reports/") == 0.0
+
+
+def test_retry_after_blocks_endpoint_group_only():
+    pacer = AdaptivePacer()
+    pacer.record("/flows/ABC/flow-actions/", retry_after=20)
+
+    assert pacer.blocked_for("/flows/XYZ/") == pytest.approx(20, abs=0.5)
+    assert pacer.blocked_for("/metrics/") == 0.0
+
+
+def test_exhausted_window_blocks_every_request_until_reset():
+    pacer = AdaptivePacer()
+    pacer.record("/metrics/", remaining=0, reset=30)
+    assert pacer.blocked_for("/metrics/ABC/") == pytest.approx(30, abs=0.5)
+    assert pacer.blocked_for("/flows/") == 0.0
+
+    # A few requests left are spread by pace(), not blocked
+    pacer.record("/metrics/", remaining=2, reset=30)
+    assert pacer.blocked_for("/metrics/") == 0.0
+    assert pacer.delay_for("/metrics/") > 0
+
+    async def scenario():
+        pacer.record("/campaigns/", remaining=0, reset=0.2)
+        started = time.monotonic()
+        await pacer.wait_if_blocked("/campaigns/")
+        return time.monotonic() - started
+
+    assert run(scenario()) == pytest.approx(0.2, abs=0.06)
+    assert pacer.blocked_for("/campaigns/") == 0.0
@@ -0,0 +1,85 @@
+"""
+Tests for the Reporting API batch planner.
+"""
+import asyncio
+
+from api.services.klaviyo.reporting_planner import ReportingBatchPlanner, ReportRejected
+
+AUDIT_STATISTICS = ["opens", "recipients"]
+
+
+def report(ids, statistics):
+    return {
+        "data": {
+            "type": "flow-values-report",
+            "attributes": {
+                "results": [
+                    {"groupings": {"flow_id": item_id}, "statistics": {name: 1 for name in statistics}}
+                    for item_id in ids
+                ]
+            }
+        }
+    }
+
+
+def planner_with(fetch):
+    return ReportingBatchPlanner(
+        id_type="flow_id",
+        endpoint="/flow-values-reports/",
+        fetch=fetch,
+        audit_statistics=AUDIT_STATISTICS,
+        window=0.01
+    )
+
+
+def test_concurrent_requests_are_merged_into_one_call():
+    calls = []
+
+    async def fetch(ids, statistics, timeframe, conversion_metric_id):
+        calls.append((ids, statistics))
+        return report(ids, statistics)
+
+    planner = planner_with(fetch)
+
+    async def scenario():
+        return await asyncio.gather(
+            planner.get(["F1"], ["conversion_value"], "last_90_days", "M1"),
+            planner.get(["F2"], ["clicks"], "last_90_days", "M1")
+        )
+
+    first, second = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert calls[0][1] == ["clicks", "conversion_value", "opens", "recipients"]
+    assert first["data"]["attributes"]["results"][0]["statistics"] == {"conversion_value": 1}
+    assert second["data"]["attributes"]["results"][0]["groupings"] == {"flow_id": "F2"}
+
+
+def test_rejected_merged_statistics_fall_back_to_requested():
+    calls = []
+
+    async def fetch(ids, statistics, timeframe, conversion_metric_id):
+        calls.append(statistics)
+        if "opens" in statistics:
+            raise ReportRejected("400 Bad Request")
+        return report(ids, statistics)
+
+    planner = planner_with(fetch)
+    response = asyncio.run(planner.get(["F1"], ["conversion_value"], "last_90_days", "M1"))
+
+    assert calls == [["conversion_value", "opens", "recipients"], ["conversion_value"]]
+    assert response["data"]["attributes"]["results"][0]["statistics"] == {"conversion_value": 1}
+
+
+def test_other_failures_are_not_retried():
+    calls = []
+
+    async def fetch(ids, statistics, timeframe, conversion_metric_id):
+        # Exhausted 429 retries and network errors come back as {}
+        calls.append(statistics)
+        return {}
+
+    planner = planner_with(fetch)
+    response = asyncio.run(planner.get(["F1"], ["conversion_value"], "last_90_days", "M1"))
+
+    assert len(calls) == 1
+    assert response == {}